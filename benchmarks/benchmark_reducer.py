@@ -0,0 +1,308 @@
+"""
+Benchmarks public reduction stages on the bundled test feeders and on synthetic
+feeders built by replicating them, and compares timings against stored baselines.
+Baselines record the machine and the Python and NumPy versions they were measured with,
+timings measured elsewhere are only indicative.
+
+Run from the root of the repo.
+
+    python benchmarks/benchmark_reducer.py
+    python benchmarks/benchmark_reducer.py --update-baseline
+"""
+
+from pathlib import Path
+import contextlib
+import io
+import json
+import os
+import platform
+import tempfile
+import time
+
+import click
+import numpy as np
+
+from grid_reducer.altdss.altdss_models import Circuit
+from grid_reducer.utils import (
+    get_ckt_from_opendss_model,
+    get_circuit_bus_name,
+    write_to_opendss_file,
+)
+from grid_reducer.network import get_graph_from_circuit
+from grid_reducer.feeder_tree import FeederTree
+from grid_reducer.topology import get_topology_from_opendss
+from grid_reducer.aggregate_secondary import aggregate_secondary_assets
+from grid_reducer.aggregate_primary import aggregate_primary_conductors
+from grid_reducer.transform_coordinate import transform_bus_coordinates
+from grid_reducer.rename_components import rename_assets
+from grid_reducer.version import VERSION
+
+ROOT_FOLDER = Path(__file__).parents[1]
+DATA_FOLDER = ROOT_FOLDER / "tests" / "data"
+DEFAULT_BASELINE_FILE = Path(__file__).parent / "baseline.json"
+FEEDERS = {
+    "ieee13": DATA_FOLDER / "ieee" / "master.dss",
+    "smartds": DATA_FOLDER / "smartds" / "Master.dss",
+    "ieee9500": DATA_FOLDER / "ieee9500" / "Master-bal-initial-config.dss",
+}
+DEFAULT_CASES = ["ieee13", "smartds", "ieee9500", "smartds_x10", "smartds_x100"]
+REPLICATED_CLASSES = [
+    "Line",
+    "Load",
+    "Transformer",
+    "Capacitor",
+    "Reactor",
+    "PVSystem",
+    "Storage",
+    "Generator",
+]
+
+
+def _replicate_bus(bus: str, suffix: str, source_bus: str) -> str:
+    name, *phases = bus.split(".")
+    if name == source_bus:
+        return bus
+    return ".".join([f"{name}{suffix}", *phases])
+
+
+def replicate_circuit(circuit: Circuit, factor: int) -> Circuit:
+    """
+    Returns a synthetic circuit with `factor` copies of the feeder, all fed from the
+    original source bus. Buses and components of each copy are suffixed with the copy
+    number. Controls are kept for the first copy only.
+    """
+    source_bus = get_circuit_bus_name(circuit)
+    circuit_dict = circuit.model_dump(exclude_unset=True)
+    buses = circuit_dict.get("Bus", [])
+    new_buses = [bus for bus in buses]
+    new_containers = {field: list(circuit_dict.get(field) or []) for field in REPLICATED_CLASSES}
+    post_commands = list(circuit_dict.get("PostCommands") or [])
+    for copy_index in range(1, factor):
+        suffix = f"_r{copy_index}"
+        new_buses += [
+            {**bus, "Name": f"{bus['Name']}{suffix}"} for bus in buses if bus["Name"] != source_bus
+        ]
+        for field in REPLICATED_CLASSES:
+            for item in circuit_dict.get(field) or []:
+                new_item = {**item, "Name": f"{item['Name']}{suffix}"}
+                for bus_field in ["Bus1", "Bus2"]:
+                    if new_item.get(bus_field):
+                        new_item[bus_field] = _replicate_bus(item[bus_field], suffix, source_bus)
+                if new_item.get("Bus"):
+                    new_item["Bus"] = [
+                        _replicate_bus(bus, suffix, source_bus) for bus in item["Bus"]
+                    ]
+                new_containers[field].append(new_item)
+        for command in circuit_dict.get("PostCommands") or []:
+            if command.startswith("Open Line."):
+                line_name, *rest = command.split(".", 1)[1].split(" ", 1)
+                post_commands.append(" ".join([f"Open Line.{line_name}{suffix}", *rest]))
+    circuit_dict.update(new_containers, Bus=new_buses, PostCommands=post_commands)
+    return Circuit.model_validate(
+        {key: value for key, value in circuit_dict.items() if value is not None}
+    )
+
+
+def _time_stage(func, repeat: int):
+    timings, result = [], None
+    for _ in range(repeat):
+        with contextlib.redirect_stdout(io.StringIO()):
+            start = time.perf_counter()
+            result = func()
+            timings.append(time.perf_counter() - start)
+    return round(min(timings), 4), result
+
+
+def get_master_file(case: str, folder: Path) -> Path:
+    """Returns master file of a bundled feeder, or writes a replicated one to `folder`."""
+    feeder, _, factor = case.partition("_x")
+    if feeder not in FEEDERS:
+        raise KeyError(f"Unknown feeder {feeder=}, available feeders are {list(FEEDERS)}")
+    if not factor:
+        return FEEDERS[feeder]
+    with contextlib.redirect_stdout(io.StringIO()):
+        circuit = replicate_circuit(get_ckt_from_opendss_model(FEEDERS[feeder]), int(factor))
+    master_file = folder / f"{case}.dss"
+    write_to_opendss_file(circuit, master_file)
+    return master_file
+
+
+def benchmark_case(master_file: Path, layout: str, repeat: int) -> dict[str, float]:
+    timings = {}
+    timings["get_ckt_from_opendss_model"], circuit = _time_stage(
+        lambda: get_ckt_from_opendss_model(master_file), repeat
+    )
+    timings["get_topology_from_opendss"], topology = _time_stage(
+        lambda: get_topology_from_opendss(master_file), repeat
+    )
+    timings["FeederTopology.get_feeder_tree"], _ = _time_stage(topology.get_feeder_tree, repeat)
+    timings["get_graph_from_circuit"], _ = _time_stage(
+        lambda: get_graph_from_circuit(circuit), repeat
+    )
+    timings["FeederTree.from_circuit"], _ = _time_stage(
+        lambda: FeederTree.from_circuit(circuit), repeat
+    )
+    timings["aggregate_secondary_assets"], (secondary_ckt, _) = _time_stage(
+        lambda: aggregate_secondary_assets(circuit), repeat
+    )
+    timings["aggregate_primary_conductors"], (primary_ckt, _) = _time_stage(
+        lambda: aggregate_primary_conductors(secondary_ckt), repeat
+    )
+    timings["transform_bus_coordinates"], transformed_ckt = _time_stage(
+        lambda: transform_bus_coordinates(primary_ckt, layout), repeat
+    )
+    timings["rename_assets"], renamed_ckt = _time_stage(
+        lambda: rename_assets(transformed_ckt), repeat
+    )
+    with tempfile.TemporaryDirectory() as folder:
+        output_file = Path(folder) / "reduced_ckt.dss"
+        timings["write_to_opendss_file"], _ = _time_stage(
+            lambda: write_to_opendss_file(renamed_ckt, output_file), repeat
+        )
+    timings["buses"] = len(circuit.Bus)
+    return timings
+
+
+def get_environment() -> dict[str, str | int | None]:
+    """Returns machine and library versions the timings are measured with."""
+    return {
+        "machine": platform.machine(),
+        "processor": platform.processor() or None,
+        "cpu_count": os.cpu_count(),
+        "platform": platform.platform(),
+        "python": platform.python_version(),
+        "numpy": np.__version__,
+        "grid_reducer": VERSION,
+    }
+
+
+def get_environment_differences(environment: dict, baseline_environment: dict) -> list[str]:
+    """Returns fields of the environment, other than the grid_reducer version, that differ
+    from the baseline environment."""
+    return [
+        key
+        for key, value in environment.items()
+        if key != "grid_reducer" and baseline_environment.get(key) != value
+    ]
+
+
+def compare_with_baseline(
+    results: dict, baseline: dict, tolerance: float, min_difference: float
+) -> list[str]:
+    """Returns list of stages that are slower than baseline by more than `tolerance`."""
+    regressions = []
+    for case, timings in results.items():
+        for stage, value in timings.items():
+            base_value = baseline.get(case, {}).get(stage)
+            if stage == "buses" or base_value is None:
+                continue
+            if value > base_value * tolerance and value - base_value > min_difference:
+                regressions.append(
+                    f"{case} {stage}: {value:.3f}s vs baseline {base_value:.3f}s "
+                    f"({value / base_value:.2f}x)"
+                )
+    return regressions
+
+
+@click.command()
+@click.option(
+    "-c",
+    "--case",
+    "cases",
+    multiple=True,
+    default=DEFAULT_CASES,
+    show_default=True,
+    help="Feeder to benchmark, append _x<factor> for a replicated feeder e.g. smartds_x10.",
+)
+@click.option(
+    "-l",
+    "--layout",
+    type=str,
+    default="radial_tree",
+    show_default=True,
+    help="Layout used for transform_bus_coordinates.",
+)
+@click.option("-n", "--repeat", type=int, default=1, show_default=True, help="Runs per stage.")
+@click.option(
+    "-b",
+    "--baseline-file",
+    type=click.Path(path_type=Path),
+    default=DEFAULT_BASELINE_FILE,
+    show_default=True,
+    help="Json file with baseline timings.",
+)
+@click.option(
+    "--update-baseline",
+    is_flag=True,
+    default=False,
+    help="Store results as new baseline instead of comparing with it.",
+)
+@click.option(
+    "-t",
+    "--tolerance",
+    type=float,
+    default=1.5,
+    show_default=True,
+    help="Allowed slowdown factor compared to baseline.",
+)
+@click.option(
+    "--min-difference",
+    type=float,
+    default=0.05,
+    show_default=True,
+    help="Slowdowns smaller than this many seconds are ignored.",
+)
+@click.option("-o", "--output-file", type=click.Path(path_type=Path), default=None)
+def benchmark(
+    cases: tuple[str, ...],
+    layout: str,
+    repeat: int,
+    baseline_file: Path,
+    update_baseline: bool,
+    tolerance: float,
+    min_difference: float,
+    output_file: Path | None,
+):
+    results = {}
+    with tempfile.TemporaryDirectory() as folder:
+        for case in cases:
+            master_file = get_master_file(case, Path(folder))
+            results[case] = benchmark_case(master_file, layout, repeat)
+            click.echo(f"{case} ({results[case]['buses']} buses)")
+            for stage, value in results[case].items():
+                if stage != "buses":
+                    click.echo(f"  {stage:<32} {value:8.3f}s")
+
+    if output_file:
+        output_file.write_text(json.dumps(results, indent=2))
+
+    baseline = json.loads(baseline_file.read_text()) if baseline_file.exists() else {}
+    baseline_environment = baseline.get("environment", {})
+    environment = get_environment()
+    differences = get_environment_differences(environment, baseline_environment)
+    if update_baseline:
+        # Timings of other cases are kept only if measured in the same environment.
+        timings = {} if differences else baseline.get("timings", {})
+        timings.update(results)
+        baseline = {"environment": environment, "timings": timings}
+        baseline_file.write_text(json.dumps(baseline, indent=2, sort_keys=True) + "\n")
+        click.echo(f"Baseline updated on {environment['platform']}: {baseline_file}")
+        return
+    if differences:
+        click.echo(
+            f"Baseline was measured in a different environment ({', '.join(differences)}), "
+            "compare against a baseline updated on this machine for reliable results."
+        )
+    regressions = compare_with_baseline(
+        results, baseline.get("timings", {}), tolerance, min_difference
+    )
+    if regressions:
+        click.echo("Slower than baseline:")
+        for regression in regressions:
+            click.echo(f"  {regression}")
+        raise SystemExit(1)
+    click.echo("No regressions compared to baseline.")
+
+
+if __name__ == "__main__":
+    benchmark()
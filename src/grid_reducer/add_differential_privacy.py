@@ -1,10 +1,9 @@
-import copy
-import math
-import random
+import warnings
 
 import numpy as np
 
 from grid_reducer.altdss.altdss_models import Circuit
+from grid_reducer.bus_table import BusTable
 
 
 class BasePrivacyConfig:
@@ -27,22 +26,6 @@ class HighPrivacyConfig(BasePrivacyConfig):
     non_geo_coordinate_noise = 0.1
 
 
-def apply_gaussian_dp_noise(value: float, std_dev: float) -> float:
-    noise = np.random.normal(0, std_dev)
-    return value + noise
-
-
-def apply_planar_laplace_noise(x: float, y: float, epsilon: float) -> tuple[float, float]:
-    theta = 2 * math.pi * random.random()
-    u1, u2 = random.random(), random.random()
-    r = -(1 / epsilon) * math.log(u1 * u2)
-
-    # Apply noise in polar coordinates
-    x_noisy = x + r * math.cos(theta)
-    y_noisy = y + r * math.sin(theta)
-    return x_noisy, y_noisy
-
-
 def is_geo_coordinate(x: float, y: float) -> bool:
     """
     Determines if coordinates are in standard geo-coordinate ranges,
@@ -59,22 +42,111 @@ def is_geo_coordinate(x: float, y: float) -> bool:
     return geo_bounds and not is_transformed
 
 
+def get_geo_coordinate_mask(x: np.ndarray, y: np.ndarray) -> np.ndarray:
+    """Vectorized `is_geo_coordinate` over arrays of coordinates."""
+    geo_bounds = (np.abs(x) <= 180.0) & (np.abs(y) <= 90.0)
+    is_transformed = (np.abs(x) <= 1.5) & (np.abs(y) <= 1.5)
+    return geo_bounds & ~is_transformed
+
+
 def check_if_all_coords_are_none(circuit: Circuit) -> bool:
-    for bus in circuit.Bus:
-        if bus.X is not None or bus.Y is not None:
-            return False
-    return True
+    bus_table = BusTable.from_circuit(circuit)
+    return bool(np.all(bus_table.x_null & bus_table.y_null))
 
 
 def check_if_circuit_is_geo(circuit: Circuit) -> bool:
-    for bus in circuit.Bus:
-        if bus.X is not None and bus.Y is not None:
-            if not is_geo_coordinate(bus.X, bus.Y):
-                return False
-    return False if check_if_all_coords_are_none(circuit) else True
+    return _check_if_bus_table_is_geo(BusTable.from_circuit(circuit))
+
+
+def _check_if_bus_table_is_geo(bus_table: BusTable) -> bool:
+    xy_mask = bus_table.xy_mask
+    if not np.all(get_geo_coordinate_mask(bus_table.x[xy_mask], bus_table.y[xy_mask])):
+        return False
+    return not np.all(bus_table.x_null & bus_table.y_null)
+
+
+def get_planar_laplace_noise(
+    size: int, epsilon: float, rng: np.random.Generator
+) -> tuple[np.ndarray, np.ndarray]:
+    """Samples `size` planar Laplace displacements in one batch."""
+    theta = 2 * np.pi * rng.random(size)
+    # 1 - random() lies in (0, 1], keeping the logarithm finite.
+    u1, u2 = 1 - rng.random(size), 1 - rng.random(size)
+    r = -(1 / epsilon) * np.log(u1 * u2)
+    return r * np.cos(theta), r * np.sin(theta)
+
 
+def get_gaussian_noise(
+    size: int, std_dev: float, rng: np.random.Generator
+) -> tuple[np.ndarray, np.ndarray]:
+    """Samples `size` gaussian displacements for x and y in one batch."""
+    noise = rng.normal(0, std_dev, size=(2, size))
+    return noise[0], noise[1]
 
-def get_dp_circuit(circuit: Circuit, noise_config: BasePrivacyConfig) -> Circuit:
+
+def apply_gaussian_dp_noise(value: float, std_dev: float) -> float:
+    """Deprecated, use `add_dp_noise_to_coordinates` to perturb all coordinates at once."""
+    warnings.warn(
+        "apply_gaussian_dp_noise is deprecated, use add_dp_noise_to_coordinates instead.",
+        DeprecationWarning,
+        stacklevel=2,
+    )
+    noise, _ = get_gaussian_noise(1, std_dev, np.random.default_rng())
+    return value + float(noise[0])
+
+
+def apply_planar_laplace_noise(x: float, y: float, epsilon: float) -> tuple[float, float]:
+    """Deprecated, use `add_dp_noise_to_coordinates` to perturb all coordinates at once."""
+    warnings.warn(
+        "apply_planar_laplace_noise is deprecated, use add_dp_noise_to_coordinates instead.",
+        DeprecationWarning,
+        stacklevel=2,
+    )
+    dx, dy = get_planar_laplace_noise(1, epsilon, np.random.default_rng())
+    return x + float(dx[0]), y + float(dy[0])
+
+
+def get_independent_noise_seeds(seed: int | None, count: int) -> list[int | None]:
+    """
+    Derives `count` independent seeds from one seed, one for each published variant.
+
+    Variants sharing a seed share their noise draws, which lets anyone holding two of
+    them solve for the true coordinates. Returns `None` seeds if `seed` is None.
+    """
+    if seed is None:
+        return [None] * count
+    return [
+        int(child.generate_state(1, dtype=np.uint64)[0])
+        for child in np.random.SeedSequence(seed).spawn(count)
+    ]
+
+
+def add_dp_noise_to_coordinates(
+    x: np.ndarray,
+    y: np.ndarray,
+    noise_config: BasePrivacyConfig,
+    is_geo: bool,
+    seed: int | np.random.Generator | None = None,
+) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Returns perturbed copies of coordinate arrays, using planar Laplace noise for
+    geo-coordinates and gaussian noise for transformed layout coordinates.
+
+    Same `seed` gives the same noise, so privacy variants are reproducible.
+    """
+    rng = np.random.default_rng(seed)
+    if is_geo:
+        dx, dy = get_planar_laplace_noise(len(x), int(noise_config.geo_coordinate_noise), rng)
+    else:
+        dx, dy = get_gaussian_noise(len(x), float(noise_config.non_geo_coordinate_noise), rng)
+    return x + dx, y + dy
+
+
+def get_dp_circuit(
+    circuit: Circuit,
+    noise_config: BasePrivacyConfig,
+    seed: int | np.random.Generator | None = None,
+) -> Circuit:
     """
     Applies differential privacy to all bus coordinates:
     - Planar Laplace noise for all geo-coordinates (including switch-connected)
@@ -82,27 +154,21 @@ def get_dp_circuit(circuit: Circuit, noise_config: BasePrivacyConfig) -> Circuit
 
     Args:
         circuit (Circuit): Original circuit
-        noise_level (str): "low", "medium", or "high" noise strength
+        noise_config (BasePrivacyConfig): Noise strength configuration
+        seed (int | np.random.Generator | None): Seed or generator for reproducible noise
 
     Returns:
         Circuit: New circuit with perturbed bus coordinates
     """
 
-    new_buses = []
-    is_geo = check_if_circuit_is_geo(circuit)
-    for bus in circuit.Bus:
-        new_bus = copy.deepcopy(bus)
-        if new_bus.X is not None and new_bus.Y is not None:
-            if is_geo:
-                new_bus.X, new_bus.Y = apply_planar_laplace_noise(
-                    new_bus.X, new_bus.Y, int(noise_config.geo_coordinate_noise)
-                )
-            else:
-                noise_scale = float(noise_config.non_geo_coordinate_noise)
-                new_bus.X = apply_gaussian_dp_noise(new_bus.X, noise_scale)
-                new_bus.Y = apply_gaussian_dp_noise(new_bus.Y, noise_scale)
-        new_buses.append(new_bus)
-
-    new_circuit = copy.deepcopy(circuit)
-    new_circuit.Bus = new_buses
-    return new_circuit
+    bus_table = BusTable.from_circuit(circuit)
+    xy_mask = bus_table.xy_mask
+    x, y = add_dp_noise_to_coordinates(
+        bus_table.x[xy_mask],
+        bus_table.y[xy_mask],
+        noise_config,
+        _check_if_bus_table_is_geo(bus_table),
+        seed,
+    )
+    bus_table.set_coordinates(x, y, xy_mask)
+    return bus_table.to_circuit(circuit)
@@ -1,7 +1,7 @@
-import networkx as nx
-import copy
+import numpy as np
+from pydantic import BaseModel
 from typing import Any
-from itertools import chain
+from itertools import chain, groupby
 from collections import defaultdict
 
 from grid_reducer.altdss.altdss_models import (
@@ -14,7 +14,9 @@ from grid_reducer.altdss.altdss_models import (
     Reactor_Common,
     Line,
 )
-from grid_reducer.network import get_graph_from_circuit
+from grid_reducer.feeder_tree import FeederTree
+from grid_reducer.lazy_circuit import get_item_fields
+from grid_reducer.profiling import profile_stage
 from grid_reducer.aggregate_secondary import _update_circuit_in_place
 from grid_reducer.similarity.line import LineSimilarity
 from grid_reducer.aggregators.line import aggregate_lines
@@ -42,27 +44,21 @@ def fetch_element_names(obj_type: Any) -> list[str]:
     return []
 
 
-def _get_list_of_edges_to_preserve(network: nx.Graph, ckt: Circuit) -> list[tuple[str, str]]:
-    """Assumes switches and transformers to be preserved."""
-    edges_to_preserve = set()
-    element_names = list(
+def _get_edges_to_preserve(tree: FeederTree, ckt: Circuit) -> np.ndarray:
+    """Returns mask of tree edges to preserve, assumes switches and transformers to be preserved."""
+    element_names = set(
         chain.from_iterable(map(fetch_element_names, [ckt.CapControl, ckt.EnergyMeter]))
     )
-    for u, v, edge_data in network.edges(data=True):
-        edge = (u, v)
-        if edge_data["component_type"] == "Transformer":
-            edges_to_preserve.add(edge)
+    edges_to_preserve = np.zeros(len(tree.edge_types), dtype=bool)
+    for edge, edge_type in enumerate(tree.edge_types):
+        if edge_type == "Transformer":
+            edges_to_preserve[edge] = True
             continue
-        edge_components: list[LINE_TYPE] = edge_data["edge"]
-        if any(
-            edge_component.Switch
+        edge_components: list[LINE_TYPE] = tree.get_edge_components(edge)
+        edges_to_preserve[edge] = any(
+            getattr(edge_component, "Switch", None) or edge_component.Name in element_names
             for edge_component in edge_components
-            if hasattr(edge_component, "Switch")
-        ):
-            edges_to_preserve.add(edge)
-            continue
-        if any(edge_component.Name in element_names for edge_component in edge_components):
-            edges_to_preserve.add(edge)
+        )
     return edges_to_preserve
 
 
@@ -83,6 +79,9 @@ def _get_list_of_nodes_to_preserve(circuit: Circuit) -> set[str]:
     nodes_to_be_preserved = set()
 
     for field in Circuit.model_fields:
+        # Skips reading, and validating, containers whose items have no Bus1.
+        if "Bus1" not in get_item_fields(field):
+            continue
         field_data = getattr(circuit, field)
         if not field_data:
             continue
@@ -98,200 +97,134 @@ def _get_list_of_nodes_to_preserve(circuit: Circuit) -> set[str]:
     return nodes_to_be_preserved
 
 
-def extract_segments_from_linear_tree(d_graph: nx.DiGraph, subset: set[str]) -> list[nx.DiGraph]:
-    subset = set(subset)
-    nodes = list(nx.topological_sort(d_graph))
+def get_linear_segments(
+    tree: FeederTree, edges_to_preserve: np.ndarray, nodes_to_preserve: np.ndarray
+) -> list[list[int]]:
+    """
+    Returns linear segments of the tree with more than one edge, as lists of the child
+    bus ids of their edges in flow order.
 
-    if not nodes:
-        return []
+    Segments are runs of edges between branching buses, split at preserved edges and
+    preserved buses. They are ordered by the part of the tree left after removing
+    preserved edges, then in DFS order.
+    """
+    non_root = tree.order[1:]
+    linked = np.zeros(len(tree), dtype=bool)
+    linked[non_root] = ~edges_to_preserve[tree.parent_edge[non_root]]
+    linked_children = non_root[linked[non_root]]
+    out_degree = np.bincount(tree.parent[linked_children], minlength=len(tree))
+    pass_through = linked & (out_degree == 1) & ~nodes_to_preserve
+    next_bus = np.full(len(tree), -1, dtype=np.int64)
+    next_bus[tree.parent[linked_children]] = linked_children
+
+    part_roots = tree.get_nearest_ancestors(~linked)
+    part_roots[~linked] = np.flatnonzero(~linked)
+    starts = linked_children[~pass_through[tree.parent[linked_children]]]
+    starts = starts[np.lexsort((tree.position[starts], tree.position[part_roots[starts]]))]
 
     segments = []
-    current_path = [nodes[0]]
-
-    for node in nodes[1:]:
-        current_path.append(node)
-        if node in subset:
-            edges = list(zip(current_path, current_path[1:], strict=False))
-            if edges:
-                segments.append(d_graph.edge_subgraph(edges).copy())
-            current_path = [node]  # start new segment from here
-
-    # Add trailing segment if any
-    if len(current_path) > 1:
-        edges = list(zip(current_path, current_path[1:], strict=False))
-        segments.append(d_graph.edge_subgraph(edges).copy())
-
+    for bus in starts.tolist():
+        segment = [bus]
+        while pass_through[bus]:
+            bus = int(next_bus[bus])
+            segment.append(bus)
+        if len(segment) > 1:
+            segments.append(segment)
     return segments
 
 
-def is_linear_tree(G):
-    if not nx.is_directed(G):
-        raise ValueError("Graph must be directed")
-
-    if not nx.is_arborescence(G):
-        return False  # not a rooted tree
-
-    in_deg = G.in_degree()
-    out_deg = G.out_degree()
-
-    counts = {
-        (0, 1): 0,  # root
-        (1, 1): 0,  # internal nodes
-        (1, 0): 0,  # leaf
-    }
+def get_similar_line_runs(
+    lines: list[LINE_TYPE], similarity_checker: LineSimilarity
+) -> list[list[LINE_TYPE]]:
+    """Returns runs of two or more consecutive similar lines of a segment."""
+    runs = [list(group) for _, group in groupby(lines, key=similarity_checker.get_signature)]
+    return [run for run in runs if len(run) > 1]
 
-    for node in G.nodes:
-        deg = (in_deg[node], out_deg[node])
-        if deg in counts:
-            counts[deg] += 1
-        else:
-            return False  # invalid node degree for a linear tree
 
-    n = G.number_of_nodes()
-    return counts[(0, 1)] == 1 and counts[(1, 0)] == 1 and counts[(1, 1)] == n - 2
-
-
-def get_linear_trees(G):
-    if not nx.is_arborescence(G):
-        raise ValueError("Graph must be a directed tree (arborescence)")
-
-    root = [n for n, d in G.in_degree() if d == 0][0]
-    visited_edges = set()
-    linear_subtrees = []
-
-    def walk_from(node):
-        for successor in G.successors(node):
-            if (node, successor) in visited_edges:
-                continue
-            path = [node, successor]
-            current = successor
-            while G.in_degree(current) == 1 and G.out_degree(current) == 1:
-                next_node = next(G.successors(current))
-                path.append(next_node)
-                current = next_node
-            edges = list(zip(path, path[1:], strict=False))
-            visited_edges.update(edges)
-            linear_subtrees.append(G.edge_subgraph(edges).copy())
-            walk_from(current)
-
-    walk_from(root)
-    return linear_subtrees
-
-
-def _get_linear_trees_from_graph(
-    graph: nx.DiGraph, edges_to_remove: list[tuple[str, str]] | None = None
-):
-    if not edges_to_remove:
-        return get_linear_trees(graph)
-
-    # Copy and remove specified edges
-    modified_graph = graph.copy()
-    modified_graph.remove_edges_from(edges_to_remove)
-
-    # Find weakly connected components after edge removal
-    linear_trees = []
-    for component_nodes in nx.weakly_connected_components(modified_graph):
-        subgraph = graph.subgraph(component_nodes).copy()
-        linear_trees.extend(get_linear_trees(subgraph))
-
-    return linear_trees
+def get_primary_summary(runs: list[list[LINE_TYPE]]) -> PrimaryAssetSummary:
+    """Summarizes merged runs of lines by line type."""
+    summary = PrimaryAssetSummary(name="🔗 Merged Primary Edges", items=[])
+    agg_summary_dict = defaultdict(lambda: defaultdict(int))
+    for run in runs:
+        edge_type = type(run[0])
+        agg_summary_dict[edge_type]["aggregated"] += 1
+        agg_summary_dict[edge_type]["removed"] += len(run)
+    for asset_type, counts in agg_summary_dict.items():
+        summary.items.append(
+            PrimaryAssetSummaryItem(
+                asset_type=asset_type, merged=counts["aggregated"], removed=counts["removed"]
+            )
+        )
+    return summary
 
 
-def topologically_sorted_edges(graph: nx.DiGraph) -> list[tuple[str, str]]:
-    sorted_nodes = list(nx.topological_sort(graph))
-    position = {node: i for i, node in enumerate(sorted_nodes)}
+class PrimaryAggregationRecord(BaseModel):
+    """
+    Aggregatable segments of a primary aggregation run as names of their single edge
+    lines in flow order, and the runs merged in each segment as pairs of merged line
+    names and the name of the aggregated line.
+    """
 
-    # Sort edges by source node's position in the topological sort
-    return sorted(graph.edges(), key=lambda e: position[e[0]])
+    segments: list[list[str]] = []
+    runs: list[list[tuple[list[str], str]]] = []
 
 
-def aggregate_primary_conductors(circuit: Circuit) -> Circuit:
+def aggregate_primary_conductors(
+    circuit: Circuit, record: PrimaryAggregationRecord | None = None
+) -> Circuit:
     """
     This function intends to aggregate similar primary branches
     and preserves capacitor, transformers and switches.
+
+    If `record` is given, it is filled with the aggregatable segments of this run.
     """
-    summary = PrimaryAssetSummary(name="🔗 Merged Primary Edges", items=[])
-    d_graph = get_graph_from_circuit(circuit, directed=True)
-    edges_to_preserve = _get_list_of_edges_to_preserve(d_graph, circuit)
-    nodes_to_preserve = _get_list_of_nodes_to_preserve(circuit)
-    linear_trees = _get_linear_trees_from_graph(d_graph, edges_to_preserve)
-    multi_edge_trees = [tree for tree in linear_trees if len(tree.edges) > 1]
-    aggregatable_segments: list[nx.DiGraph] = []
-    for tree in multi_edge_trees:
-        preserved_nodes = set(tree.nodes) & nodes_to_preserve
-        segments = (
-            extract_segments_from_linear_tree(tree, preserved_nodes) if preserved_nodes else [tree]
-        )
-        aggregatable_segments.extend(seg for seg in segments if len(seg.edges) > 1)
+    tree = FeederTree.from_circuit(circuit)
+    edges_to_preserve = _get_edges_to_preserve(tree, circuit)
+    nodes_to_preserve = tree.get_mask(_get_list_of_nodes_to_preserve(circuit))
+    aggregatable_segments = get_linear_segments(tree, edges_to_preserve, nodes_to_preserve)
 
-    lines_aggregated, lines_to_remove = [], []
+    lines_aggregated, lines_to_remove, all_runs = [], [], []
     similarity_checker = LineSimilarity()
-    agg_summary_dict = defaultdict(lambda: defaultdict(int))
-    for graph in aggregatable_segments:
-        assert is_linear_tree(graph)
-        sorted_edges = topologically_sorted_edges(graph)
-        similar_edges, current_edge_type = [], None
-        for edge in sorted_edges:
-            edge_comps = graph.get_edge_data(*edge)["edge"]
-            if len(edge_comps) > 1:
-                continue
-            edge_comp = edge_comps[0]
-            if not similar_edges:
-                similar_edges = [edge_comp]
-                current_edge_type = type(edge_comp)
-                continue
-            similarity_checker = LineSimilarity()
-            if isinstance(edge_comp, current_edge_type) and similarity_checker.check_if_similar(
-                similar_edges[-1], edge_comp
-            ):
-                similar_edges.append(edge_comp)
-                continue
-            if len(similar_edges) > 1:
-                agg_summary_dict[current_edge_type]["aggregated"] += 1
-                agg_summary_dict[current_edge_type]["removed"] += len(similar_edges)
-                lines_aggregated.append(aggregate_lines(similar_edges))
-                lines_to_remove.extend(similar_edges)
-            similar_edges = [edge_comp]
-            current_edge_type = type(edge_comp)
-
-        if len(similar_edges) > 1:
-            agg_summary_dict[current_edge_type]["aggregated"] += 1
-            agg_summary_dict[current_edge_type]["removed"] += len(similar_edges)
-            lines_aggregated.append(aggregate_lines(similar_edges))
+    for segment in aggregatable_segments:
+        edge_comps = [tree.get_edge_components(tree.parent_edge[bus]) for bus in segment]
+        # Parallel edges are left as is and do not break a run of similar lines.
+        single_edge_comps = [comps[0] for comps in edge_comps if len(comps) == 1]
+        runs = get_similar_line_runs(single_edge_comps, similarity_checker)
+        segment_runs = []
+        for similar_edges in runs:
+            aggregated_line = aggregate_lines(similar_edges)
+            lines_aggregated.append(aggregated_line)
             lines_to_remove.extend(similar_edges)
-
-    for asset_type, counts in agg_summary_dict.items():
-        summary.items.append(
-            PrimaryAssetSummaryItem(
-                asset_type=asset_type, merged=counts["aggregated"], removed=counts["removed"]
-            )
-        )
-    all_lines = [line.root for line in circuit.Line.root.root]
-    line_names_to_remove = [line.Name for line in lines_to_remove]
-    filtered_lines: list[LINE_TYPE] = [
-        line for line in all_lines if line.Name not in line_names_to_remove
-    ]
-    new_circuit = copy.deepcopy(circuit)
-    _update_circuit_in_place(new_circuit, filtered_lines + lines_aggregated, Line)
-    buses_to_keep = _get_buses_to_keep(new_circuit)
-    new_circuit.Bus = [bus for bus in new_circuit.Bus if bus.Name in buses_to_keep]
-    print(f"Number of aggregated lines = {len(lines_aggregated)}")
-    print(f"Number of removed lines = {len(lines_to_remove)}")
+            segment_runs.append(([line.Name for line in similar_edges], aggregated_line.Name))
+        all_runs.extend(runs)
+        if record is not None:
+            record.segments.append([line.Name for line in single_edge_comps])
+            record.runs.append(segment_runs)
+
+    summary = get_primary_summary(all_runs)
+    # Lines merged into aggregated lines are recorded as the stage's elements in and out.
+    with profile_stage("line_merge") as stage:
+        all_lines = [line.root for line in circuit.Line.root.root]
+        line_names_to_remove = {line.Name for line in lines_to_remove}
+        filtered_lines: list[LINE_TYPE] = [
+            line for line in all_lines if line.Name not in line_names_to_remove
+        ]
+        new_circuit = circuit.model_copy()
+        _update_circuit_in_place(new_circuit, filtered_lines + lines_aggregated, Line)
+        buses_to_keep = _get_buses_to_keep(new_circuit)
+        new_circuit.Bus = [bus for bus in new_circuit.Bus if bus.Name in buses_to_keep]
+        if stage is not None:
+            stage.elements_in = len(lines_to_remove)
+            stage.elements_out = len(lines_aggregated)
     return new_circuit, summary
 
 
-def _get_buses_to_keep(circuit: Circuit) -> set:
+def _get_buses_to_keep(circuit: Circuit) -> set[str]:
     buses_to_keep = set()
-    lines = [line.root for line in circuit.Line.root.root]
-    transformers = (
-        [transformer.root for transformer in circuit.Transformer.root.root]
-        if circuit.Transformer
-        else []
-    )
-    for line in lines:
-        for bus in [line.Bus1, line.Bus2]:
-            buses_to_keep.add(bus.root.split(".")[0])
-    for transformer in transformers:
-        for bus in transformer.Bus:
-            buses_to_keep.add(bus.root.split(".")[0])
+    for line in circuit.Line.root.root:
+        buses_to_keep.add(line.root.Bus1.root.split(".", 1)[0])
+        buses_to_keep.add(line.root.Bus2.root.split(".", 1)[0])
+    if circuit.Transformer:
+        for transformer in circuit.Transformer.root.root:
+            buses_to_keep.update(bus.root.split(".", 1)[0] for bus in transformer.root.Bus)
     return buses_to_keep
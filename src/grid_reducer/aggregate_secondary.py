@@ -1,11 +1,11 @@
 from typing import TypeVar
 from typing import Any, Type
 from collections import defaultdict
-import copy
 
-import networkx as nx
+import numpy as np
 from pydantic import BaseModel
 
+from grid_reducer.altdss import altdss_models
 from grid_reducer.altdss.altdss_models import (
     Circuit,
     Load,
@@ -21,10 +21,9 @@ from grid_reducer.altdss.altdss_models import (
     SwtControl,
     Fuse,
 )
-from grid_reducer.network import get_graph_from_circuit, get_source_connected_component
+from grid_reducer.feeder_tree import FeederTree
 from grid_reducer.utils import (
-    get_bus_connected_assets,
-    get_circuit_bus_name,
+    get_bus_connected_assets_mapper,
     get_normally_open_switches,
     get_open_lines,
 )
@@ -32,6 +31,7 @@ from grid_reducer.aggregators.registry import AGGREGATION_FUNC_REGISTRY
 from grid_reducer.summary import SecondaryAssetSummary, SecondaryAssetSummaryItem
 
 T = TypeVar("T")
+SECONDARY_ASSET_TYPES = [Load, PVSystem, Capacitor, Storage, Generator, Reactor]
 
 
 def aggregate_generic_objects(objects: list[T], bus1: str, kv: float) -> list[Any]:
@@ -47,32 +47,35 @@ def aggregate_generic_objects(objects: list[T], bus1: str, kv: float) -> list[An
     return agg_objects
 
 
-def _update_circuit_in_place(circuit: Circuit, assets: list[Any], asset_type) -> None:
+def get_validated_container(circuit: Circuit, assets: list[Any], asset_type) -> Any:
+    """Returns a container of the circuit's container type holding revalidated `assets`."""
     container_class = type(getattr(circuit, asset_type.__name__))
     asset_list_class = type(getattr(circuit, asset_type.__name__).root)
-    setattr(
-        circuit,
-        asset_type.__name__,
-        container_class(
-            root=asset_list_class(
-                root=[asset_type(root=asset.model_dump(mode="python")) for asset in assets]
-                if "root" in asset_type.model_fields
-                else assets
-            ).model_dump(mode="python")
-        ),
+    return container_class(
+        root=asset_list_class(
+            root=[asset_type(root=asset.model_dump(mode="python")) for asset in assets]
+            if "root" in asset_type.model_fields
+            else assets
+        ).model_dump(mode="python")
     )
 
 
+def _update_circuit_in_place(circuit: Circuit, assets: list[Any], asset_type) -> None:
+    setattr(circuit, asset_type.__name__, get_validated_container(circuit, assets, asset_type))
+
+
 def _filter_assets_by_graph_nodes(
-    list_of_nodes: list[str], circuit: Circuit, asset_types: list[Type[BaseModel]]
+    list_of_nodes: list[str],
+    asset_mapper: dict[Type[BaseModel], dict[str, list[BaseModel]]],
+    asset_types: list[Type[BaseModel]],
 ) -> dict[Type[BaseModel], list[BaseModel]]:
     assets_to_keep = defaultdict(list)
     for asset_type in asset_types:
+        bus_asset_mapper = asset_mapper[asset_type]
+        if not bus_asset_mapper:
+            continue
         for node in list_of_nodes:
-            container_obj = getattr(circuit, asset_type.__name__)
-            if container_obj is None:
-                continue
-            assets_to_keep[asset_type].extend(get_bus_connected_assets(container_obj, node))
+            assets_to_keep[asset_type].extend(bus_asset_mapper.get(node, []))
     return assets_to_keep
 
 
@@ -89,74 +92,107 @@ def filter_secondary_switches(
     return keep_switches
 
 
-def get_edge_names(graph: nx.Graph) -> set[str]:
-    return set([data["name"] for _, _, data in graph.edges(data=True)])
+def get_secondary_summary(
+    aggregated_names: dict[str, dict[str, list[str]]], asset_types: list[Type[BaseModel]]
+) -> SecondaryAssetSummary:
+    """Summarizes aggregated asset names by asset type and kept node."""
+    summary = SecondaryAssetSummary(name="🧹 Removed Secondary Assets", items=[])
+    for asset_type in asset_types:
+        node_names = aggregated_names.get(asset_type.__name__)
+        if node_names:
+            summary.items.append(
+                SecondaryAssetSummaryItem(
+                    asset_type=asset_type,
+                    removed_count=len(node_names),
+                    aggregated_count=sum(len(names) for names in node_names.values()),
+                )
+            )
+    return summary
+
+
+class SecondaryAggregationRecord(BaseModel):
+    """
+    Aggregation boundaries of a secondary aggregation run: pruned nodes, leaf bus and kV
+    of each kept node they are aggregated to, and names of the aggregated assets by
+    asset type and kept node.
+    """
+
+    pruned_nodes: dict[str, list[str]] = {}
+    leaf_buses: dict[str, str] = {}
+    kv: dict[str, float] = {}
+    aggregated_names: dict[str, dict[str, list[str]]] = {}
 
 
 def aggregate_secondary_assets(
-    circuit: Circuit, threshold_kv_ln: float = 1.0
+    circuit: Circuit,
+    threshold_kv_ln: float = 1.0,
+    record: SecondaryAggregationRecord | None = None,
 ) -> tuple[Circuit, SecondaryAssetSummary]:
     """
     Aggregates assets connected at voltage levels lower than a given threshold
     to a parent node with a voltage close to the threshold.
+
+    If `record` is given, it is filled with the aggregation boundaries of this run.
     """
-    # Convert circuit to a directed graph
-    d_graph: nx.DiGraph = get_graph_from_circuit(circuit, directed=True)
-    u_graph: nx.Graph = get_source_connected_component(
-        get_graph_from_circuit(circuit, directed=False), get_circuit_bus_name(circuit)
-    )
-    pruned_edge_names = list(get_edge_names(u_graph) - get_edge_names(d_graph))
-    summary = SecondaryAssetSummary(name="🧹 Removed Secondary Assets", items=[])
+    tree = FeederTree.from_circuit(circuit)
+    pruned_edge_names = tree.get_non_tree_edge_names()
 
     # Filter nodes to keep those above the threshold voltage
-    nodes_to_keep = [
-        node for node in d_graph.nodes if d_graph.nodes[node]["kv"] >= threshold_kv_ln
-    ]
-    agg_graph: nx.DiGraph = d_graph.subgraph(nodes_to_keep)
+    with np.errstate(invalid="ignore"):
+        keep_mask = tree.reached & (tree.kv >= threshold_kv_ln)
+    kept_buses = tree.order[keep_mask[tree.order]]
+    nodes_to_keep = [tree.names[bus] for bus in kept_buses]
+    nodes_to_keep_set = set(nodes_to_keep)
 
     # Aggregate assets for each leaf node
     aggregated_assets = defaultdict(list)
-    asset_types = [Load, PVSystem, Capacitor, Storage, Generator, Reactor]
-    for asset_type in asset_types:
-        agg_nodes, reduced_assets = 0, 0
-        for node in agg_graph.nodes:
-            if agg_graph.out_degree(node) < d_graph.out_degree(node):
-                successors_diff = set(d_graph.successors(node)) - set(agg_graph.successors(node))
-                successors_descendants = [
-                    s_node
-                    for successor in successors_diff
-                    for s_node in nx.descendants(d_graph, successor)
-                ] + list(successors_diff)
-                agg_assets = _aggregate_leaf_assets(
-                    node, d_graph, d_graph.subgraph(successors_descendants), asset_type, circuit
-                )
-                if agg_assets:
-                    agg_nodes += 1
-                    reduced_assets += len(agg_assets)
-                    aggregated_assets[asset_type].extend(agg_assets)
-        if agg_nodes and reduced_assets:
-            summary.items.append(
-                SecondaryAssetSummaryItem(
-                    asset_type=asset_type, removed_count=agg_nodes, aggregated_count=reduced_assets
-                )
+    leaf_buses, aggregated_names = {}, defaultdict(dict)
+    asset_types = SECONDARY_ASSET_TYPES
+    asset_mapper = get_bus_connected_assets_mapper(circuit, asset_types)
+    pruned_nodes_mapper = _get_pruned_nodes_mapper(tree, keep_mask)
+    for node in nodes_to_keep:
+        if node not in pruned_nodes_mapper:
+            continue
+        leaf_bus = None
+        for asset_type in asset_types:
+            if not asset_mapper[asset_type]:
+                continue
+            leaf_bus = leaf_bus or _get_leaf_bus(node, tree)
+            leaf_buses[node] = leaf_bus
+            agg_assets = _aggregate_leaf_assets(
+                leaf_bus,
+                float(tree.kv[tree.index[node]]),
+                pruned_nodes_mapper[node],
+                asset_mapper[asset_type],
             )
+            if agg_assets:
+                aggregated_assets[asset_type].extend(agg_assets)
+                aggregated_names[asset_type.__name__][node] = [asset.Name for asset in agg_assets]
+
+    if record is not None:
+        record.pruned_nodes = dict(pruned_nodes_mapper)
+        record.leaf_buses = leaf_buses
+        record.kv = {node: float(tree.kv[tree.index[node]]) for node in pruned_nodes_mapper}
+        record.aggregated_names = dict(aggregated_names)
 
-    new_circuit = copy.deepcopy(circuit)
-    assets_to_keep = _filter_assets_by_graph_nodes(nodes_to_keep, circuit, asset_types)
+    summary = get_secondary_summary(aggregated_names, asset_types)
+
+    # Containers are shared with the input circuit, every changed field is replaced below
+    new_circuit = circuit.model_copy()
+    assets_to_keep = _filter_assets_by_graph_nodes(nodes_to_keep, asset_mapper, asset_types)
     for asset_type in asset_types:
         assets = assets_to_keep.get(asset_type, []) + aggregated_assets.get(asset_type, [])
         if assets:
             _update_circuit_in_place(new_circuit, assets, asset_type)
 
-    assets_to_keep_mapper = {
-        cls: [
-            comp
-            for _, _, data in agg_graph.edges(data=True)
-            if data["component_type"] == cls.__name__
-            for comp in data["edge"]
-        ]
-        for cls in [Line, Reactor, Transformer]
-    }
+    assets_to_keep_mapper = {cls: [] for cls in [Line, Reactor, Transformer]}
+    for bus in kept_buses.tolist():
+        for child in tree.get_children(bus).tolist():
+            if keep_mask[child]:
+                edge = tree.parent_edge[child]
+                assets_to_keep_mapper[getattr(altdss_models, tree.edge_types[edge])].extend(
+                    tree.get_edge_components(edge)
+                )
     no_switches = get_normally_open_switches(circuit) + get_open_lines(circuit) + pruned_edge_names
     primary_switches = filter_secondary_switches(no_switches, circuit, threshold_kv_ln)
     for line in circuit.Line.root.root:
@@ -190,31 +226,47 @@ def aggregate_secondary_assets(
                 continue
         post_commands.append(command)
     new_circuit.PostCommands = post_commands
-    new_circuit.Bus = [bus for bus in new_circuit.Bus if bus.Name in nodes_to_keep]
+    new_circuit.Bus = [bus for bus in new_circuit.Bus if bus.Name in nodes_to_keep_set]
     return new_circuit, summary
 
 
+def _get_pruned_nodes_mapper(tree: FeederTree, keep_mask: np.ndarray) -> dict[str, list[str]]:
+    """Maps each kept node to the pruned nodes below it, in DFS order.
+
+    Every pruned node is assigned to its nearest kept ancestor.
+    """
+    owners = tree.get_nearest_ancestors(keep_mask)
+    pruned_nodes_mapper = defaultdict(list)
+    for bus, owner in zip(tree.order.tolist(), owners[tree.order].tolist(), strict=True):
+        if owner != -1:
+            pruned_nodes_mapper[tree.names[owner]].append(tree.names[bus])
+    return pruned_nodes_mapper
+
+
+def _get_leaf_bus(leaf: str, tree: FeederTree) -> str:
+    """Returns the bus connection (with phases) of the leaf node to aggregate assets on."""
+    parent_edge = tree.parent_edge[tree.index[leaf]]
+    in_edges = [tree.get_edge_components(parent_edge)] if parent_edge != -1 else []
+    leaf_bus_set = _extract_leaf_buses(leaf, in_edges)
+
+    if len(leaf_bus_set) > 1:
+        raise NotImplementedError(f"Multiple phases not supported yet: {leaf_bus_set=}")
+    return leaf_bus_set.pop()
+
+
 def _aggregate_leaf_assets(
-    leaf: str, d_graph: nx.DiGraph, descendant_graph: nx.DiGraph, asset_type: T, circuit: Circuit
+    leaf_bus: str,
+    kv: float,
+    pruned_nodes: list[str],
+    bus_asset_mapper: dict[str, list[T]],
 ) -> list[T] | None:
     """Helper function to aggregate assets for a given leaf node."""
 
-    asset_container = getattr(circuit, asset_type.__name__)
-    if not asset_container:
+    if not bus_asset_mapper:
         return
 
-    # Get incoming edges and extract bus information
-    in_edges = [data["edge"] for _, _, data in d_graph.in_edges(leaf, data=True)]
-    leaf_bus_set = _extract_leaf_buses(leaf, in_edges)
-
-    if len(leaf_bus_set) > 1:
-        raise NotImplementedError(f"Multiple phases not supported yet: {leaf_bus_set=}")
-    assets = [
-        asset
-        for node in descendant_graph.nodes
-        for asset in get_bus_connected_assets(asset_container, node)
-    ]
-    return aggregate_generic_objects(assets, bus1=leaf_bus_set.pop(), kv=d_graph.nodes[leaf]["kv"])
+    assets = [asset for node in pruned_nodes for asset in bus_asset_mapper.get(node, [])]
+    return aggregate_generic_objects(assets, bus1=leaf_bus, kv=kv)
 
 
 def combine_bus_names(bus_names):
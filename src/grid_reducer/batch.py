@@ -0,0 +1,231 @@
+from pathlib import Path
+from typing import Type
+import multiprocessing
+from multiprocessing.connection import wait
+import csv
+import glob
+import json
+import os
+import re
+import time
+import traceback
+
+from pydantic import BaseModel
+
+from grid_reducer.reducer import OpenDSSModelReducer
+from grid_reducer.add_differential_privacy import BasePrivacyConfig, get_independent_noise_seeds
+from grid_reducer.cache import CircuitCache
+from grid_reducer.profiling import get_peak_rss
+from grid_reducer.validation import PowerFlowValidationReport
+
+
+MASTER_FILE_PATTERN = re.compile(r".*master.*\.dss$", re.IGNORECASE)
+
+
+class BatchReductionJob(BaseModel):
+    master_file: Path
+    reduced_ckt_output_file: Path
+    original_ckt_output_file: Path | None = None
+
+
+class BatchReductionResult(BaseModel):
+    master_file: Path
+    status: str
+    reduced_ckt_output_file: Path | None = None
+    original_ckt_output_file: Path | None = None
+    elapsed_time: float
+    peak_rss: int | None = None
+    max_voltage_error_pu: float | None = None
+    power_error_pct: float | None = None
+    error: str | None = None
+
+
+def _read_manifest_file(manifest_file: Path) -> list[Path]:
+    """Reads master file paths from a json list or a text file with one path per line."""
+    if manifest_file.suffix == ".json":
+        with open(manifest_file, "r", encoding="utf-8") as fp:
+            entries = json.load(fp)
+    else:
+        with open(manifest_file, "r", encoding="utf-8") as fp:
+            entries = [line.strip() for line in fp]
+        entries = [entry for entry in entries if entry and not entry.startswith("#")]
+    return [
+        Path(entry) if Path(entry).is_absolute() else manifest_file.parent / entry
+        for entry in entries
+    ]
+
+
+def get_master_files(source: Path | str) -> list[Path]:
+    """Resolves a master dss file, a directory, a glob pattern or a manifest file
+    into a sorted list of master dss files."""
+    source_path = Path(source)
+    if source_path.is_dir():
+        files = [f for f in source_path.rglob("*.dss") if MASTER_FILE_PATTERN.search(f.name)]
+    elif source_path.is_file():
+        files = [source_path] if source_path.suffix == ".dss" else _read_manifest_file(source_path)
+    else:
+        files = [Path(f) for f in glob.glob(str(source), recursive=True)]
+    missing_files = [f for f in files if not f.is_file()]
+    if missing_files:
+        raise FileNotFoundError(f"Master files do not exist: {missing_files}")
+    return sorted(set(files))
+
+
+def get_batch_reduction_jobs(
+    master_files: list[Path], output_folder: Path | str, export_original: bool = True
+) -> list[BatchReductionJob]:
+    """Creates one job per master file, each writing to its own output sub folder."""
+    output_folder = Path(output_folder)
+    parents = [f.resolve().parent for f in master_files]
+    common_folder = Path(os.path.commonpath(parents)) if parents else output_folder
+    jobs = []
+    for master_file, parent in zip(master_files, parents, strict=True):
+        job_folder = output_folder / parent.relative_to(common_folder) / master_file.stem
+        jobs.append(
+            BatchReductionJob(
+                master_file=master_file,
+                reduced_ckt_output_file=job_folder / "reduced_ckt.dss",
+                original_ckt_output_file=job_folder / "original_ckt.dss"
+                if export_original
+                else None,
+            )
+        )
+    return jobs
+
+
+def _run_reduction_job(
+    job: BatchReductionJob, connection, reduce_kwargs: dict, cache_folder: Path | None
+):
+    """Runs a single reduction in a worker process with its own OpenDSS engine."""
+    try:
+        job.reduced_ckt_output_file.parent.mkdir(parents=True, exist_ok=True)
+        cache = CircuitCache(cache_folder) if cache_folder else None
+        reducer_obj = OpenDSSModelReducer(job.master_file, cache=cache)
+        reduced_ckt = reducer_obj.reduce(**reduce_kwargs)
+        reducer_obj.export(reduced_ckt, job.reduced_ckt_output_file)
+        if job.original_ckt_output_file:
+            reducer_obj.export_original_ckt(job.original_ckt_output_file)
+        report = reducer_obj.validation_report
+        connection.send(("success", None, get_peak_rss(), report))
+    except Exception:
+        connection.send(("failed", traceback.format_exc(), get_peak_rss(), None))
+    finally:
+        connection.close()
+
+
+def _get_job_result(
+    job: BatchReductionJob,
+    status: str,
+    start_time: float,
+    error: str | None = None,
+    peak_rss: int | None = None,
+    report: PowerFlowValidationReport | None = None,
+) -> BatchReductionResult:
+    succeeded = status == "success"
+    return BatchReductionResult(
+        master_file=job.master_file,
+        status=status,
+        reduced_ckt_output_file=job.reduced_ckt_output_file if succeeded else None,
+        original_ckt_output_file=job.original_ckt_output_file if succeeded else None,
+        elapsed_time=round(time.monotonic() - start_time, 3),
+        peak_rss=peak_rss,
+        max_voltage_error_pu=report.max_voltage_error_pu if report else None,
+        power_error_pct=report.power_error_pct if report else None,
+        error=error,
+    )
+
+
+def reduce_feeders_in_parallel(
+    jobs: list[BatchReductionJob],
+    workers: int | None = None,
+    timeout: float | None = None,
+    reduce_secondary: bool = True,
+    aggregate_primary: bool = True,
+    transform_coordinate: bool = True,
+    noise_config: Type[BasePrivacyConfig] | None = None,
+    layout: str = "kamada_kawai",
+    cache_folder: Path | str | None = None,
+    validate: bool = False,
+    noise_seed: int | None = None,
+) -> list[BatchReductionResult]:
+    """
+    Reduces feeders across a pool of worker processes.
+
+    Each feeder runs in a fresh process so that every reduction gets its own OpenDSS
+    engine, and a feeder exceeding `timeout` seconds is terminated without affecting
+    the other feeders. If `cache_folder` is given, parsed circuits are shared
+    across runs through a `CircuitCache`. If `validate` is true, voltage and power errors
+    of each reduction are added to its result. Each feeder gets its own noise seed derived
+    from `noise_seed`, so a batch can be reproduced without correlating the noise of
+    published feeders. Results are returned in the same order as `jobs`.
+    """
+    workers = workers or os.cpu_count() or 1
+    reduce_kwargs = {
+        "reduce_secondary": reduce_secondary,
+        "aggregate_primary": aggregate_primary,
+        "transform_coordinate": transform_coordinate,
+        "noise_config": noise_config,
+        "layout": layout,
+        "validate": validate,
+    }
+    noise_seeds = get_independent_noise_seeds(noise_seed, len(jobs))
+    context = multiprocessing.get_context()
+    pending_jobs = list(enumerate(jobs))
+    running_jobs = {}
+    results: dict[int, BatchReductionResult] = {}
+
+    while pending_jobs or running_jobs:
+        while pending_jobs and len(running_jobs) < workers:
+            index, job = pending_jobs.pop(0)
+            receiver, sender = context.Pipe(duplex=False)
+            process = context.Process(
+                target=_run_reduction_job,
+                args=(
+                    job,
+                    sender,
+                    {**reduce_kwargs, "noise_seed": noise_seeds[index]},
+                    cache_folder,
+                ),
+                daemon=True,
+            )
+            process.start()
+            sender.close()
+            running_jobs[index] = (job, process, receiver, time.monotonic())
+
+        wait_time = 0.5
+        if timeout is not None:
+            earliest_start = min(start_time for _, _, _, start_time in running_jobs.values())
+            wait_time = min(wait_time, max(earliest_start + timeout - time.monotonic(), 0))
+        wait([receiver for _, _, receiver, _ in running_jobs.values()], timeout=wait_time)
+        for index, (job, process, receiver, start_time) in list(running_jobs.items()):
+            peak_rss, report = None, None
+            if receiver.poll():
+                try:
+                    status, error, peak_rss, report = receiver.recv()
+                except EOFError:
+                    status, error = "failed", f"Worker exited with code {process.exitcode}."
+            elif timeout is not None and time.monotonic() - start_time > timeout:
+                process.kill()
+                status, error = "timeout", f"Reduction exceeded {timeout} seconds."
+            else:
+                continue
+            process.join()
+            receiver.close()
+            results[index] = _get_job_result(job, status, start_time, error, peak_rss, report)
+            del running_jobs[index]
+
+    return [results[index] for index in range(len(jobs))]
+
+
+def write_batch_results(results: list[BatchReductionResult], output_file: Path | str) -> None:
+    """Writes batch results to a json file, or to a csv file for any other extension."""
+    output_file = Path(output_file)
+    rows = [result.model_dump(mode="json") for result in results]
+    if output_file.suffix == ".json":
+        with open(output_file, "w", encoding="utf-8") as fp:
+            json.dump(rows, fp, indent=2)
+        return
+    with open(output_file, "w", encoding="utf-8", newline="") as fp:
+        writer = csv.DictWriter(fp, fieldnames=list(BatchReductionResult.model_fields))
+        writer.writeheader()
+        writer.writerows(rows)
@@ -0,0 +1,107 @@
+from typing import Iterable
+
+import numpy as np
+
+from grid_reducer.altdss.altdss_models import Bus, Circuit
+
+
+def _get_column(values: list[float | None]) -> tuple[np.ndarray, np.ndarray]:
+    """Returns float array with NaN for missing values and the null mask."""
+    null_mask = np.fromiter((value is None for value in values), dtype=bool, count=len(values))
+    column = np.fromiter(
+        (np.nan if value is None else value for value in values), dtype=float, count=len(values)
+    )
+    return column, null_mask
+
+
+def _get_changed_mask(
+    column: np.ndarray, null_mask: np.ndarray, old_column: np.ndarray, old_null_mask: np.ndarray
+) -> np.ndarray:
+    return (null_mask != old_null_mask) | (~null_mask & (column != old_column))
+
+
+class BusTable:
+    """
+    Columnar table of circuit buses.
+
+    Bus names are indexed by position and X, Y and kVLN are stored as float arrays with
+    a null mask each, so coordinate and voltage operations run as vectorized NumPy
+    operations. Tables are converted back to `Circuit.Bus` with `to_buses`, which only
+    copies buses whose values changed.
+    """
+
+    def __init__(self, buses: list[Bus]):
+        self.buses = list(buses)
+        self.names = [bus.Name for bus in self.buses]
+        self.index = {name: idx for idx, name in enumerate(self.names)}
+        self.x, self.x_null = _get_column([bus.X for bus in self.buses])
+        self.y, self.y_null = _get_column([bus.Y for bus in self.buses])
+        self.kv_ln, self.kv_ln_null = _get_column([bus.kVLN for bus in self.buses])
+        self._original_columns = {
+            "X": (self.x.copy(), self.x_null.copy()),
+            "Y": (self.y.copy(), self.y_null.copy()),
+            "kVLN": (self.kv_ln.copy(), self.kv_ln_null.copy()),
+        }
+
+    @classmethod
+    def from_circuit(cls, circuit: Circuit) -> "BusTable":
+        return cls(circuit.Bus or [])
+
+    def __len__(self) -> int:
+        return len(self.names)
+
+    @property
+    def xy_mask(self) -> np.ndarray:
+        """Returns mask of buses having both X and Y coordinates."""
+        return ~(self.x_null | self.y_null)
+
+    def get_mask(self, bus_names: Iterable[str]) -> np.ndarray:
+        """Returns mask of buses in `bus_names`, names not in the table are ignored."""
+        mask = np.zeros(len(self), dtype=bool)
+        mask[[self.index[name] for name in bus_names if name in self.index]] = True
+        return mask
+
+    def get_kv_ln_mapper(self) -> dict[str, float | None]:
+        kv_ln = [
+            None if null else value
+            for value, null in zip(self.kv_ln.tolist(), self.kv_ln_null, strict=True)
+        ]
+        return dict(zip(self.names, kv_ln, strict=True))
+
+    def set_coordinates(
+        self, x: np.ndarray, y: np.ndarray, mask: np.ndarray | None = None
+    ) -> None:
+        """Sets coordinates of buses in `mask`, or of all buses if mask is not given."""
+        mask = np.ones(len(self), dtype=bool) if mask is None else mask
+        self.x[mask], self.y[mask] = x, y
+        self.x_null[mask] = self.y_null[mask] = False
+
+    def clear_coordinates(self, mask: np.ndarray | None = None) -> None:
+        """Removes coordinates of buses in `mask`, or of all buses if mask is not given."""
+        mask = np.ones(len(self), dtype=bool) if mask is None else mask
+        self.x[mask] = self.y[mask] = np.nan
+        self.x_null[mask] = self.y_null[mask] = True
+
+    def to_buses(self) -> list[Bus]:
+        columns = {
+            "X": (self.x, self.x_null),
+            "Y": (self.y, self.y_null),
+            "kVLN": (self.kv_ln, self.kv_ln_null),
+        }
+        changed_masks = {
+            field: _get_changed_mask(*columns[field], *self._original_columns[field])
+            for field in columns
+        }
+        new_buses = list(self.buses)
+        for idx in np.flatnonzero(np.logical_or.reduce(list(changed_masks.values()))):
+            update = {
+                field: None if columns[field][1][idx] else float(columns[field][0][idx])
+                for field, changed_mask in changed_masks.items()
+                if changed_mask[idx]
+            }
+            new_buses[idx] = self.buses[idx].model_copy(update=update)
+        return new_buses
+
+    def to_circuit(self, circuit: Circuit) -> Circuit:
+        """Returns copy of the circuit with buses from this table."""
+        return circuit.model_copy(update={"Bus": self.to_buses()})
@@ -0,0 +1,138 @@
+from pathlib import Path
+import hashlib
+import os
+import pickle
+import re
+import uuid
+
+from grid_reducer.altdss.altdss_models import Circuit
+from grid_reducer.utils import get_ckt_from_opendss_model
+from grid_reducer.version import VERSION
+
+
+DEFAULT_CACHE_FOLDER = Path.home() / ".cache" / "grid_reducer"
+DEFAULT_MAX_CACHE_SIZE = 2 * 1024**3
+FILE_COMMAND_PATTERN = re.compile(
+    r"^\s*(redirect|compile|buscoords|latlongcoords)\s+(\"[^\"]+\"|'[^']+'|\S+)", re.IGNORECASE
+)
+FILE_PROPERTY_PATTERN = re.compile(r"\bfile\s*=\s*(\"[^\"]+\"|'[^']+'|[^\s\)]+)", re.IGNORECASE)
+
+
+def _strip_comment(line: str) -> str:
+    return re.split(r"!|//", line, maxsplit=1)[0]
+
+
+def get_referenced_files(master_file: Path) -> list[Path]:
+    """Returns master file and every file it redirects to or reads data from.
+
+    Redirected and compiled files are followed recursively, paths are resolved
+    relative to the file referencing them the same way OpenDSS does.
+    """
+    files, to_visit = [], [Path(master_file).resolve()]
+    while to_visit:
+        dss_file = to_visit.pop(0)
+        if dss_file in files or not dss_file.is_file():
+            continue
+        files.append(dss_file)
+        if dss_file.suffix.lower() != ".dss":
+            continue
+        with open(dss_file, "r", encoding="utf-8", errors="ignore") as fp:
+            for line in fp:
+                line = _strip_comment(line)
+                matches = [m.group(2) for m in FILE_COMMAND_PATTERN.finditer(line)]
+                matches += [m.group(1) for m in FILE_PROPERTY_PATTERN.finditer(line)]
+                for match in matches:
+                    to_visit.append((dss_file.parent / match.strip("\"'")).resolve())
+    return files
+
+
+def get_file_hash(file_path: Path) -> str:
+    file_hash = hashlib.sha256()
+    with open(file_path, "rb") as fp:
+        for chunk in iter(lambda: fp.read(1024 * 1024), b""):
+            file_hash.update(chunk)
+    return file_hash.hexdigest()
+
+
+class CircuitCache:
+    """
+    Content addressed on-disk cache of validated circuit models.
+
+    Entries are keyed by the hashes of the master file and every file it references,
+    so any edit to the model invalidates the entry. The cache is bounded by
+    `max_size` bytes and evicts least recently used entries first.
+    """
+
+    def __init__(
+        self,
+        cache_folder: Path | str = DEFAULT_CACHE_FOLDER,
+        max_size: int = DEFAULT_MAX_CACHE_SIZE,
+    ):
+        self.cache_folder = Path(cache_folder)
+        self.max_size = max_size
+        self.cache_folder.mkdir(parents=True, exist_ok=True)
+
+    def get_key(self, master_file: Path | str, solve: bool = True, lazy: bool = False) -> str:
+        """Returns key of the master file loaded with or without solving the circuit, as a
+        validated or a lazy circuit."""
+        master_file = Path(master_file).resolve()
+        key_hash = hashlib.sha256(f"{VERSION}|solve={solve}|lazy={lazy}".encode())
+        for file_path in get_referenced_files(master_file):
+            relative_path = os.path.relpath(file_path, master_file.parent)
+            key_hash.update(f"|{relative_path}|{get_file_hash(file_path)}".encode())
+        return key_hash.hexdigest()
+
+    def _get_entry_path(self, key: str) -> Path:
+        return self.cache_folder / f"{key}.pkl"
+
+    def get(self, key: str) -> Circuit | None:
+        entry_path = self._get_entry_path(key)
+        try:
+            with open(entry_path, "rb") as fp:
+                circuit = pickle.load(fp)
+        except (FileNotFoundError, EOFError, pickle.UnpicklingError):
+            return None
+        try:
+            os.utime(entry_path)
+        except FileNotFoundError:
+            pass
+        return circuit
+
+    def put(self, key: str, circuit: Circuit) -> None:
+        entry_path = self._get_entry_path(key)
+        temp_path = entry_path.with_suffix(f".{uuid.uuid4().hex}.tmp")
+        with open(temp_path, "wb") as fp:
+            pickle.dump(circuit, fp, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(temp_path, entry_path)
+        self.evict()
+
+    def evict(self) -> None:
+        """Removes least recently used entries until cache fits in `max_size`."""
+        entries = []
+        for entry_path in self.cache_folder.glob("*.pkl"):
+            try:
+                stat = entry_path.stat()
+            except FileNotFoundError:
+                continue
+            entries.append((stat.st_mtime, stat.st_size, entry_path))
+        total_size = sum(size for _, size, _ in entries)
+        for _, size, entry_path in sorted(entries):
+            if total_size <= self.max_size:
+                break
+            entry_path.unlink(missing_ok=True)
+            total_size -= size
+
+    def clear(self) -> None:
+        for entry_path in self.cache_folder.glob("*.pkl"):
+            entry_path.unlink(missing_ok=True)
+
+    def get_circuit(
+        self, master_file: Path | str, solve: bool = True, lazy: bool = False
+    ) -> Circuit:
+        """Returns cached circuit for the master file, loading it through OpenDSS on a miss."""
+        key = self.get_key(master_file, solve, lazy)
+        circuit = self.get(key)
+        if circuit is None:
+            circuit = get_ckt_from_opendss_model(Path(master_file), solve=solve, lazy=lazy)
+            self.put(key, circuit)
+        return circuit
@@ -1,5 +1,5 @@
 import click
-from grid_reducer.cli.reducer import reduce
+from grid_reducer.cli.reducer import reduce, reduce_batch, reduce_scenarios, topology
 
 
 @click.group()
@@ -8,3 +8,6 @@ def cli():
 
 
 cli.add_command(reduce)
+cli.add_command(reduce_batch)
+cli.add_command(reduce_scenarios)
+cli.add_command(topology)
@@ -3,6 +3,18 @@ from pathlib import Path
 import click
 
 from grid_reducer.reducer import OpenDSSModelReducer
+from grid_reducer.cache import CircuitCache
+from grid_reducer.dss_writer import get_class_folder
+from grid_reducer.layouts import LAYOUT_FUNC_REGISTRY
+from grid_reducer.utils import print_summary_to_cli
+from grid_reducer.topology import TopologySummary, get_topology_from_opendss
+from grid_reducer.scenarios import get_publication_scenarios
+from grid_reducer.batch import (
+    get_master_files,
+    get_batch_reduction_jobs,
+    reduce_feeders_in_parallel,
+    write_batch_results,
+)
 from grid_reducer.add_differential_privacy import (
     LowPrivacyConfig,
     MediumPrivacyConfig,
@@ -46,6 +58,13 @@ noise_class_mapping = {
     default=True,
     help="Boolean flag indicating whether to transform coordinates or not.",
 )
+@click.option(
+    "-l",
+    "--layout",
+    type=click.Choice(list(LAYOUT_FUNC_REGISTRY), case_sensitive=True),
+    default="kamada_kawai",
+    help="Layout used for transforming coordinates. Use 'radial_tree' for large feeders.",
+)
 @click.option(
     "-nl",
     "--noise-level",
@@ -53,6 +72,13 @@ noise_class_mapping = {
     default="low",
     help="Str indicating the noise level to be added to the coordinates. Options are 'low', 'medium', 'high', 'none'. Default is 'low'.",
 )
+@click.option(
+    "-ns",
+    "--noise-seed",
+    type=int,
+    default=None,
+    help="Seed for the coordinate noise, the same seed reproduces the same noise.",
+)
 @click.option(
     "-eo",
     "--export-original",
@@ -74,25 +100,372 @@ noise_class_mapping = {
     default="original_ckt.dss",
     help="Path to output dss file for original circuit.",
 )
+@click.option(
+    "-sf",
+    "--split-files",
+    type=click.BOOL,
+    default=False,
+    help="Boolean flag indicating whether to write each component class to its own file, "
+    "redirected from the output file.",
+)
+@click.option(
+    "-v",
+    "--validate",
+    type=click.BOOL,
+    default=False,
+    help="Boolean flag indicating whether to compare power flow of original and reduced circuits.",
+)
+@click.option(
+    "-cf",
+    "--cache-folder",
+    type=str,
+    default=None,
+    help="Folder for caching parsed circuit models across runs. Caching is disabled if not provided.",
+)
+@click.option(
+    "-lz",
+    "--lazy",
+    type=click.BOOL,
+    default=False,
+    help="Boolean flag indicating whether to validate each component class on first use only.",
+)
+@click.option(
+    "-pf",
+    "--profile-file",
+    type=str,
+    default=None,
+    help="Path to file for exporting timing and memory profile of each reduction stage.",
+)
+@click.option(
+    "-pt",
+    "--profile-format",
+    type=click.Choice(["json", "chrome"], case_sensitive=True),
+    default="json",
+    help="Format of profile file, 'chrome' writes a chrome trace viewable in chrome://tracing.",
+)
 def reduce(
     opendss_file: str,
     remove_secondary: bool,
     aggregate_primary: bool,
     transform_coordinate: bool,
+    layout: str,
     noise_level: str,
+    noise_seed: int | None,
     export_original: bool,
     reduced_ckt_output_file: str,
     original_ckt_output_file: str,
+    split_files: bool,
+    validate: bool,
+    cache_folder: str | None,
+    lazy: bool,
+    profile_file: str | None,
+    profile_format: str,
 ):
+    if (
+        split_files
+        and export_original
+        and get_class_folder(reduced_ckt_output_file).resolve()
+        == get_class_folder(original_ckt_output_file).resolve()
+    ):
+        raise click.UsageError(
+            "Reduced and original circuits must be written to different files with split files."
+        )
     reducer_obj = OpenDSSModelReducer(
         Path(opendss_file),
+        cache=CircuitCache(cache_folder) if cache_folder else None,
+        lazy=lazy,
     )
     reduced_ckt = reducer_obj.reduce(
         reduce_secondary=remove_secondary,
         aggregate_primary=aggregate_primary,
         transform_coordinate=transform_coordinate,
         noise_config=noise_class_mapping.get(noise_level),
+        layout=layout,
+        noise_seed=noise_seed,
+        validate=validate,
     )
-    reducer_obj.export(reduced_ckt, reduced_ckt_output_file)
+    reducer_obj.export(reduced_ckt, reduced_ckt_output_file, split_files)
     if export_original:
-        reducer_obj.export_original_ckt(original_ckt_output_file)
+        reducer_obj.export_original_ckt(original_ckt_output_file, split_files)
+    if profile_file:
+        print_summary_to_cli(reducer_obj.profile.get_summary())
+        reducer_obj.profile.export(profile_file, profile_format)
+
+
+@click.command()
+@click.option(
+    "-s",
+    "--source",
+    type=str,
+    required=True,
+    help="Directory, glob pattern or manifest file (json list or one path per line) "
+    "of master opendss files to be reduced.",
+)
+@click.option(
+    "-o",
+    "--output-folder",
+    type=str,
+    default="reduced_ckts",
+    help="Folder in which reduced circuits are written, one sub folder per feeder.",
+)
+@click.option(
+    "-w",
+    "--workers",
+    type=click.IntRange(min=1),
+    default=None,
+    help="Number of worker processes. Defaults to the number of CPUs.",
+)
+@click.option(
+    "-t",
+    "--timeout",
+    type=click.FloatRange(min=0, min_open=True),
+    default=None,
+    help="Maximum time in seconds allowed for reducing a single feeder.",
+)
+@click.option(
+    "-r",
+    "--results-file",
+    type=str,
+    default="batch_results.csv",
+    help="Path to results table. Written as json if extension is .json otherwise csv.",
+)
+@click.option(
+    "-rs",
+    "--remove-secondary",
+    type=click.BOOL,
+    default=True,
+    help="Boolean flag indicating whether to reduce secondary or not.",
+)
+@click.option(
+    "-ap",
+    "--aggregate-primary",
+    type=click.BOOL,
+    default=True,
+    help="Boolean flag indicating whether to aggregate primary ckt or not.",
+)
+@click.option(
+    "-tc",
+    "--transform-coordinate",
+    type=click.BOOL,
+    default=True,
+    help="Boolean flag indicating whether to transform coordinates or not.",
+)
+@click.option(
+    "-l",
+    "--layout",
+    type=click.Choice(list(LAYOUT_FUNC_REGISTRY), case_sensitive=True),
+    default="kamada_kawai",
+    help="Layout used for transforming coordinates. Use 'radial_tree' for large feeders.",
+)
+@click.option(
+    "-nl",
+    "--noise-level",
+    type=click.Choice(["low", "moderate", "high", "none"], case_sensitive=True),
+    default="low",
+    help="Str indicating the noise level to be added to the coordinates. Options are 'low', 'medium', 'high', 'none'. Default is 'low'.",
+)
+@click.option(
+    "-ns",
+    "--noise-seed",
+    type=int,
+    default=None,
+    help="Seed for the coordinate noise, the same seed reproduces the same noise.",
+)
+@click.option(
+    "-eo",
+    "--export-original",
+    type=click.BOOL,
+    default=True,
+    help="Boolean flag indicating whether to export original circuit or not.",
+)
+@click.option(
+    "-v",
+    "--validate",
+    type=click.BOOL,
+    default=False,
+    help="Boolean flag indicating whether to compare power flow of original and reduced circuits.",
+)
+@click.option(
+    "-cf",
+    "--cache-folder",
+    type=str,
+    default=None,
+    help="Folder for caching parsed circuit models across runs. Caching is disabled if not provided.",
+)
+def reduce_batch(
+    source: str,
+    output_folder: str,
+    workers: int | None,
+    timeout: float | None,
+    results_file: str,
+    remove_secondary: bool,
+    aggregate_primary: bool,
+    transform_coordinate: bool,
+    layout: str,
+    noise_level: str,
+    noise_seed: int | None,
+    export_original: bool,
+    validate: bool,
+    cache_folder: str | None,
+):
+    master_files = get_master_files(source)
+    if not master_files:
+        raise click.UsageError(f"No master dss files found in {source}.")
+    jobs = get_batch_reduction_jobs(master_files, output_folder, export_original)
+    results = reduce_feeders_in_parallel(
+        jobs,
+        workers=workers,
+        timeout=timeout,
+        reduce_secondary=remove_secondary,
+        aggregate_primary=aggregate_primary,
+        transform_coordinate=transform_coordinate,
+        noise_config=noise_class_mapping.get(noise_level),
+        layout=layout,
+        cache_folder=cache_folder,
+        validate=validate,
+        noise_seed=noise_seed,
+    )
+    write_batch_results(results, results_file)
+    failed = [result for result in results if result.status != "success"]
+    click.echo(f"Reduced {len(results) - len(failed)} of {len(results)} feeders.")
+    for result in failed:
+        click.echo(f"{result.status}: {result.master_file}")
+
+
+@click.command()
+@click.option(
+    "-f",
+    "--opendss-file",
+    type=str,
+    help="Path to master opendss file for which data is to be extracted.",
+)
+@click.option(
+    "-o",
+    "--output-folder",
+    type=str,
+    default="reduced_ckts",
+    help="Folder in which reduced circuits are written, one sub folder per scenario.",
+)
+@click.option(
+    "-nl",
+    "--noise-level",
+    type=click.Choice(["low", "moderate", "high", "none"], case_sensitive=True),
+    multiple=True,
+    default=["low", "moderate", "high"],
+    help="Noise level of a scenario, can be repeated. Default is 'low', 'moderate' and 'high'.",
+)
+@click.option(
+    "-tc",
+    "--transform-coordinate",
+    type=click.BOOL,
+    multiple=True,
+    default=[True],
+    help="Whether to transform coordinates in a scenario, can be repeated to write both.",
+)
+@click.option(
+    "-l",
+    "--layout",
+    type=click.Choice(list(LAYOUT_FUNC_REGISTRY), case_sensitive=True),
+    default="kamada_kawai",
+    help="Layout used for transforming coordinates. Use 'radial_tree' for large feeders.",
+)
+@click.option(
+    "-ns",
+    "--noise-seed",
+    type=int,
+    default=None,
+    help="Seed for the coordinate noise, each scenario gets its own seed derived from it.",
+)
+@click.option(
+    "-rs",
+    "--remove-secondary",
+    type=click.BOOL,
+    default=True,
+    help="Boolean flag indicating whether to reduce secondary or not.",
+)
+@click.option(
+    "-ap",
+    "--aggregate-primary",
+    type=click.BOOL,
+    default=True,
+    help="Boolean flag indicating whether to aggregate primary ckt or not.",
+)
+@click.option(
+    "-sf",
+    "--split-files",
+    type=click.BOOL,
+    default=False,
+    help="Boolean flag indicating whether to write each component class to its own file, "
+    "redirected from the output file.",
+)
+@click.option(
+    "-w",
+    "--workers",
+    type=click.IntRange(min=1),
+    default=None,
+    help="Number of worker processes. Defaults to the number of CPUs.",
+)
+@click.option(
+    "-cf",
+    "--cache-folder",
+    type=str,
+    default=None,
+    help="Folder for caching parsed circuit models across runs. Caching is disabled if not provided.",
+)
+def reduce_scenarios(
+    opendss_file: str,
+    output_folder: str,
+    noise_level: tuple[str, ...],
+    transform_coordinate: tuple[bool, ...],
+    layout: str,
+    noise_seed: int | None,
+    remove_secondary: bool,
+    aggregate_primary: bool,
+    split_files: bool,
+    workers: int | None,
+    cache_folder: str | None,
+):
+    """Aggregates a feeder once and writes one reduced circuit per noise level and
+    coordinate transform."""
+    reducer_obj = OpenDSSModelReducer(
+        Path(opendss_file),
+        cache=CircuitCache(cache_folder) if cache_folder else None,
+    )
+    scenarios = get_publication_scenarios(
+        output_folder,
+        {level: noise_class_mapping[level] for level in dict.fromkeys(noise_level)},
+        list(dict.fromkeys(transform_coordinate)),
+        layout=layout,
+        noise_seed=noise_seed,
+        split_files=split_files,
+    )
+    results = reducer_obj.reduce_scenarios(
+        scenarios,
+        reduce_secondary=remove_secondary,
+        aggregate_primary=aggregate_primary,
+        workers=workers,
+    )
+    failed = [result for result in results if result.status != "success"]
+    click.echo(f"Wrote {len(results) - len(failed)} of {len(results)} scenarios.")
+    for result in failed:
+        click.echo(f"{result.status}: {result.output_file}\n{result.error}")
+
+
+@click.command()
+@click.option(
+    "-f",
+    "--opendss-file",
+    type=str,
+    help="Path to master dss file.",
+)
+@click.option(
+    "-t",
+    "--threshold-kv-ln",
+    type=float,
+    default=1.0,
+    help="Line to neutral kV below which buses are counted as secondary buses.",
+)
+def topology(opendss_file: str, threshold_kv_ln: float):
+    """Summarizes buses and edges of a feeder without building the full circuit model."""
+    tree = get_topology_from_opendss(Path(opendss_file)).get_feeder_tree()
+    print_summary_to_cli(TopologySummary.from_tree(tree, threshold_kv_ln).get_summary())
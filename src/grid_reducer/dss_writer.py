@@ -0,0 +1,143 @@
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from pathlib import Path
+from typing import TextIO
+import gzip
+
+from grid_reducer.altdss import altdss_models
+from grid_reducer.altdss.altdss_models import Bus, Circuit, Vsource, _dump_dss_container
+
+WRITE_BUFFER_SIZE = 1024 * 1024
+CONTAINER_FIELDS = [
+    field
+    for field in Circuit.model_fields
+    if field != "Bus" and hasattr(getattr(altdss_models, field, None), "dict_dump_dss")
+]
+
+
+@contextmanager
+def open_dss_file(output_file: Path | str):
+    """Opens a buffered text file for writing, gzip compressed if it ends with `.gz`."""
+    output_file = Path(output_file)
+    if output_file.suffix == ".gz":
+        with gzip.open(output_file, "wt", encoding="utf-8", compresslevel=6) as fp:
+            yield fp
+    else:
+        with open(output_file, "w", encoding="utf-8", buffering=WRITE_BUFFER_SIZE) as fp:
+            yield fp
+
+
+def write_dss_header(circuit: Circuit, output: TextIO) -> None:
+    output.write("clear\n")
+    if circuit.DefaultBaseFreq is not None:
+        output.write(f"set DefaultBaseFreq={circuit.DefaultBaseFreq}\n")
+    output.write(f"new Circuit.{circuit.Name}\n")
+    for command in circuit.PreCommands or []:
+        output.write(f"{command}\n")
+
+
+def write_dss_container(circuit: Circuit, field: str, output: TextIO) -> None:
+    """
+    Writes one container item by item, without dumping the whole circuit to a dict.
+
+    Lazy containers are validated first, as validation normalizes some values, e.g.
+    it drops the length of switches.
+    """
+    item_cls = getattr(altdss_models, field)
+    container = getattr(circuit, field)
+    if container is None:
+        return
+    items = getattr(container.root, "root", None)
+    if not isinstance(items, list):
+        # Containers referencing json files are left to altdss.
+        _dump_dss_container(container.model_dump(exclude_unset=True), item_cls, output)
+        return
+    for idx, item in enumerate(items):
+        edit = item_cls is Vsource and idx == 0
+        item_cls.dict_dump_dss(item.model_dump(exclude_unset=True), output, edit)
+
+
+def write_dss_buses(circuit: Circuit, output: TextIO) -> None:
+    for bus in circuit.Bus or []:
+        fields = {field: getattr(bus, field) for field in bus.model_fields_set}
+        Bus.dict_dump_dss(fields, output)
+
+
+def write_dss_post_commands(circuit: Circuit, output: TextIO) -> None:
+    for command in circuit.PostCommands or []:
+        output.write(f"{command}\n")
+
+
+def dump_circuit_dss(circuit: Circuit, output: TextIO) -> None:
+    """
+    Streams the circuit in the DSS script format to `output`.
+
+    Produces the same script as `Circuit.dump_dss`, but serializes one component at a
+    time, so memory does not grow with the size of the circuit.
+    """
+    write_dss_header(circuit, output)
+    for field in CONTAINER_FIELDS:
+        write_dss_container(circuit, field, output)
+    output.write("MakeBusList\n")
+    write_dss_buses(circuit, output)
+    write_dss_post_commands(circuit, output)
+    output.write("\n")
+
+
+def get_dss_file_name(field: str) -> str:
+    """Returns file name of a component class, e.g. `Line.dss`, and `Buscoords.dss`
+    for bus coordinates."""
+    return "Buscoords.dss" if field == "Bus" else f"{field}.dss"
+
+
+def get_class_folder(master_file: Path | str) -> Path:
+    """Returns folder holding the class files of a master file, named after the master
+    file, e.g. `reduced/reduced_ckt` for `reduced/reduced_ckt.dss`."""
+    master_file = Path(master_file)
+    name = master_file.stem if master_file.suffix != ".gz" else Path(master_file.stem).stem
+    return master_file.parent / name
+
+
+def _write_dss_class_file(circuit: Circuit, field: str, output_file: Path) -> None:
+    with open_dss_file(output_file) as fp:
+        if field == "Bus":
+            write_dss_buses(circuit, fp)
+        else:
+            write_dss_container(circuit, field, fp)
+
+
+def write_to_opendss_files(
+    circuit: Circuit, master_file: Path | str, workers: int | None = None
+) -> list[Path]:
+    """
+    Writes each component class to its own file, e.g. Line.dss, Load.dss and
+    Buscoords.dss, and a master file redirecting to them in load order. Class files are
+    written to a folder named after `master_file`, next to it, so files already in the
+    folder of `master_file` are not overwritten.
+
+    Class files are written in parallel threads. Returns the paths of all written files.
+    """
+    master_file = Path(master_file)
+    class_folder = get_class_folder(master_file)
+    class_folder.mkdir(parents=True, exist_ok=True)
+    fields = [field for field in CONTAINER_FIELDS if getattr(circuit, field) is not None]
+    fields += ["Bus"] if circuit.Bus else []
+    class_files = {field: class_folder / get_dss_file_name(field) for field in fields}
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        futures = [
+            executor.submit(_write_dss_class_file, circuit, field, class_file)
+            for field, class_file in class_files.items()
+        ]
+        with open_dss_file(master_file) as fp:
+            write_dss_header(circuit, fp)
+            for field, class_file in class_files.items():
+                if field != "Bus":
+                    fp.write(f'Redirect "{class_folder.name}/{class_file.name}"\n')
+            fp.write("MakeBusList\n")
+            if "Bus" in class_files:
+                fp.write(f'Redirect "{class_folder.name}/{class_files["Bus"].name}"\n')
+            write_dss_post_commands(circuit, fp)
+            fp.write("\n")
+        for future in futures:
+            future.result()
+    return [master_file, *class_files.values()]
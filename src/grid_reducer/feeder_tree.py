@@ -0,0 +1,227 @@
+from typing import Any, Iterable
+
+import numpy as np
+
+from grid_reducer.altdss.altdss_models import Circuit
+from grid_reducer.bus_table import BusTable
+from grid_reducer.network import get_component_buses, validate_transformer_edge_components
+from grid_reducer.profiling import profile_stage
+from grid_reducer.utils import get_circuit_bus_name, get_normally_open_switches, get_open_lines
+
+
+class FeederTree:
+    """
+    Array backed spanning tree of a feeder, rooted at the source bus.
+
+    Buses are integer ids in `Circuit.Bus` order. Each edge groups the lines, reactors
+    or transformers connecting a pair of buses, and its components are
+    `components[edge_offsets[edge]:edge_offsets[edge + 1]]`. The tree is stored as
+    `parent` and `parent_edge` arrays, with -1 for the source and for buses not
+    connected to it, and as `child_offsets` and `children` CSR arrays listing children
+    in DFS order. `order` holds connected buses in DFS preorder, so the subtree of bus
+    `order[i]` is `order[i:subtree_end[i]]`.
+
+    Buses are visited in the same order as `nx.dfs_tree` on the graph built by
+    `get_graph_from_circuit`.
+    """
+
+    def __init__(
+        self,
+        names: list[str],
+        kv: np.ndarray,
+        edge_buses: np.ndarray,
+        edge_types: list[str],
+        components: list[Any],
+        edge_offsets: np.ndarray,
+        source: int,
+    ):
+        self.names = names
+        self.index = {name: idx for idx, name in enumerate(names)}
+        self.kv = kv
+        self.edge_buses = edge_buses
+        self.edge_types = edge_types
+        self.components = components
+        self.edge_offsets = edge_offsets
+        self.source = source
+        self._build_tree()
+
+    @classmethod
+    def from_edges(
+        cls,
+        names: list[str],
+        kv: np.ndarray,
+        edges: Iterable[tuple[str, str, Any, str]],
+        source_name: str,
+    ) -> "FeederTree":
+        """
+        Builds the tree from `(bus1, bus2, component, component_type)` edges, grouping
+        components connecting the same pair of buses.
+        """
+        index = {name: idx for idx, name in enumerate(names)}
+        edge_ids: dict[tuple[int, int], int] = {}
+        edge_buses, edge_types, edge_components = [], [], []
+        for bus1, bus2, component, component_type in edges:
+            ids = (index[bus1], index[bus2])
+            key = (min(ids), max(ids))
+            if key not in edge_ids:
+                edge_ids[key] = len(edge_buses)
+                edge_buses.append(ids)
+                edge_types.append(component_type)
+                edge_components.append([])
+            edge = edge_ids[key]
+            # Latest component first, as in the networkx graph.
+            edge_components[edge].insert(0, component)
+            if component_type == "Transformer":
+                edge_types[edge] = component_type
+                validate_transformer_edge_components(edge_components[edge], [bus1, bus2])
+
+        if source_name not in index:
+            raise ValueError(f"Source node '{source_name}' not found in any connected component.")
+        return cls(
+            names=names,
+            kv=kv,
+            edge_buses=np.array(edge_buses, dtype=np.int64).reshape(-1, 2),
+            edge_types=edge_types,
+            components=[comp for comps in edge_components for comp in comps],
+            edge_offsets=np.cumsum([0] + [len(comps) for comps in edge_components]),
+            source=index[source_name],
+        )
+
+    @classmethod
+    def from_circuit(cls, circuit: Circuit) -> "FeederTree":
+        """
+        Builds the tree from lines, reactors and two winding transformers, leaving out
+        open lines and switches.
+        """
+        with profile_stage("graph_build"):
+            bus_table = BusTable.from_circuit(circuit)
+            no_switches = set(get_normally_open_switches(circuit) + get_open_lines(circuit))
+
+            def _get_edges():
+                for component_type in ["Line", "Reactor"]:
+                    container = getattr(circuit, component_type)
+                    for component in container.root.root if container else []:
+                        if component.root.Name in no_switches:
+                            continue
+                        bus1, bus2 = get_component_buses(component)
+                        if bus2:
+                            yield bus1, bus2, component.root, component_type
+                for transformer in circuit.Transformer.root.root if circuit.Transformer else []:
+                    buses = list(
+                        dict.fromkeys(el.root.split(".")[0] for el in transformer.root.Bus)
+                    )
+                    if len(buses) != 2:
+                        raise Exception("Transformer with more than 2 buses not supported.")
+                    yield *buses, transformer.root, "Transformer"
+
+            return cls.from_edges(
+                bus_table.names, bus_table.kv_ln, _get_edges(), get_circuit_bus_name(circuit)
+            )
+
+    def _build_tree(self) -> None:
+        """Runs an iterative DFS over CSR adjacency arrays."""
+        num_buses, num_edges = len(self.names), len(self.edge_buses)
+        sources = self.edge_buses.ravel()
+        targets = self.edge_buses[:, ::-1].ravel()
+        # Neighbor order of the networkx graph copy the DFS runs on: neighbors with a
+        # lower bus id by id, then the others in edge order.
+        is_later = targets >= sources
+        edge_rank = np.repeat(np.arange(num_edges), 2)
+        adjacency_order = np.lexsort((np.where(is_later, edge_rank, targets), is_later, sources))
+        neighbors = targets[adjacency_order].tolist()
+        neighbor_edges = (adjacency_order // 2).tolist()
+        offsets = np.zeros(num_buses + 1, dtype=np.int64)
+        np.cumsum(np.bincount(sources, minlength=num_buses), out=offsets[1:])
+        offsets = offsets.tolist()
+
+        parent = [-1] * num_buses
+        parent_edge = [-1] * num_buses
+        position = [-1] * num_buses
+        order, subtree_end = [self.source], [0]
+        position[self.source] = 0
+        stack = [(self.source, offsets[self.source])]
+        while stack:
+            bus, next_idx = stack[-1]
+            end_idx = offsets[bus + 1]
+            while next_idx < end_idx and position[neighbors[next_idx]] != -1:
+                next_idx += 1
+            if next_idx == end_idx:
+                stack.pop()
+                subtree_end[position[bus]] = len(order)
+                continue
+            child = neighbors[next_idx]
+            stack[-1] = (bus, next_idx + 1)
+            parent[child], parent_edge[child] = bus, neighbor_edges[next_idx]
+            position[child] = len(order)
+            order.append(child)
+            subtree_end.append(0)
+            stack.append((child, offsets[child]))
+
+        self.parent = np.array(parent, dtype=np.int64)
+        self.parent_edge = np.array(parent_edge, dtype=np.int64)
+        self.position = np.array(position, dtype=np.int64)
+        self.order = np.array(order, dtype=np.int64)
+        self.subtree_end = np.array(subtree_end, dtype=np.int64)
+        # Children grouped by parent, in preorder within each parent.
+        non_root = self.order[1:]
+        self.children = non_root[np.argsort(self.parent[non_root], kind="stable")]
+        self.child_offsets = np.zeros(num_buses + 1, dtype=np.int64)
+        np.cumsum(
+            np.bincount(self.parent[non_root], minlength=num_buses), out=self.child_offsets[1:]
+        )
+        self.is_tree_edge = np.zeros(num_edges, dtype=bool)
+        self.is_tree_edge[self.parent_edge[non_root]] = True
+        unreached = num_buses - len(order)
+        if unreached:
+            print(f"Warning: Removed {unreached} nodes not connected to source.")
+
+    def __len__(self) -> int:
+        return len(self.names)
+
+    @property
+    def reached(self) -> np.ndarray:
+        """Returns mask of buses connected to the source."""
+        return self.position >= 0
+
+    def get_mask(self, bus_names: Iterable[str]) -> np.ndarray:
+        """Returns mask of buses in `bus_names`, names not in the tree are ignored."""
+        mask = np.zeros(len(self), dtype=bool)
+        mask[[self.index[name] for name in bus_names if name in self.index]] = True
+        return mask
+
+    def get_children(self, bus: int) -> np.ndarray:
+        return self.children[self.child_offsets[bus] : self.child_offsets[bus + 1]]
+
+    def get_subtree(self, bus: int) -> np.ndarray:
+        """Returns buses in the subtree of `bus` in preorder, starting with `bus`."""
+        return self.order[self.position[bus] : self.subtree_end[self.position[bus]]]
+
+    def get_edge_components(self, edge: int) -> list[Any]:
+        return self.components[self.edge_offsets[edge] : self.edge_offsets[edge + 1]]
+
+    def get_edge_name(self, edge: int) -> str:
+        return ",".join(component.Name for component in self.get_edge_components(edge))
+
+    def get_non_tree_edge_names(self) -> list[str]:
+        """Returns names of edges connected to the source that close a loop."""
+        loop_edges = self.reached[self.edge_buses[:, 0]] & ~self.is_tree_edge
+        return [self.get_edge_name(edge) for edge in np.flatnonzero(loop_edges)]
+
+    def get_nearest_ancestors(self, mask: np.ndarray) -> np.ndarray:
+        """
+        Returns for each connected bus outside `mask` its nearest ancestor in `mask`,
+        -1 for buses without one and for buses in `mask`.
+
+        Subtrees hanging off buses in `mask` are assigned as whole preorder ranges, with
+        deeper ranges assigned later.
+        """
+        ancestors_by_position = np.full(len(self.order), -1, dtype=np.int64)
+        for bus in self.order[mask[self.order]].tolist():
+            for child in self.get_children(bus).tolist():
+                if not mask[child]:
+                    start = self.position[child]
+                    ancestors_by_position[start : self.subtree_end[start]] = bus
+        ancestors = np.full(len(self), -1, dtype=np.int64)
+        ancestors[self.order] = ancestors_by_position
+        ancestors[mask] = -1
+        return ancestors
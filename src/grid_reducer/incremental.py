@@ -0,0 +1,271 @@
+from typing import Any
+
+from grid_reducer.altdss import altdss_models
+from grid_reducer.altdss.altdss_models import Circuit, Line
+from grid_reducer.aggregate_secondary import (
+    SECONDARY_ASSET_TYPES,
+    SecondaryAggregationRecord,
+    _aggregate_leaf_assets,
+    aggregate_secondary_assets,
+    get_secondary_summary,
+    get_validated_container,
+)
+from grid_reducer.aggregate_primary import (
+    PrimaryAggregationRecord,
+    _get_buses_to_keep,
+    aggregate_primary_conductors,
+    get_primary_summary,
+    get_similar_line_runs,
+)
+from grid_reducer.aggregators.line import aggregate_lines
+from grid_reducer.lazy_circuit import get_unvalidated_container
+from grid_reducer.similarity.line import LineSimilarity
+from grid_reducer.summary import PrimaryAssetSummary, SecondaryAssetSummary
+from grid_reducer.utils import extract_bus_name, get_bus_connected_assets_mapper
+
+POINT_ASSET_FIELDS = ["Load", "PVSystem", "Capacitor", "Storage", "Generator"]
+EDITABLE_FIELDS = [*POINT_ASSET_FIELDS, "Line"]
+CONNECTION_FIELDS = ["Bus1", "Bus2"]
+LINE_CONNECTION_FIELDS = [*CONNECTION_FIELDS, "Switch", "Enabled"]
+
+
+def _get_items(container: Any) -> list | None:
+    items = getattr(getattr(container, "root", None), "root", None)
+    return items if isinstance(items, list) else None
+
+
+def _get_commands(commands: list[str] | None) -> list[str]:
+    """Returns commands without comments, such as the time stamp OpenDSS adds on save."""
+    return [command for command in commands or [] if not command.startswith("!")]
+
+
+def _get_container(container: Any, items: list) -> Any:
+    """Returns a container of the same type holding `items`, without revalidation."""
+    new_root = type(container.root).model_construct(root=items)
+    return type(container).model_construct(root=new_root)
+
+
+def get_changed_components(
+    previous: Circuit, circuit: Circuit
+) -> dict[str, dict[str, Any]] | None:
+    """
+    Returns components of `circuit` that differ from `previous`, by field and name.
+
+    Returns None if the edit can not be applied incrementally: components were added,
+    removed or reordered, a line or point asset was reconnected, opened or closed, or
+    any other field of the circuit changed.
+    """
+    changes = {}
+    for field in Circuit.model_fields:
+        lazy_container = get_unvalidated_container(previous, field)
+        if lazy_container is not None and lazy_container is get_unvalidated_container(
+            circuit, field
+        ):
+            continue
+        old, new = getattr(previous, field), getattr(circuit, field)
+        if old is new:
+            continue
+        if field == "PreCommands":
+            old, new = _get_commands(old), _get_commands(new)
+        old_items, new_items = _get_items(old), _get_items(new)
+        if field not in EDITABLE_FIELDS or old_items is None or new_items is None:
+            if old != new:
+                return None
+            continue
+        if len(old_items) != len(new_items):
+            return None
+        connection_fields = LINE_CONNECTION_FIELDS if field == "Line" else CONNECTION_FIELDS
+        changed = {}
+        for old_item, new_item in zip(old_items, new_items, strict=True):
+            if old_item is new_item or old_item == new_item:
+                continue
+            old_item, new_item = old_item.root, new_item.root
+            if old_item.Name != new_item.Name or any(
+                getattr(old_item, name, None) != getattr(new_item, name, None)
+                for name in connection_fields
+            ):
+                return None
+            changed[new_item.Name] = new_item
+        if changed:
+            changes[field] = changed
+    return changes
+
+
+def reaggregate_secondary_assets(
+    circuit: Circuit,
+    previous_output: Circuit,
+    record: SecondaryAggregationRecord,
+    changes: dict[str, dict[str, Any]],
+) -> Circuit:
+    """
+    Updates the output of a previous secondary aggregation with edited components.
+
+    Edited components kept in the output are replaced and assets of every kept node
+    owning an edited asset are aggregated again. Aggregated assets keep their previous
+    names where their number does not change. `record` is updated in place.
+    """
+    owner_mapper = {node: owner for owner, nodes in record.pruned_nodes.items() for node in nodes}
+    update = {}
+    for field, changed in changes.items():
+        container = getattr(previous_output, field)
+        if container is None:
+            continue
+        asset_type = getattr(altdss_models, field)
+        items = container.root.root
+        previous_items = {item.root.Name: item for item in items}
+        node_names = record.aggregated_names.get(field, {})
+        previous_aggregated = {name for names in node_names.values() for name in names}
+        owners = {
+            owner_mapper[bus]
+            for asset in changed.values()
+            if field in POINT_ASSET_FIELDS
+            and (bus := extract_bus_name(asset.Bus1)) in owner_mapper
+        }
+        new_assets = [asset for name, asset in changed.items() if name in previous_items]
+        if owners:
+            bus_asset_mapper = get_bus_connected_assets_mapper(circuit, [asset_type])[asset_type]
+        for owner in owners:
+            agg_assets = _aggregate_leaf_assets(
+                record.leaf_buses[owner],
+                record.kv[owner],
+                record.pruned_nodes[owner],
+                bus_asset_mapper,
+            )
+            previous_names = node_names.get(owner, [])
+            if len(previous_names) == len(agg_assets):
+                agg_assets = [
+                    asset.model_copy(update={"Name": name})
+                    for asset, name in zip(agg_assets, previous_names, strict=True)
+                ]
+            node_names[owner] = [asset.Name for asset in agg_assets]
+            new_assets.extend(agg_assets)
+        if not new_assets:
+            continue
+        validated_items = {
+            item.root.Name: item
+            for item in get_validated_container(previous_output, new_assets, asset_type).root.root
+        }
+        new_items = [
+            validated_items.get(item.root.Name, item)
+            for item in items
+            if item.root.Name not in previous_aggregated
+        ]
+        new_items += [
+            validated_items.get(name) or previous_items[name]
+            for names in node_names.values()
+            for name in names
+        ]
+        update[field] = _get_container(container, new_items)
+    return previous_output.model_copy(update=update)
+
+
+def reaggregate_primary_conductors(
+    circuit: Circuit,
+    previous_output: Circuit,
+    record: PrimaryAggregationRecord,
+    changes: dict[str, dict[str, Any]],
+) -> Circuit:
+    """
+    Updates the output of a previous primary aggregation with edited components.
+
+    Point assets are passed through and only segments holding edited lines are
+    aggregated again. Merged runs keep the name of their aggregated line if they merge
+    the same lines as before. `record` is updated in place.
+    """
+    update = {field: getattr(circuit, field) for field in changes if field != "Line"}
+    changed_lines = changes.get("Line", {})
+    if not changed_lines:
+        return previous_output.model_copy(update=update)
+
+    input_lines = {line.root.Name: line.root for line in circuit.Line.root.root}
+    segment_index = {name: idx for idx, names in enumerate(record.segments) for name in names}
+    similarity_checker = LineSimilarity()
+    lines_aggregated = []
+    for idx in sorted({segment_index[name] for name in changed_lines if name in segment_index}):
+        lines = [input_lines[name] for name in record.segments[idx]]
+        previous_runs = {tuple(names): agg_name for names, agg_name in record.runs[idx]}
+        segment_runs = []
+        for similar_edges in get_similar_line_runs(lines, similarity_checker):
+            names = [line.Name for line in similar_edges]
+            agg_name = previous_runs.get(tuple(names))
+            if agg_name is None or not changed_lines.keys().isdisjoint(names):
+                aggregated_line = aggregate_lines(similar_edges)
+                if agg_name is not None:
+                    aggregated_line = aggregated_line.model_copy(update={"Name": agg_name})
+                lines_aggregated.append(aggregated_line)
+                agg_name = aggregated_line.Name
+            segment_runs.append((names, agg_name))
+        record.runs[idx] = segment_runs
+
+    validated_items = (
+        {
+            item.root.Name: item
+            for item in get_validated_container(circuit, lines_aggregated, Line).root.root
+        }
+        if lines_aggregated
+        else {}
+    )
+    previous_items = {item.root.Name: item for item in previous_output.Line.root.root}
+    line_names_to_remove = {
+        name for segment_runs in record.runs for names, _ in segment_runs for name in names
+    }
+    new_items = [
+        line for line in circuit.Line.root.root if line.root.Name not in line_names_to_remove
+    ]
+    new_items += [
+        validated_items.get(agg_name) or previous_items[agg_name]
+        for segment_runs in record.runs
+        for _, agg_name in segment_runs
+    ]
+    update["Line"] = _get_container(previous_output.Line, new_items)
+    new_circuit = previous_output.model_copy(update=update)
+    buses_to_keep = _get_buses_to_keep(new_circuit)
+    new_circuit.Bus = [bus for bus in circuit.Bus if bus.Name in buses_to_keep]
+    return new_circuit
+
+
+class IncrementalAggregator:
+    """
+    Secondary and primary aggregation that remembers the boundaries of its previous run.
+
+    The first run of each stage aggregates the whole circuit. Later runs diff the input
+    against the previous input and, if only attributes of point assets and lines were
+    edited, re-aggregate only the kept nodes owning edited secondary assets and the
+    primary segments holding edited lines. Any other edit falls back to a full run.
+    """
+
+    def __init__(self, threshold_kv_ln: float = 1.0):
+        self.threshold_kv_ln = threshold_kv_ln
+        self._secondary: tuple[Circuit, Circuit, SecondaryAggregationRecord] | None = None
+        self._primary: tuple[Circuit, Circuit, PrimaryAggregationRecord] | None = None
+
+    def aggregate_secondary(self, circuit: Circuit) -> tuple[Circuit, SecondaryAssetSummary]:
+        changes = get_changed_components(self._secondary[0], circuit) if self._secondary else None
+        if changes is None:
+            record = SecondaryAggregationRecord()
+            output, summary = aggregate_secondary_assets(circuit, self.threshold_kv_ln, record)
+        else:
+            _, previous_output, record = self._secondary
+            output = reaggregate_secondary_assets(circuit, previous_output, record, changes)
+            summary = get_secondary_summary(record.aggregated_names, SECONDARY_ASSET_TYPES)
+        self._secondary = (circuit, output, record)
+        return output, summary
+
+    def aggregate_primary(self, circuit: Circuit) -> tuple[Circuit, PrimaryAssetSummary]:
+        changes = get_changed_components(self._primary[0], circuit) if self._primary else None
+        if changes is None:
+            record = PrimaryAggregationRecord()
+            output, summary = aggregate_primary_conductors(circuit, record)
+        else:
+            _, previous_output, record = self._primary
+            output = reaggregate_primary_conductors(circuit, previous_output, record, changes)
+            input_lines = {line.root.Name: line.root for line in circuit.Line.root.root}
+            summary = get_primary_summary(
+                [
+                    [input_lines[name] for name in names]
+                    for segment_runs in record.runs
+                    for names, _ in segment_runs
+                ]
+            )
+        self._primary = (circuit, output, record)
+        return output, summary
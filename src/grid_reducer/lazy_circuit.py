@@ -0,0 +1,125 @@
+from functools import cache
+from typing import Any, get_args
+
+from pydantic import RootModel
+
+from grid_reducer.altdss import altdss_models
+from grid_reducer.altdss.altdss_models import Circuit
+
+
+def _get_container_type(field: str) -> type[RootModel] | None:
+    """Returns container class of a circuit field, None for fields that are not containers."""
+    annotation = Circuit.model_fields[field].annotation
+    for arg in get_args(annotation) or (annotation,):
+        if isinstance(arg, type) and arg.__name__.endswith("Container"):
+            return arg
+    return None
+
+
+CONTAINER_TYPES = {
+    field: container_type
+    for field in Circuit.model_fields
+    if (container_type := _get_container_type(field)) is not None
+}
+
+
+@cache
+def get_item_fields(field: str) -> frozenset[str]:
+    """Returns field names of all item classes a circuit container can hold."""
+    item_cls = getattr(altdss_models, field, None)
+    if field not in CONTAINER_TYPES or item_cls is None:
+        return frozenset()
+    if issubclass(item_cls, RootModel):
+        root_annotation = item_cls.model_fields["root"].annotation
+        item_classes = get_args(root_annotation) or (root_annotation,)
+    else:
+        item_classes = (item_cls,)
+    return frozenset(name for cls in item_classes for name in cls.model_fields)
+
+
+class LazyContainer:
+    """Container data as loaded from OpenDSS, validated on first read."""
+
+    __slots__ = ("container_type", "data", "_container")
+
+    def __init__(self, container_type: type[RootModel], data: Any):
+        self.container_type = container_type
+        self.data = data
+        self._container = None
+
+    @property
+    def is_validated(self) -> bool:
+        return self._container is not None
+
+    def get(self) -> RootModel:
+        if self._container is None:
+            self._container = self.container_type.model_validate(self.data)
+            self.data = None
+        return self._container
+
+    def __len__(self) -> int:
+        if self._container is not None:
+            items = getattr(self._container.root, "root", None)
+            return len(items) if isinstance(items, list) else 0
+        return len(self.data) if isinstance(self.data, list) else 0
+
+
+class LazyCircuit(Circuit):
+    """
+    Circuit validating each container on first attribute access.
+
+    Copies made with `model_copy` share the lazy containers, so a container is
+    validated at most once. Dumping the circuit validates all containers.
+    """
+
+    def __getattribute__(self, name: str) -> Any:
+        value = super().__getattribute__(name)
+        if type(value) is LazyContainer:
+            value = value.get()
+            self.__dict__[name] = value
+        return value
+
+    def validate_containers(self) -> None:
+        for field, value in self.__dict__.items():
+            if type(value) is LazyContainer:
+                self.__dict__[field] = value.get()
+
+    def model_dump(self, **kwargs) -> dict[str, Any]:
+        self.validate_containers()
+        return super().model_dump(**kwargs)
+
+    def model_dump_json(self, **kwargs) -> str:
+        self.validate_containers()
+        return super().model_dump_json(**kwargs)
+
+    def __eq__(self, other: Any) -> bool:
+        self.validate_containers()
+        if isinstance(other, LazyCircuit):
+            other.validate_containers()
+        return super().__eq__(other)
+
+
+def get_lazy_circuit(circuit_dict: dict) -> LazyCircuit:
+    """
+    Validates the circuit fields that are not containers and the required Vsource
+    container, other containers are kept as loaded.
+    """
+    containers = {
+        field: LazyContainer(container_type, circuit_dict[field])
+        for field, container_type in CONTAINER_TYPES.items()
+        if circuit_dict.get(field) is not None and not Circuit.model_fields[field].is_required()
+    }
+    circuit = LazyCircuit.model_validate(
+        {field: value for field, value in circuit_dict.items() if field not in containers}
+    )
+    circuit.__dict__.update(containers)
+    circuit.__pydantic_fields_set__.update(containers)
+    return circuit
+
+
+def get_unvalidated_container(circuit: Circuit, field: str) -> LazyContainer | None:
+    """Returns the lazy container of a field if it has not been validated yet."""
+    value = circuit.__dict__.get(field)
+    if type(value) is LazyContainer and not value.is_validated:
+        return value
+    return None
@@ -3,6 +3,7 @@ from typing import Any
 import networkx as nx
 
 from grid_reducer.altdss.altdss_models import Circuit
+from grid_reducer.profiling import profile_stage
 from grid_reducer.utils import (
     get_circuit_bus_name,
     extract_bus_name,
@@ -40,10 +41,7 @@ def dfs_tree_with_attrs(graph: nx.Graph, source):
 
 def create_bus_voltage_mapper(circuit_obj: Circuit) -> dict[str, float]:
     """Create a mapping of bus names to their voltages."""
-    bus_voltage_mapper = {}
-    for bus in circuit_obj.Bus:
-        bus_voltage_mapper[bus.Name] = bus.kVLN
-    return bus_voltage_mapper
+    return {bus.Name: bus.kVLN for bus in circuit_obj.Bus}
 
 
 def add_bus_nodes(graph: nx.Graph, circuit_obj):
@@ -170,14 +168,15 @@ def add_transformer_components(
 
 
 def get_graph_from_circuit(circuit_obj: Circuit, directed: bool = False) -> nx.Graph:
-    bus_voltage_mapper = create_bus_voltage_mapper(circuit_obj)
-    no_switches = get_normally_open_switches(circuit_obj) + get_open_lines(circuit_obj)
-    graph = nx.Graph()
-    add_bus_nodes(graph, circuit_obj)
-    add_line_and_reactor_components(graph, circuit_obj, no_switches, bus_voltage_mapper)
-    add_transformer_components(graph, circuit_obj, bus_voltage_mapper)
-    return (
-        graph
-        if not directed
-        else dfs_tree_with_attrs(graph, source=get_circuit_bus_name(circuit_obj))
-    )
+    with profile_stage("graph_build"):
+        bus_voltage_mapper = create_bus_voltage_mapper(circuit_obj)
+        no_switches = get_normally_open_switches(circuit_obj) + get_open_lines(circuit_obj)
+        graph = nx.Graph()
+        add_bus_nodes(graph, circuit_obj)
+        add_line_and_reactor_components(graph, circuit_obj, no_switches, bus_voltage_mapper)
+        add_transformer_components(graph, circuit_obj, bus_voltage_mapper)
+        return (
+            graph
+            if not directed
+            else dfs_tree_with_attrs(graph, source=get_circuit_bus_name(circuit_obj))
+        )
@@ -3,17 +3,56 @@ import json
 
 import opendssdirect as odd
 
+from grid_reducer.altdss.altdss_models import Circuit
+from grid_reducer.dss_writer import dump_circuit_dss
 from grid_reducer.utils import read_json_file
 
+COMMAND_BATCH_SIZE = 1024 * 1024
+
+
+class DSSCommandWriter:
+    """Text stream that sends written DSS script to OpenDSS in batches of whole lines."""
+
+    def __init__(self, batch_size: int = COMMAND_BATCH_SIZE):
+        self.batch_size = batch_size
+        self._chunks: list[str] = []
+        self._size = 0
+
+    def write(self, text: str) -> int:
+        self._chunks.append(text)
+        self._size += len(text)
+        if self._size >= self.batch_size:
+            self._send_complete_lines()
+        return len(text)
+
+    def _send_complete_lines(self) -> None:
+        script = "".join(self._chunks)
+        commands, _, remainder = script.rpartition("\n")
+        if commands:
+            odd.Text.Commands(commands)
+        self._chunks, self._size = [remainder], len(remainder)
+
+    def flush(self) -> None:
+        script = "".join(self._chunks)
+        if script.strip():
+            odd.Text.Commands(script)
+        self._chunks, self._size = [], 0
+
 
 class OpenDSS:
-    def __init__(self, dist_model: Path | dict):
-        if dist_model.suffix == ".dss":
-            odd.Command(f'Redirect "{str(dist_model)}"')
+    def __init__(self, dist_model: Path | dict | Circuit):
+        if isinstance(dist_model, Circuit):
+            # Streams the circuit as DSS commands, no file is written.
+            output = DSSCommandWriter()
+            dump_circuit_dss(dist_model, output)
+            output.flush()
 
         elif isinstance(dist_model, dict):
             odd.Circuit.FromJSON(json.dumps(dist_model))
 
+        elif dist_model.suffix == ".dss":
+            odd.Command(f'Redirect "{str(dist_model)}"')
+
         elif dist_model.suffix == ".json":
             odd.Circuit.FromJSON(json.dumps(read_json_file(dist_model)))
 
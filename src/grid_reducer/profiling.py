@@ -0,0 +1,150 @@
+from contextlib import contextmanager
+from contextvars import ContextVar
+from collections import defaultdict
+from pathlib import Path
+import json
+import os
+import sys
+import time
+
+from pydantic import BaseModel, Field, PrivateAttr
+
+from grid_reducer.altdss.altdss_models import Circuit
+from grid_reducer.lazy_circuit import get_unvalidated_container
+
+try:
+    import resource
+except ImportError:  # resource module is not available on windows
+    resource = None
+
+TRACE_FORMATS = ["json", "chrome"]
+
+
+def get_peak_rss() -> int | None:
+    """Returns peak resident set size of the process in bytes, the high-water mark since
+    the process started."""
+    if resource is None:
+        return None
+    max_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return max_rss if sys.platform == "darwin" else max_rss * 1024
+
+
+def get_element_count(circuit: Circuit) -> int:
+    """Returns total number of buses and components in the circuit, without validating
+    lazy containers."""
+    count = len(circuit.Bus or [])
+    for field in Circuit.model_fields:
+        lazy_container = get_unvalidated_container(circuit, field)
+        if lazy_container is not None:
+            count += len(lazy_container)
+            continue
+        container = getattr(circuit, field)
+        if hasattr(container, "root") and hasattr(container.root, "root"):
+            count += len(container.root.root)
+    return count
+
+
+class StageRecord(BaseModel):
+    """Timing of a pipeline stage. `process_peak_rss` is the peak rss of the process at
+    the end of the stage, a cumulative high-water mark rather than the memory used by
+    the stage itself."""
+
+    name: str
+    depth: int
+    start_time: float
+    wall_time: float = 0.0
+    cpu_time: float = 0.0
+    process_peak_rss: int | None = None
+    elements_in: int | None = None
+    elements_out: int | None = None
+
+    def set_output(self, circuit: Circuit) -> None:
+        self.elements_out = get_element_count(circuit)
+
+
+_active_stage: ContextVar[tuple["PipelineProfile", int] | None] = ContextVar(
+    "active_stage", default=None
+)
+
+
+class PipelineProfile(BaseModel):
+    """Wall time, cpu time, process peak rss and element counts for each pipeline stage."""
+
+    stages: list[StageRecord] = Field(default_factory=list)
+    _created_at: float = PrivateAttr(default_factory=time.perf_counter)
+
+    @contextmanager
+    def stage(self, name: str, circuit: Circuit | None = None):
+        """Records a stage, stages started inside it are recorded as nested stages."""
+        parent_stage = _active_stage.get()
+        depth = parent_stage[1] + 1 if parent_stage and parent_stage[0] is self else 0
+        record = StageRecord(
+            name=name,
+            depth=depth,
+            start_time=time.perf_counter() - self._created_at,
+            elements_in=get_element_count(circuit) if circuit is not None else None,
+        )
+        self.stages.append(record)
+        token = _active_stage.set((self, depth))
+        start_cpu_time = time.process_time()
+        try:
+            yield record
+        finally:
+            _active_stage.reset(token)
+            record.cpu_time = time.process_time() - start_cpu_time
+            record.wall_time = time.perf_counter() - self._created_at - record.start_time
+            record.process_peak_rss = get_peak_rss()
+
+    def get_summary(self) -> dict[str, dict[str, str]]:
+        totals = defaultdict(lambda: {"calls": 0, "wall_time": 0.0, "cpu_time": 0.0})
+        for stage in self.stages:
+            totals[stage.name]["calls"] += 1
+            totals[stage.name]["wall_time"] += stage.wall_time
+            totals[stage.name]["cpu_time"] += stage.cpu_time
+        summary = {"⏱️ Stage Profile": {}}
+        for name, total in totals.items():
+            summary["⏱️ Stage Profile"][name] = (
+                f"{total['wall_time']:.3f}s wall, {total['cpu_time']:.3f}s cpu, "
+                f"{total['calls']} call(s)."
+            )
+        return summary
+
+    def to_chrome_trace(self) -> dict:
+        """Returns profile in chrome trace event format (chrome://tracing, perfetto)."""
+        events = []
+        for stage in self.stages:
+            events.append(
+                {
+                    "name": stage.name,
+                    "ph": "X",
+                    "ts": stage.start_time * 1e6,
+                    "dur": stage.wall_time * 1e6,
+                    "pid": os.getpid(),
+                    "tid": 0,
+                    "args": stage.model_dump(exclude={"name", "start_time", "wall_time"}),
+                }
+            )
+        return {"traceEvents": events, "displayTimeUnit": "ms"}
+
+    def export(self, file_path: Path | str, trace_format: str = "json") -> None:
+        """Exports profile as `json` or `chrome` trace."""
+        if trace_format not in TRACE_FORMATS:
+            raise ValueError(
+                f"Unsupported {trace_format=}, supported formats are {TRACE_FORMATS}."
+            )
+        with open(file_path, "w", encoding="utf-8") as fp:
+            if trace_format == "chrome":
+                json.dump(self.to_chrome_trace(), fp, indent=2)
+            else:
+                fp.write(self.model_dump_json(indent=2))
+
+
+@contextmanager
+def profile_stage(name: str, circuit: Circuit | None = None):
+    """Records a nested stage if called while a pipeline stage is being profiled."""
+    active_stage = _active_stage.get()
+    if active_stage is None:
+        yield None
+        return
+    with active_stage[0].stage(name, circuit) as record:
+        yield record
@@ -6,9 +6,25 @@ from grid_reducer.altdss.altdss_models import Circuit
 from grid_reducer.aggregate_secondary import aggregate_secondary_assets
 from grid_reducer.aggregate_primary import aggregate_primary_conductors
 from grid_reducer.utils import write_to_opendss_file
-from grid_reducer.transform_coordinate import transform_bus_coordinates, get_switch_connected_buses
-from grid_reducer.add_differential_privacy import get_dp_circuit, BasePrivacyConfig
-from grid_reducer.rename_components import rename_assets
+from grid_reducer.dss_writer import write_to_opendss_files
+from grid_reducer.transform_coordinate import get_switch_connected_buses
+from grid_reducer.add_differential_privacy import BasePrivacyConfig
+from grid_reducer.cache import CircuitCache
+from grid_reducer.incremental import IncrementalAggregator
+from grid_reducer.profiling import PipelineProfile
+from grid_reducer.scenarios import (
+    ReductionScenario,
+    ScenarioResult,
+    apply_layout,
+    apply_privacy_and_rename,
+    run_scenarios,
+)
+from grid_reducer.validation import (
+    PowerFlowResult,
+    PowerFlowValidationReport,
+    compare_powerflow_results,
+    solve_powerflow,
+)
 
 
 def get_edge_count(ckt: Circuit) -> int:
@@ -22,45 +38,145 @@ def get_edge_count(ckt: Circuit) -> int:
 
 
 class OpenDSSModelReducer:
-    def __init__(self, master_dss_file: Path | str):
+    def __init__(
+        self,
+        master_dss_file: Path | str,
+        cache: CircuitCache | None = None,
+        solve: bool = False,
+        lazy: bool = False,
+    ):
         self.master_dss_file = master_dss_file
-        self.ckt = get_ckt_from_opendss_model(Path(master_dss_file))
+        self.profile = PipelineProfile()
+        self.validation_report: PowerFlowValidationReport | None = None
+        self._original_powerflow: PowerFlowResult | None = None
+        self._cache = cache
+        self._solve = solve
+        self._lazy = lazy
+        self._aggregator = IncrementalAggregator()
+        self.reload()
 
-    def reduce(
+    def reload(self) -> None:
+        """Reads the master file again, e.g. after its components were edited."""
+        with self.profile.stage("load") as stage:
+            circuit = (
+                self._cache.get_circuit(self.master_dss_file, solve=self._solve, lazy=self._lazy)
+                if self._cache
+                else get_ckt_from_opendss_model(
+                    Path(self.master_dss_file), solve=self._solve, lazy=self._lazy
+                )
+            )
+            stage.set_output(circuit)
+        self.update_circuit(circuit)
+
+    def update_circuit(self, circuit: Circuit) -> None:
+        """Replaces the circuit to reduce, e.g. with a copy having edited components."""
+        self.ckt = circuit
+        self._original_powerflow = None
+
+    def aggregate(
         self,
         reduce_secondary: bool = True,
         aggregate_primary: bool = True,
-        transform_coordinate: bool = True,
-        noise_config: Type[BasePrivacyConfig] | None = None,
+        incremental: bool = False,
     ) -> Circuit:
+        """
+        Runs secondary and primary aggregation, the expensive stages of `reduce`. If
+        `incremental` is true, both only redo the parts of the circuit edited since the
+        previous incremental run.
+        """
         if reduce_secondary:
-            reduced_ckt, summary = aggregate_secondary_assets(self.ckt)
+            with self.profile.stage("secondary_aggregation", self.ckt) as stage:
+                reduced_ckt, summary = (
+                    self._aggregator.aggregate_secondary(self.ckt)
+                    if incremental
+                    else aggregate_secondary_assets(self.ckt)
+                )
+                stage.set_output(reduced_ckt)
             print_summary_to_cli(summary.get_summary())
         else:
             reduced_ckt = self.ckt
 
         if aggregate_primary:
-            final_ckt, summary = aggregate_primary_conductors(reduced_ckt)
+            with self.profile.stage("primary_aggregation", reduced_ckt) as stage:
+                final_ckt, summary = (
+                    self._aggregator.aggregate_primary(reduced_ckt)
+                    if incremental
+                    else aggregate_primary_conductors(reduced_ckt)
+                )
+                stage.set_output(final_ckt)
             print_summary_to_cli(summary.get_summary())
         else:
             final_ckt = reduced_ckt
+        return final_ckt
 
-        has_switches = get_switch_connected_buses(final_ckt)
-        transformed_ckt = (
-            transform_bus_coordinates(final_ckt) if transform_coordinate else final_ckt
-        )
-        private_ckt = (
-            get_dp_circuit(transformed_ckt, noise_config())
-            if noise_config and has_switches
-            else transformed_ckt
+    def reduce(
+        self,
+        reduce_secondary: bool = True,
+        aggregate_primary: bool = True,
+        transform_coordinate: bool = True,
+        noise_config: Type[BasePrivacyConfig] | None = None,
+        layout: str = "kamada_kawai",
+        noise_seed: int | None = None,
+        validate: bool = False,
+        incremental: bool = False,
+    ) -> Circuit:
+        """
+        Reduces the circuit. If `incremental` is true, secondary and primary aggregation
+        only redo the parts of the circuit edited since the previous incremental run.
+        """
+        final_ckt = self.aggregate(reduce_secondary, aggregate_primary, incremental)
+
+        if validate:
+            with self.profile.stage("validation", final_ckt):
+                self.validation_report = self.validate(final_ckt)
+            print_summary_to_cli(self.validation_report.get_summary())
+
+        has_switches = bool(get_switch_connected_buses(final_ckt))
+        transformed_ckt = apply_layout(final_ckt, transform_coordinate, layout, self.profile)
+        renamed_ckt = apply_privacy_and_rename(
+            transformed_ckt, has_switches, noise_config, noise_seed, self.profile
         )
-        renamed_ckt = rename_assets(private_ckt)
         print(f"Total Node Reductions: {len(self.ckt.Bus)}  → {len(final_ckt.Bus)}")
         print(f"Total Edge Reductions: {get_edge_count(self.ckt)}  → {get_edge_count(final_ckt)}")
         return renamed_ckt
 
-    def export(self, ckt: Circuit, file_path: Path | str):
-        write_to_opendss_file(ckt, file_path)
+    def reduce_scenarios(
+        self,
+        scenarios: list[ReductionScenario],
+        reduce_secondary: bool = True,
+        aggregate_primary: bool = True,
+        workers: int | None = None,
+    ) -> list[ScenarioResult]:
+        """
+        Aggregates the circuit once and writes one reduced circuit per scenario, running
+        layout, differential privacy, rename and export of the scenarios in parallel.
+        """
+        final_ckt = self.aggregate(reduce_secondary, aggregate_primary)
+        with self.profile.stage("scenarios", final_ckt):
+            return run_scenarios(final_ckt, scenarios, workers)
+
+    def validate(self, reduced_ckt: Circuit) -> PowerFlowValidationReport:
+        """Compares power flow of the original and a reduced circuit, before renaming."""
+        if self._original_powerflow is None:
+            self._original_powerflow = solve_powerflow(self.ckt)
+        return compare_powerflow_results(self._original_powerflow, solve_powerflow(reduced_ckt))
+
+    def reduce_with_profile(self, **reduce_kwargs) -> tuple[Circuit, PipelineProfile]:
+        """Same as `reduce` but also returns the per stage profile of this reducer."""
+        return self.reduce(**reduce_kwargs), self.profile
+
+    def export(self, ckt: Circuit, file_path: Path | str, split_files: bool = False):
+        """Exports circuit to `file_path`, or to per class files redirected from
+        `file_path` if `split_files` is true."""
+        with self.profile.stage("export", ckt):
+            if split_files:
+                write_to_opendss_files(ckt, file_path)
+            else:
+                write_to_opendss_file(ckt, file_path)
 
-    def export_original_ckt(self, file_path: Path | str):
-        write_to_opendss_file(self.ckt, file_path)
+    def export_original_ckt(self, file_path: Path | str, split_files: bool = False):
+        with self.profile.stage("export_original", self.ckt):
+            if split_files:
+                write_to_opendss_files(self.ckt, file_path)
+            else:
+                write_to_opendss_file(self.ckt, file_path)
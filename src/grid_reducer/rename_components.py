@@ -12,14 +12,54 @@ from grid_reducer.altdss.altdss_models import (
     Transformer_XfmrCode,
     LineGeometry_LineSpacing,
 )
-
-
-def get_unique_name(prefix: str, buses: list[str], existing: dict) -> str:
-    base_name = f"{prefix}_{'_'.join(buses)}"
-    if base_name not in existing.values():
-        return base_name
-    index = sum(base_name in name for name in existing.values())
-    return f"{base_name}_{index}"
+from grid_reducer.lazy_circuit import LazyContainer, get_item_fields, get_unvalidated_container
+
+REFERENCE_FIELDS = {"Bus1", "SwitchedObj", "Transformer", "Element", "MonitoredObj"}
+INDEPENDENT_COMPONENT_FIELDS = {
+    "LineCode",
+    "LoadShape",
+    "TShape",
+    "PriceShape",
+    "XYcurve",
+    "GrowthShape",
+    "TCC_Curve",
+    "WireData",
+    "CNData",
+    "TSData",
+    "LineGeometry",
+    "LineSpacing",
+    "XfmrCode",
+}
+UNSUPPORTED_ASSET_FIELDS = {
+    "Sensor",
+    "GICLine",
+    "GICTransformer",
+    "GICsource",
+    "IndMach012",
+    "ESPVLControl",
+    "ExpControl",
+    "UPFC",
+    "UPFCControl",
+    "AutoTrans",
+    "Spectrum",
+}
+
+
+class UniqueNameAllocator:
+    """Issues unique names using a set of issued names and a counter per base name."""
+
+    def __init__(self):
+        self.issued_names: set[str] = set()
+        self.counters: dict[str, int] = defaultdict(int)
+
+    def get_unique_name(self, prefix: str, buses: list[str]) -> str:
+        base_name = f"{prefix}_{'_'.join(buses)}"
+        name = base_name
+        while name in self.issued_names:
+            self.counters[base_name] += 1
+            name = f"{base_name}_{self.counters[base_name]}"
+        self.issued_names.add(name)
+        return name
 
 
 def format_bus(bus: BusConnection, bus_mapping: dict) -> BusConnection:
@@ -46,12 +86,13 @@ def rename_point_assets(
         else:
             mapped = value
         setattr(item, attr, mapped)
-        new_name = get_unique_name(field.lower(), [mapped.split(".")[-1]], asset_mapping[field])
+        new_name = allocator.get_unique_name(field.lower(), [mapped.split(".")[-1]])
         asset_mapping[field][item.Name] = new_name
         item.Name = new_name
         updated_items.append(item)
 
     updated_items = []
+    allocator = UniqueNameAllocator()
 
     for item in field_data.root.root:
         if hasattr(item, "root") and hasattr(item.root, "Bus1"):
@@ -63,7 +104,7 @@ def rename_point_assets(
                 item.root.Bus2 = format_bus(item.root.Bus2, bus_mapping)
                 bus_names.append(item.root.Bus2.root.split(".")[0])
             if item.root.Name != "source":
-                new_name = get_unique_name(field.lower(), bus_names, asset_mapping[field])
+                new_name = allocator.get_unique_name(field.lower(), bus_names)
                 asset_mapping[field][item.root.Name] = new_name
                 item.root.Name = new_name
                 updated_items.append(item)
@@ -85,10 +126,11 @@ def rename_point_assets(
 
 def get_updated_container(field: str, container: Any, mapping: dict) -> Any:
     new_items = []
+    allocator = UniqueNameAllocator()
     if not hasattr(container, "root") and not hasattr(container.root, "root"):
         raise ValueError(f"Container {container} is not a valid Container.")
     for idx, item in enumerate(container.root.root):
-        new_name = get_unique_name(field.lower(), [str(idx)], mapping[field])
+        new_name = allocator.get_unique_name(field.lower(), [str(idx)])
         if hasattr(item, "root"):
             mapping[field][item.root.Name] = new_name
             item.root.Name = new_name
@@ -101,6 +143,17 @@ def get_updated_container(field: str, container: Any, mapping: dict) -> Any:
     return new_container
 
 
+def get_updated_lazy_container(field: str, container: LazyContainer, mapping: dict) -> Any:
+    """Same as `get_updated_container` for a lazy container, renaming its raw items."""
+    new_items = []
+    allocator = UniqueNameAllocator()
+    for idx, item in enumerate(container.data):
+        new_name = allocator.get_unique_name(field.lower(), [str(idx)])
+        mapping[field][item["Name"]] = new_name
+        new_items.append({**item, "Name": new_name})
+    return LazyContainer(container.container_type, new_items)
+
+
 def _rename_buses(buses, bus_mapping):
     return [
         Bus(Name=new_name, **{k: v for k, v in vars(bus).items() if k != "Name" and v is not None})
@@ -108,38 +161,30 @@ def _rename_buses(buses, bus_mapping):
     ]
 
 
-def _update_independent_components(circuit: Circuit, new_circuit: Circuit) -> dict:
+def _update_independent_components(new_circuit: Circuit) -> dict:
     ic_mappings = defaultdict(dict)
-    unsupported = {
-        "LineCode",
-        "LoadShape",
-        "TShape",
-        "PriceShape",
-        "XYcurve",
-        "GrowthShape",
-        "TCC_Curve",
-        "WireData",
-        "CNData",
-        "TSData",
-        "LineGeometry",
-        "LineSpacing",
-        "XfmrCode",
-    }
     for field in Circuit.model_fields:
-        if field in unsupported and getattr(circuit, field):
-            updated = get_updated_container(field, getattr(circuit, field), ic_mappings)
+        if field not in INDEPENDENT_COMPONENT_FIELDS:
+            continue
+        lazy_container = get_unvalidated_container(new_circuit, field)
+        if lazy_container and isinstance(lazy_container.data, list):
+            updated = get_updated_lazy_container(field, lazy_container, ic_mappings)
+            setattr(new_circuit, field, updated)
+        elif getattr(new_circuit, field):
+            updated = get_updated_container(field, getattr(new_circuit, field), ic_mappings)
             setattr(new_circuit, field, updated)
     return ic_mappings
 
 
 def _rename_lines(new_circuit, bus_mapping, ic_mappings):
     mappings, renamed = {}, []
+    allocator = UniqueNameAllocator()
     for line in new_circuit.Line.root.root:
         root = line.root
         root.Bus1 = format_bus(root.Bus1, bus_mapping)
         root.Bus2 = format_bus(root.Bus2, bus_mapping)
         prefix = "switch" if root.Switch else "line"
-        new_name = get_unique_name(prefix, [], mappings)
+        new_name = allocator.get_unique_name(prefix, [])
         mappings[root.Name] = new_name
         root.Name = new_name
 
@@ -186,11 +231,12 @@ def _update_capacitor_control_fields(new_circuit: Circuit, ic_mappings):
 
 def _rename_transformers(new_circuit, bus_mapping, ic_mappings):
     mappings, renamed = {}, []
+    allocator = UniqueNameAllocator()
     for transformer in new_circuit.Transformer.root.root:
         root = transformer.root
         root.Bus = [format_bus(b, bus_mapping) for b in root.Bus]
-        new_name = get_unique_name(
-            "transformer", [b.root.split(".")[0] for b in root.Bus], mappings
+        new_name = allocator.get_unique_name(
+            "transformer", [b.root.split(".")[0] for b in root.Bus]
         )
         mappings[root.Name] = new_name
         root.Name = new_name
@@ -206,23 +252,9 @@ def _rename_other_assets(
     circuit, bus_mapping, transformer_mappings, line_mappings, asset_mapping=None
 ):
     asset_mapping = asset_mapping or {}
-    unsupported = {
-        "Sensor",
-        "GICLine",
-        "GICTransformer",
-        "GICsource",
-        "IndMach012",
-        "ESPVLControl",
-        "ExpControl",
-        "UPFC",
-        "UPFCControl",
-        "AutoTrans",
-        "Spectrum",
-    }
-
     for field in Circuit.model_fields:
         asset_mapping[field] = {}
-        if field in {"Line", "Transformer"} or field in unsupported:
+        if not _is_renamed_asset_field(field):
             continue
         field_data = getattr(circuit, field)
         if not getattr(field_data, "root", None) or not getattr(field_data.root, "root", None):
@@ -256,14 +288,47 @@ def _update_postcommands(new_circuit: Circuit, mappings, prefix):
     new_circuit.PostCommands = updated
 
 
+def _is_renamed_asset_field(field: str) -> bool:
+    """Returns true for containers whose items `_rename_other_assets` renames."""
+    if field in {"Line", "Transformer"} or field in UNSUPPORTED_ASSET_FIELDS:
+        return False
+    return not get_item_fields(field).isdisjoint(REFERENCE_FIELDS)
+
+
+RENAMED_FIELDS = INDEPENDENT_COMPONENT_FIELDS | {
+    field
+    for field in Circuit.model_fields
+    if field in {"Line", "Transformer", "CapControl"} or _is_renamed_asset_field(field)
+}
+
+
+def _copy_containers_to_rename(circuit: Circuit) -> Circuit:
+    """Copies the circuit, deep copying only the containers that are renamed in place.
+    Other containers are shared with `circuit`."""
+    new_circuit = circuit.model_copy()
+    for field in Circuit.model_fields:
+        if field not in RENAMED_FIELDS:
+            continue
+        # Lazy containers validate their raw data again instead of being copied.
+        lazy_container = get_unvalidated_container(circuit, field)
+        if lazy_container is not None:
+            lazy_copy = LazyContainer(lazy_container.container_type, lazy_container.data)
+            setattr(new_circuit, field, lazy_copy)
+            continue
+        value = getattr(circuit, field)
+        if hasattr(value, "root"):
+            setattr(new_circuit, field, copy.deepcopy(value))
+    return new_circuit
+
+
 def rename_assets(circuit: Circuit) -> Circuit:
-    new_circuit = copy.deepcopy(circuit)
+    new_circuit = _copy_containers_to_rename(circuit)
     new_circuit.Name = "reduced_ckt"
 
     bus_mapping = {bus.Name: f"{i}" for i, bus in enumerate(circuit.Bus)}
     new_circuit.Bus = _rename_buses(circuit.Bus, bus_mapping)
 
-    independent_component_mappings = _update_independent_components(circuit, new_circuit)
+    independent_component_mappings = _update_independent_components(new_circuit)
     _update_line_geometry_fields(new_circuit, independent_component_mappings)
     line_mappings = _rename_lines(new_circuit, bus_mapping, independent_component_mappings)
     transformer_mappings = {}
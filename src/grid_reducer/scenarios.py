@@ -0,0 +1,224 @@
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from pathlib import Path
+from typing import Type
+import os
+import time
+import traceback
+
+import numpy as np
+from pydantic import BaseModel
+
+from grid_reducer.altdss.altdss_models import Circuit
+from grid_reducer.add_differential_privacy import (
+    BasePrivacyConfig,
+    get_dp_circuit,
+    get_independent_noise_seeds,
+)
+from grid_reducer.bus_table import BusTable
+from grid_reducer.dss_writer import write_to_opendss_files
+from grid_reducer.profiling import PipelineProfile
+from grid_reducer.rename_components import rename_assets
+from grid_reducer.transform_coordinate import get_switch_connected_buses, transform_bus_coordinates
+from grid_reducer.utils import write_to_opendss_file
+
+
+class ReductionScenario(BaseModel):
+    output_file: Path
+    transform_coordinate: bool = True
+    layout: str = "kamada_kawai"
+    noise_config: Type[BasePrivacyConfig] | None = None
+    noise_seed: int | None = None
+    split_files: bool = False
+
+
+class ScenarioResult(BaseModel):
+    output_file: Path
+    status: str
+    elapsed_time: float
+    error: str | None = None
+
+
+def apply_layout(
+    circuit: Circuit,
+    transform_coordinate: bool,
+    layout: str,
+    profile: PipelineProfile,
+) -> Circuit:
+    if not transform_coordinate:
+        return circuit
+    with profile.stage("layout", circuit) as stage:
+        transformed_ckt = transform_bus_coordinates(circuit, layout)
+        stage.set_output(transformed_ckt)
+    return transformed_ckt
+
+
+def apply_privacy_and_rename(
+    circuit: Circuit,
+    has_switches: bool,
+    noise_config: Type[BasePrivacyConfig] | None,
+    noise_seed: int | None,
+    profile: PipelineProfile,
+) -> Circuit:
+    """Adds noise to bus coordinates if `noise_config` is given and the aggregated
+    circuit has switches, then renames all components."""
+    private_ckt = circuit
+    if noise_config and has_switches:
+        with profile.stage("differential_privacy", circuit) as stage:
+            private_ckt = get_dp_circuit(circuit, noise_config(), noise_seed)
+            stage.set_output(private_ckt)
+    with profile.stage("rename", private_ckt) as stage:
+        renamed_ckt = rename_assets(private_ckt)
+        stage.set_output(renamed_ckt)
+    return renamed_ckt
+
+
+_worker_circuit: Circuit | None = None
+_worker_layouts: dict[str, Circuit] = {}
+
+
+def _set_worker_circuit(circuit: Circuit) -> None:
+    """Sends the aggregated circuit to each worker process once."""
+    global _worker_circuit
+    _worker_circuit = circuit
+    _worker_layouts.clear()
+
+
+def _get_layout_coordinates(layout: str) -> tuple[np.ndarray, ...]:
+    """Computes a layout in a worker, returning only the bus coordinate columns."""
+    layout_ckt = apply_layout(_worker_circuit, True, layout, PipelineProfile())
+    _worker_layouts[layout] = layout_ckt
+    bus_table = BusTable.from_circuit(layout_ckt)
+    return bus_table.x, bus_table.y, bus_table.x_null, bus_table.y_null
+
+
+def _get_layout_circuit(layout: str, coordinates: tuple[np.ndarray, ...]) -> Circuit:
+    """Returns the worker circuit with bus coordinates of a layout, built once per worker."""
+    if layout not in _worker_layouts:
+        bus_table = BusTable.from_circuit(_worker_circuit)
+        bus_table.x, bus_table.y, bus_table.x_null, bus_table.y_null = coordinates
+        _worker_layouts[layout] = bus_table.to_circuit(_worker_circuit)
+    return _worker_layouts[layout]
+
+
+def _get_failed_result(scenario: ReductionScenario) -> ScenarioResult:
+    return ScenarioResult(
+        output_file=scenario.output_file,
+        status="failed",
+        elapsed_time=0.0,
+        error=traceback.format_exc(),
+    )
+
+
+def _run_scenario(
+    scenario: ReductionScenario,
+    has_switches: bool,
+    coordinates: tuple[np.ndarray, ...] | None = None,
+) -> ScenarioResult:
+    start_time = time.monotonic()
+    try:
+        circuit = _worker_circuit
+        if coordinates is not None:
+            circuit = _get_layout_circuit(scenario.layout, coordinates)
+        renamed_ckt = apply_privacy_and_rename(
+            circuit, has_switches, scenario.noise_config, scenario.noise_seed, PipelineProfile()
+        )
+        scenario.output_file.parent.mkdir(parents=True, exist_ok=True)
+        if scenario.split_files:
+            write_to_opendss_files(renamed_ckt, scenario.output_file)
+        else:
+            write_to_opendss_file(renamed_ckt, scenario.output_file)
+        status, error = "success", None
+    except Exception:
+        status, error = "failed", traceback.format_exc()
+    return ScenarioResult(
+        output_file=scenario.output_file,
+        status=status,
+        elapsed_time=round(time.monotonic() - start_time, 3),
+        error=error,
+    )
+
+
+def run_scenarios(
+    circuit: Circuit, scenarios: list[ReductionScenario], workers: int | None = None
+) -> list[ScenarioResult]:
+    """
+    Publishes an aggregated circuit once per scenario across a pool of worker processes.
+
+    The circuit is sent to each worker once. Each distinct layout is computed once and
+    only its bus coordinates are passed on to the scenarios using it, which are started
+    as soon as their layout is done. Differential privacy, rename and export run per
+    scenario, and a failing scenario does not affect the others. Results are returned in
+    the same order as `scenarios`.
+    """
+    output_files = [scenario.output_file.resolve() for scenario in scenarios]
+    if len(set(output_files)) != len(output_files):
+        raise ValueError("Each scenario must be written to its own output file.")
+    if not scenarios:
+        return []
+    has_switches = bool(get_switch_connected_buses(circuit))
+    layout_scenarios: dict[str, list[int]] = {}
+    for index, scenario in enumerate(scenarios):
+        if scenario.transform_coordinate:
+            layout_scenarios.setdefault(scenario.layout, []).append(index)
+    results: list[ScenarioResult | None] = [None] * len(scenarios)
+    max_workers = min(workers or os.cpu_count() or 1, len(scenarios))
+    with ProcessPoolExecutor(
+        max_workers=max_workers, initializer=_set_worker_circuit, initargs=(circuit,)
+    ) as executor:
+        layout_futures = {
+            executor.submit(_get_layout_coordinates, layout): layout for layout in layout_scenarios
+        }
+        scenario_futures = {
+            index: executor.submit(_run_scenario, scenario, has_switches)
+            for index, scenario in enumerate(scenarios)
+            if not scenario.transform_coordinate
+        }
+        for layout_future in as_completed(layout_futures):
+            indices = layout_scenarios[layout_futures[layout_future]]
+            try:
+                coordinates = layout_future.result()
+            except Exception:
+                for index in indices:
+                    results[index] = _get_failed_result(scenarios[index])
+                continue
+            for index in indices:
+                scenario_futures[index] = executor.submit(
+                    _run_scenario, scenarios[index], has_switches, coordinates
+                )
+        for index, future in scenario_futures.items():
+            results[index] = future.result()
+    return results
+
+
+def get_publication_scenarios(
+    output_folder: Path | str,
+    noise_configs: dict[str, Type[BasePrivacyConfig] | None],
+    transform_options: list[bool],
+    layout: str = "kamada_kawai",
+    noise_seed: int | None = None,
+    split_files: bool = False,
+) -> list[ReductionScenario]:
+    """
+    Returns one scenario per noise config and transform option, each writing to its own
+    sub folder of `output_folder`, e.g. `noise_high_kamada_kawai/reduced_ckt.dss`.
+    Each scenario gets its own seed derived from `noise_seed`.
+    """
+    output_folder = Path(output_folder)
+    noise_seeds = iter(
+        get_independent_noise_seeds(noise_seed, len(noise_configs) * len(transform_options))
+    )
+    scenarios = []
+    for noise_level, noise_config in noise_configs.items():
+        for transform_coordinate in transform_options:
+            name = f"noise_{noise_level}" + (f"_{layout}" if transform_coordinate else "")
+            scenarios.append(
+                ReductionScenario(
+                    output_file=output_folder / name / "reduced_ckt.dss",
+                    transform_coordinate=transform_coordinate,
+                    layout=layout,
+                    noise_config=noise_config,
+                    noise_seed=next(noise_seeds),
+                    split_files=split_files,
+                )
+            )
+    return scenarios
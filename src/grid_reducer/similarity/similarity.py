@@ -1,20 +1,62 @@
-from typing import TypeVar, Type
+from typing import Any, Hashable, TypeVar, Type
 
-from pydantic import BaseModel
+from pydantic import BaseModel, RootModel
 
 T = TypeVar("T")
 
 
+def get_hashable_value(value: Any) -> Hashable:
+    """Converts field values such as lists and pydantic models into hashable values."""
+    if isinstance(value, RootModel):
+        return (type(value), get_hashable_value(value.root))
+    if isinstance(value, BaseModel):
+        return (type(value), tuple(get_hashable_value(v) for v in value.__dict__.values()))
+    if isinstance(value, (list, tuple)):
+        return tuple(get_hashable_value(v) for v in value)
+    if isinstance(value, dict):
+        return tuple((k, get_hashable_value(v)) for k, v in value.items())
+    return value
+
+
 class CheckSimilarity:
+    """
+    Checks if two objects are similar by comparing all fields except `ignore_fields`.
+
+    Compared fields are resolved once per class and each object's signature is
+    computed once, so checking similarity is an equality check on cached keys.
+    """
+
     ignore_fields = None
 
+    def __init__(self):
+        self._compared_fields: dict[Type[BaseModel], tuple[str, ...]] = {}
+        self._signatures: dict[int, tuple[Any, Hashable]] = {}
+
+    def get_compared_fields(self, class_type: Type[BaseModel]) -> tuple[str, ...]:
+        if class_type not in self._compared_fields:
+            self._compared_fields[class_type] = tuple(
+                field
+                for field in class_type.model_fields
+                if self.ignore_fields is None or field not in self.ignore_fields
+            )
+        return self._compared_fields[class_type]
+
+    def get_signature(self, obj: T) -> Hashable:
+        """Returns hashable signature, objects with equal signatures are similar."""
+        cached = self._signatures.get(id(obj))
+        if cached is not None and cached[0] is obj:
+            return cached[1]
+        class_type = type(obj)
+        signature = (
+            class_type,
+            tuple(
+                get_hashable_value(getattr(obj, field))
+                for field in self.get_compared_fields(class_type)
+            ),
+        )
+        # Object is kept alongside its signature so that its id is not reused.
+        self._signatures[id(obj)] = (obj, signature)
+        return signature
+
     def check_if_similar(self, source: T, target: T) -> bool:
-        class_type: Type[BaseModel] = type(source)
-        for field in class_type.model_fields:
-            if self.ignore_fields is not None and field in self.ignore_fields:
-                continue
-            source_val = getattr(source, field)
-            target_val = getattr(target, field)
-            if source_val != target_val:
-                return False
-        return True
+        return self.get_signature(source) == self.get_signature(target)
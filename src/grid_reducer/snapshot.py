@@ -0,0 +1,236 @@
+from pathlib import Path
+from typing import Any, Iterable
+import json
+import os
+import struct
+import uuid
+
+import numpy as np
+
+from grid_reducer.altdss.altdss_models import Circuit
+from grid_reducer.lazy_circuit import CONTAINER_TYPES, get_lazy_circuit
+from grid_reducer.version import VERSION
+
+SNAPSHOT_MAGIC = b"GRIDSNAP"
+SNAPSHOT_FORMAT_VERSION = 1
+SNAPSHOT_ALIGNMENT = 64
+HEADER_PREFIX = struct.Struct("<8sQ")
+TABLE_FIELDS = ["Bus", *CONTAINER_TYPES]
+
+
+def _is_number(value: Any) -> bool:
+    return isinstance(value, (int, float)) and not isinstance(value, bool)
+
+
+def _get_column_kind(values: list[Any]) -> str:
+    """Returns how a column of present values is stored, `json` if no array fits."""
+    if all(isinstance(value, bool) for value in values):
+        return "bool"
+    if all(isinstance(value, int) and not isinstance(value, bool) for value in values):
+        return "int"
+    if all(_is_number(value) for value in values):
+        return "float"
+    if all(isinstance(value, str) for value in values):
+        return "str"
+    if all(isinstance(value, list) and all(map(_is_number, value)) for value in values):
+        if all(isinstance(item, int) for value in values for item in value):
+            return "int_list"
+        return "float_list"
+    return "json"
+
+
+class _SnapshotWriter:
+    """Collects arrays of a snapshot and their specs for the header."""
+
+    def __init__(self):
+        self.arrays: list[np.ndarray] = []
+        self.specs: list[dict[str, Any]] = []
+
+    def add(self, array: np.ndarray) -> int:
+        self.arrays.append(np.ascontiguousarray(array))
+        self.specs.append({"dtype": array.dtype.str, "shape": list(array.shape)})
+        return len(self.arrays) - 1
+
+    def add_strings(self, values: list[str]) -> dict[str, int]:
+        encoded = [value.encode("utf-8") for value in values]
+        offsets = np.zeros(len(encoded) + 1, dtype=np.int64)
+        np.cumsum([len(value) for value in encoded], out=offsets[1:])
+        data = np.frombuffer(b"".join(encoded), dtype=np.uint8)
+        return {"data": self.add(data), "offsets": self.add(offsets)}
+
+    def add_column(self, values: list[Any], mask: np.ndarray) -> dict[str, Any]:
+        kind = _get_column_kind(values)
+        column: dict[str, Any] = {"kind": kind}
+        if not mask.all():
+            column["mask"] = self.add(mask)
+        if kind in {"bool", "int", "float"}:
+            dtype = {"bool": bool, "int": np.int64, "float": np.float64}[kind]
+            column["values"] = self.add(np.array(values, dtype=dtype))
+        elif kind in {"int_list", "float_list"}:
+            dtype = np.int64 if kind == "int_list" else np.float64
+            offsets = np.zeros(len(values) + 1, dtype=np.int64)
+            np.cumsum([len(value) for value in values], out=offsets[1:])
+            flat = [item for value in values for item in value]
+            column["values"] = self.add(np.array(flat, dtype=dtype))
+            column["offsets"] = self.add(offsets)
+        else:
+            strings = values if kind == "str" else [json.dumps(value) for value in values]
+            column.update(self.add_strings(strings))
+        return column
+
+    def add_table(self, items: list[dict[str, Any]]) -> dict[str, Any]:
+        keys = list(dict.fromkeys(key for item in items for key in item))
+        columns = {}
+        for key in keys:
+            mask = np.fromiter((key in item for item in items), dtype=bool, count=len(items))
+            values = [item[key] for item in items if key in item]
+            columns[key] = self.add_column(values, mask)
+        return {"count": len(items), "columns": columns}
+
+
+def write_circuit_snapshot(circuit: Circuit, snapshot_file: Path | str) -> None:
+    """
+    Writes the circuit to a columnar snapshot file, without pickling.
+
+    Buses and each container are stored as a table with one column per field. Numbers,
+    booleans, strings and number lists are stored as NumPy arrays, other values as json
+    strings. Tables are written behind a json header, aligned for memory mapping.
+    """
+    snapshot_file = Path(snapshot_file)
+    writer = _SnapshotWriter()
+    fields, tables, lists = {}, {}, {}
+    for field, value in circuit.model_dump(mode="json", exclude_unset=True).items():
+        if field in TABLE_FIELDS and isinstance(value, list):
+            tables[field] = writer.add_table(value)
+        elif field in TABLE_FIELDS:
+            # Containers referencing json files are stored as is.
+            lists[field] = value
+        else:
+            fields[field] = value
+
+    offset = 0
+    for spec, array in zip(writer.specs, writer.arrays, strict=True):
+        spec["offset"] = offset
+        offset += -(-array.nbytes // SNAPSHOT_ALIGNMENT) * SNAPSHOT_ALIGNMENT
+    header = json.dumps(
+        {
+            "format_version": SNAPSHOT_FORMAT_VERSION,
+            "grid_reducer_version": VERSION,
+            "fields": fields,
+            "other_fields": lists,
+            "tables": tables,
+            "arrays": writer.specs,
+        }
+    ).encode("utf-8")
+    data_start = HEADER_PREFIX.size + len(header)
+    data_start = -(-data_start // SNAPSHOT_ALIGNMENT) * SNAPSHOT_ALIGNMENT
+
+    temp_file = snapshot_file.with_suffix(f".{uuid.uuid4().hex}.tmp")
+    with open(temp_file, "wb") as fp:
+        fp.write(HEADER_PREFIX.pack(SNAPSHOT_MAGIC, len(header)))
+        fp.write(header)
+        for spec, array in zip(writer.specs, writer.arrays, strict=True):
+            fp.seek(data_start + spec["offset"])
+            fp.write(array.tobytes())
+        fp.truncate(data_start + offset)
+    os.replace(temp_file, snapshot_file)
+
+
+class CircuitSnapshot:
+    """
+    Memory mapped snapshot written by `write_circuit_snapshot`.
+
+    Opening a snapshot only reads its header. Tables are decoded on request, reading
+    just the pages of their arrays.
+    """
+
+    def __init__(self, snapshot_file: Path | str):
+        self.snapshot_file = Path(snapshot_file)
+        with open(self.snapshot_file, "rb") as fp:
+            magic, header_size = HEADER_PREFIX.unpack(fp.read(HEADER_PREFIX.size))
+            if magic != SNAPSHOT_MAGIC:
+                raise ValueError(f"{self.snapshot_file} is not a circuit snapshot.")
+            header = json.loads(fp.read(header_size))
+        if header["format_version"] != SNAPSHOT_FORMAT_VERSION:
+            raise ValueError(f"Unsupported snapshot format {header['format_version']}.")
+        self.header = header
+        data_start = HEADER_PREFIX.size + header_size
+        self._data_start = -(-data_start // SNAPSHOT_ALIGNMENT) * SNAPSHOT_ALIGNMENT
+        self._buffer = np.memmap(self.snapshot_file, dtype=np.uint8, mode="r")
+
+    @property
+    def fields(self) -> list[str]:
+        """Returns names of the circuit fields stored in the snapshot."""
+        return [*self.header["fields"], *self.header["other_fields"], *self.header["tables"]]
+
+    def get_array(self, array_id: int) -> np.ndarray:
+        """Returns a read only view of an array, backed by the memory map."""
+        spec = self.header["arrays"][array_id]
+        dtype = np.dtype(spec["dtype"])
+        start = self._data_start + spec["offset"]
+        size = int(np.prod(spec["shape"], dtype=np.int64)) * dtype.itemsize
+        return self._buffer[start : start + size].view(dtype).reshape(spec["shape"])
+
+    def _get_strings(self, column: dict[str, Any]) -> list[str]:
+        data = self.get_array(column["data"]).tobytes()
+        offsets = self.get_array(column["offsets"]).tolist()
+        return [
+            data[start:end].decode("utf-8")
+            for start, end in zip(offsets[:-1], offsets[1:], strict=True)
+        ]
+
+    def _get_column_values(self, column: dict[str, Any]) -> list[Any]:
+        kind = column["kind"]
+        if kind in {"bool", "int", "float"}:
+            return self.get_array(column["values"]).tolist()
+        if kind in {"int_list", "float_list"}:
+            values = self.get_array(column["values"]).tolist()
+            offsets = self.get_array(column["offsets"]).tolist()
+            return [
+                values[start:end] for start, end in zip(offsets[:-1], offsets[1:], strict=True)
+            ]
+        strings = self._get_strings(column)
+        return strings if kind == "str" else [json.loads(value) for value in strings]
+
+    def get_table(self, field: str) -> list[dict[str, Any]]:
+        """Returns items of a table as dicts, as dumped from the circuit."""
+        table = self.header["tables"][field]
+        items = [{} for _ in range(table["count"])]
+        for key, column in table["columns"].items():
+            values = self._get_column_values(column)
+            if "mask" in column:
+                targets = [items[idx] for idx in np.flatnonzero(self.get_array(column["mask"]))]
+            else:
+                targets = items
+            for item, value in zip(targets, values, strict=True):
+                item[key] = value
+        return items
+
+    def get_dict(self, fields: Iterable[str] | None = None) -> dict[str, Any]:
+        """Returns circuit dict with the given fields, all fields if not given. Fields
+        that are not tables or containers, such as the name and commands, and the
+        required Vsource are always included."""
+        fields = set(self.fields if fields is None else fields)
+        fields |= {field for field, info in Circuit.model_fields.items() if info.is_required()}
+        circuit_dict = dict(self.header["fields"])
+        for field, value in self.header["other_fields"].items():
+            if field in fields:
+                circuit_dict[field] = value
+        for field in self.header["tables"]:
+            if field in fields:
+                circuit_dict[field] = self.get_table(field)
+        return circuit_dict
+
+
+def read_circuit_snapshot(
+    snapshot_file: Path | str, fields: Iterable[str] | None = None, lazy: bool = False
+) -> Circuit:
+    """
+    Reads a circuit from a snapshot file, only reading `fields` if given, e.g.
+    `["Bus", "Line"]`. Fields not read are left unset. If `lazy` is true, containers
+    are validated on first read.
+    """
+    circuit_dict = CircuitSnapshot(snapshot_file).get_dict(fields)
+    if lazy:
+        return get_lazy_circuit(circuit_dict)
+    return Circuit.model_validate(circuit_dict)
@@ -0,0 +1,178 @@
+from pathlib import Path
+from typing import NamedTuple
+
+import numpy as np
+import opendssdirect as odd
+
+from grid_reducer.feeder_tree import FeederTree
+from grid_reducer.profiling import profile_stage
+from grid_reducer.summary import BaseSummaryModel
+from grid_reducer.utils import prepare_buses_without_solve
+
+EDGE_CLASSES = ["Line", "Reactor", "Transformer"]
+SWITCH_NORMAL_OPEN = 1
+
+
+class TopologyComponent(NamedTuple):
+    """Edge component of a topology, with the field names of the circuit models."""
+
+    Name: str
+    Phases: int
+
+
+class FeederTopology:
+    """
+    Buses and branch connections of a feeder, read through OpenDSSDirect without
+    building the pydantic `Circuit`.
+
+    Bus names index the `kv_ln`, `x` and `y` float arrays, with NaN for missing values.
+    Lines, reactors and transformers are stored in load order as `edge_names`,
+    `edge_types` and `edge_phases`, with their buses as `edge_buses` ids. `is_open`
+    marks disabled, opened and normally open lines.
+    """
+
+    def __init__(
+        self,
+        names: list[str],
+        kv_ln: np.ndarray,
+        x: np.ndarray,
+        y: np.ndarray,
+        edge_names: list[str],
+        edge_types: list[str],
+        edge_buses: np.ndarray,
+        edge_phases: np.ndarray,
+        is_open: np.ndarray,
+        source_name: str,
+    ):
+        self.names = names
+        self.kv_ln = kv_ln
+        self.x = x
+        self.y = y
+        self.edge_names = edge_names
+        self.edge_types = edge_types
+        self.edge_buses = edge_buses
+        self.edge_phases = edge_phases
+        self.is_open = is_open
+        self.source_name = source_name
+
+    @classmethod
+    def from_opendss(cls) -> "FeederTopology":
+        """Reads the topology of the active OpenDSS circuit."""
+        names = odd.Circuit.AllBusNames()
+        index = {name: idx for idx, name in enumerate(names)}
+        kv_ln, x, y = (np.full(len(names), np.nan) for _ in range(3))
+        for idx in range(len(names)):
+            odd.Circuit.SetActiveBusi(idx)
+            kv_ln[idx] = odd.Bus.kVBase() or np.nan
+            if odd.Bus.Coorddefined():
+                x[idx], y[idx] = odd.Bus.X(), odd.Bus.Y()
+
+        normally_open = set()
+        idx = odd.SwtControls.First()
+        while idx:
+            switched_class, _, switched_name = odd.SwtControls.SwitchedObj().partition(".")
+            if switched_class.lower() == "line" and (
+                odd.SwtControls.NormalState() == SWITCH_NORMAL_OPEN
+            ):
+                normally_open.add(switched_name.lower())
+            idx = odd.SwtControls.Next()
+
+        edge_names, edge_types, edge_buses, edge_phases, is_open = [], [], [], [], []
+        for edge_type in EDGE_CLASSES:
+            odd.Circuit.SetActiveClass(edge_type)
+            for name in odd.ActiveClass.AllNames():
+                odd.Circuit.SetActiveElement(f"{edge_type}.{name}")
+                buses = list(dict.fromkeys(bus.split(".")[0] for bus in odd.CktElement.BusNames()))
+                if len(buses) == 1:
+                    # Shunt reactors connect a single bus.
+                    continue
+                if len(buses) != 2:
+                    raise Exception("Transformer with more than 2 buses not supported.")
+                edge_names.append(name)
+                edge_types.append(edge_type)
+                edge_buses.append([index[bus] for bus in buses])
+                edge_phases.append(odd.CktElement.NumPhases())
+                is_open.append(
+                    edge_type == "Line"
+                    and (
+                        not odd.CktElement.Enabled()
+                        or odd.CktElement.IsOpen(1, 0)
+                        or odd.CktElement.IsOpen(2, 0)
+                        or name in normally_open
+                    )
+                )
+
+        odd.Vsources.First()
+        return cls(
+            names=names,
+            kv_ln=kv_ln,
+            x=x,
+            y=y,
+            edge_names=edge_names,
+            edge_types=edge_types,
+            edge_buses=np.array(edge_buses, dtype=np.int64).reshape(-1, 2),
+            edge_phases=np.array(edge_phases, dtype=np.int64),
+            is_open=np.array(is_open, dtype=bool),
+            source_name=odd.CktElement.BusNames()[0].split(".")[0],
+        )
+
+    def get_feeder_tree(self) -> FeederTree:
+        """Builds the same tree as `FeederTree.from_circuit`, with `TopologyComponent`
+        edge components."""
+        with profile_stage("graph_build"):
+            edges = (
+                (
+                    self.names[bus1],
+                    self.names[bus2],
+                    TopologyComponent(name, phases),
+                    edge_type,
+                )
+                for name, edge_type, (bus1, bus2), phases, is_open in zip(
+                    self.edge_names,
+                    self.edge_types,
+                    self.edge_buses.tolist(),
+                    self.edge_phases.tolist(),
+                    self.is_open.tolist(),
+                    strict=True,
+                )
+                if not is_open
+            )
+            return FeederTree.from_edges(self.names, self.kv_ln, edges, self.source_name)
+
+
+def get_topology_from_opendss(master_file: Path, solve: bool = False) -> FeederTopology:
+    """Loads the master file and reads its topology, without the JSON export of
+    `get_dict_from_opendss`."""
+    odd.Text.Command(f'Redirect "{master_file}"')
+    if solve:
+        odd.Text.Command("Solve")
+    else:
+        prepare_buses_without_solve()
+    topology = FeederTopology.from_opendss()
+    odd.Text.Command("clear")
+    return topology
+
+
+class TopologySummary(BaseSummaryModel):
+    buses: int
+    edges: int
+    connected_buses: int
+    primary_buses: int
+    secondary_buses: int
+    loops: int
+
+    @classmethod
+    def from_tree(cls, tree: FeederTree, threshold_kv_ln: float = 1.0) -> "TopologySummary":
+        """Counts buses of the tree, splitting connected buses at `threshold_kv_ln`."""
+        connected = tree.reached
+        return cls(
+            buses=len(tree),
+            edges=len(tree.edge_buses),
+            connected_buses=int(connected.sum()),
+            primary_buses=int((connected & (tree.kv >= threshold_kv_ln)).sum()),
+            secondary_buses=int((connected & (tree.kv < threshold_kv_ln)).sum()),
+            loops=len(tree.get_non_tree_edge_names()),
+        )
+
+    def get_summary(self) -> dict[str, dict[str, int]]:
+        return {"Topology": self.model_dump()}
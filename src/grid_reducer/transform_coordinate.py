@@ -1,11 +1,10 @@
-import copy
-import time
-
-import networkx as nx
+import numpy as np
 
 from grid_reducer.altdss.altdss_models import Circuit
+from grid_reducer.bus_table import BusTable
 from grid_reducer.network import get_graph_from_circuit
-from grid_reducer.utils import extract_bus_name
+from grid_reducer.utils import extract_bus_name, get_circuit_bus_name
+from grid_reducer.layouts import get_layout
 
 
 def get_switch_connected_buses(circuit: Circuit) -> list[str]:
@@ -28,41 +27,24 @@ def get_switch_connected_buses(circuit: Circuit) -> list[str]:
 
 
 def remove_bus_coordinates(circuit: Circuit, preserve_buses: list[str] | None):
-    if preserve_buses is None:
-        preserve_buses = []
+    bus_table = BusTable.from_circuit(circuit)
+    bus_table.clear_coordinates(~bus_table.get_mask(preserve_buses or []))
+    return bus_table.to_circuit(circuit)
 
-    new_buses = []
-    for bus in circuit.Bus:
-        if bus.Name not in preserve_buses:
-            new_bus = copy.deepcopy(bus)
-            new_bus.X = None
-            new_bus.Y = None
-            new_buses.append(new_bus)
-        else:
-            new_buses.append(bus)
-    new_circuit = copy.deepcopy(circuit)
-    new_circuit.Bus = new_buses
-    return new_circuit
 
+def transform_bus_coordinates(circuit: Circuit, layout: str = "kamada_kawai") -> Circuit:
+    """Function to transform the coordinates so it's not traceable.
 
-def transform_bus_coordinates(circuit: Circuit) -> Circuit:
-    """Function to transform the coordinates so it's not traceable."""
+    `layout` is one of the layouts registered in `grid_reducer.layouts`, e.g.
+    `kamada_kawai` or `radial_tree` for large feeders.
+    """
 
     switch_buses = get_switch_connected_buses(circuit)
-    new_circuit = remove_bus_coordinates(circuit, switch_buses)
     if switch_buses:
-        return new_circuit
-    graph = get_graph_from_circuit(new_circuit)
-    start = time.time()
-    print("Transforming coordinates...")
-    pos = nx.kamada_kawai_layout(graph)
-    print(f"Time: {time.time() - start}")
-    new_buses = []
-    for bus in circuit.Bus:
-        new_bus = copy.deepcopy(bus)
-        new_bus.X = pos[bus.Name][0]
-        new_bus.Y = pos[bus.Name][1]
-        new_buses.append(new_bus)
-    new_circuit = copy.deepcopy(circuit)
-    new_circuit.Bus = new_buses
-    return new_circuit
+        return remove_bus_coordinates(circuit, switch_buses)
+    graph = get_graph_from_circuit(circuit)
+    pos = get_layout(graph, layout, source=get_circuit_bus_name(circuit))
+    bus_table = BusTable.from_circuit(circuit)
+    xy = np.array([pos[name] for name in bus_table.names], dtype=float).reshape(-1, 2)
+    bus_table.set_coordinates(xy[:, 0], xy[:, 1])
+    return bus_table.to_circuit(circuit)
@@ -11,22 +11,83 @@ from rich.markdown import Markdown
 from rich.panel import Panel
 
 from grid_reducer.altdss.altdss_models import Circuit, BusConnection, SwtControlState
+from grid_reducer.dss_writer import dump_circuit_dss, open_dss_file
+from grid_reducer.lazy_circuit import get_lazy_circuit
+
+try:
+    import orjson
+except ImportError:  # orjson is an optional, faster json decoder
+    orjson = None
 
 
 T = TypeVar("T", bound=BaseModel)
 
 
-def get_dict_from_opendss(master_file: Path) -> dict:
+def loads_json(contents: str | bytes) -> Any:
+    """Decodes json with orjson if installed, and with the json module otherwise or for
+    contents orjson rejects, such as NaN values."""
+    if orjson is not None:
+        try:
+            return orjson.loads(contents)
+        except orjson.JSONDecodeError:
+            pass
+    return json.loads(contents)
+
+
+def has_bus_voltage_bases() -> bool:
+    """Returns true if every bus in the active OpenDSS circuit has a voltage base."""
+    for index in range(odd.Circuit.NumBuses()):
+        odd.Circuit.SetActiveBusi(index)
+        if not odd.Bus.kVBase():
+            return False
+    return True
+
+
+def prepare_buses_without_solve() -> None:
+    """Establishes bus list and voltage bases without running a power flow.
+
+    Falls back to a solve only if some bus kV bases are still missing.
+    """
+    if not odd.Circuit.NumBuses():
+        odd.Text.Command("MakeBusList")
+    if has_bus_voltage_bases():
+        return
+    if odd.Settings.VoltageBases():
+        odd.Text.Command("CalcVoltageBases")
+    if not has_bus_voltage_bases():
+        odd.Text.Command("Solve")
+
+
+def get_json_from_opendss(master_file: Path, solve: bool = True) -> str:
+    """Returns the altdss json export of the circuit in the master file."""
     odd.Text.Command(f'Redirect "{master_file}"')
-    odd.Text.Command("Solve")
-    circuit_dict = json.loads(odd.Circuit.ToJSON())
+    if solve:
+        odd.Text.Command("Solve")
+    else:
+        prepare_buses_without_solve()
+    circuit_json = odd.Circuit.ToJSON()
     odd.Text.Command("clear")
-    return circuit_dict
+    return circuit_json
+
+
+def get_dict_from_opendss(master_file: Path, solve: bool = True) -> dict:
+    return loads_json(get_json_from_opendss(master_file, solve=solve))
 
 
-def get_ckt_from_opendss_model(master_file: Path) -> Circuit:
-    circuit_dict = get_dict_from_opendss(master_file)
-    return Circuit.model_validate(circuit_dict)
+def get_ckt_from_opendss_model(
+    master_file: Path, solve: bool = True, lazy: bool = False
+) -> Circuit:
+    """
+    Loads the circuit of a master file. If `lazy` is true, each container is validated
+    on first read or when the circuit is written.
+
+    Eager loads parse and validate the json export in a single pass of pydantic-core,
+    without building intermediate dicts.
+    """
+    circuit_json = get_json_from_opendss(master_file, solve=solve)
+    if lazy:
+        return get_lazy_circuit(loads_json(circuit_json))
+    return Circuit.model_validate_json(circuit_json)
 
 
 def get_circuit_bus_name(circuit: Circuit) -> str:
@@ -34,10 +95,7 @@ def get_circuit_bus_name(circuit: Circuit) -> str:
 
 
 def get_bus_voltage_ln_mapper(circuit: Circuit) -> dict[str, float]:
-    bus_voltage_mapper = {}
-    for bus in circuit.Bus:
-        bus_voltage_mapper[bus.Name] = bus.kVLN
-    return bus_voltage_mapper
+    return {bus.Name: bus.kVLN for bus in circuit.Bus}
 
 
 def get_bus_connected_assets(asset_container: Any, bus_name: str) -> list[Any]:
@@ -48,15 +106,30 @@ def get_bus_connected_assets(asset_container: Any, bus_name: str) -> list[Any]:
     ]
 
 
+def get_bus_connected_assets_mapper(
+    circuit: Circuit, asset_types: list[Type[BaseModel]]
+) -> dict[Type[BaseModel], dict[str, list[Any]]]:
+    """Index assets of the given types by their Bus1 name in a single pass."""
+    asset_mapper = {}
+    for asset_type in asset_types:
+        bus_asset_mapper = defaultdict(list)
+        asset_container = getattr(circuit, asset_type.__name__)
+        if asset_container is not None:
+            for asset in asset_container.root.root:
+                bus_asset_mapper[asset.root.Bus1.root.split(".")[0]].append(asset.root)
+        asset_mapper[asset_type] = bus_asset_mapper
+    return asset_mapper
+
+
 def write_to_opendss_file(circuit: Circuit, output_file: Path | str) -> None:
-    with open(output_file, "w", encoding="utf-8") as fp:
-        circuit.dump_dss(fp)
+    """Streams circuit to a dss file, gzip compressed if `output_file` ends with `.gz`."""
+    with open_dss_file(output_file) as fp:
+        dump_circuit_dss(circuit, fp)
 
 
 def read_json_file(file_path: Path) -> dict:
-    with open(file_path, "r", encoding="utf-8") as fp:
-        contents = json.load(fp)
-    return contents
+    with open(file_path, "rb") as fp:
+        return loads_json(fp.read())
 
 
 def generate_short_name() -> str:
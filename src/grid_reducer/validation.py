@@ -0,0 +1,128 @@
+import numpy as np
+import opendssdirect as odd
+from pydantic import BaseModel, ConfigDict
+
+from grid_reducer.altdss.altdss_models import Circuit
+from grid_reducer.opendss import OpenDSS
+from grid_reducer.summary import BaseSummaryModel
+
+
+class PowerFlowResult(BaseModel):
+    """Node voltages, feeder head power and losses of a solved circuit."""
+
+    model_config = ConfigDict(arbitrary_types_allowed=True)
+
+    node_names: np.ndarray
+    vmag_pu: np.ndarray
+    total_power: complex
+    losses: complex
+    converged: bool
+
+
+def get_bus_base_node_counts() -> tuple[np.ndarray, np.ndarray]:
+    """Returns whether each bus of the active circuit has a voltage base, and its number of
+    nodes, in the order of the node arrays of OpenDSS."""
+    num_buses = odd.Circuit.NumBuses()
+    has_base = np.zeros(num_buses, dtype=bool)
+    num_nodes = np.zeros(num_buses, dtype=int)
+    for index in range(num_buses):
+        odd.Circuit.SetActiveBusi(index)
+        has_base[index] = bool(odd.Bus.kVBase())
+        num_nodes[index] = odd.Bus.NumNodes()
+    return has_base, num_nodes
+
+
+def solve_powerflow(circuit: Circuit) -> PowerFlowResult:
+    """Solves the circuit and pulls node voltages in bulk as NumPy arrays.
+
+    Nodes without a voltage base and dead nodes are left out.
+    """
+    OpenDSS(circuit)
+    total_power = complex(*odd.Circuit.TotalPower())
+    losses = complex(*odd.Circuit.Losses()) / 1000
+    vmag_pu = np.asarray(odd.Circuit.AllBusMagPu(), dtype=float)
+    # OpenDSS reports volts instead of per unit for buses without a voltage base.
+    has_base = np.repeat(*get_bus_base_node_counts())
+    is_live = has_base & (vmag_pu > 0)
+    return PowerFlowResult(
+        node_names=np.array(odd.Circuit.AllNodeNames(), dtype=str)[is_live],
+        vmag_pu=vmag_pu[is_live],
+        total_power=-total_power,
+        losses=losses,
+        converged=bool(odd.Solution.Converged()),
+    )
+
+
+def _get_pct_error(original: float, reduced: float) -> float | None:
+    return abs(reduced - original) / abs(original) * 100 if original else None
+
+
+class PowerFlowValidationReport(BaseSummaryModel):
+    name: str = "✅ Power Flow Validation"
+    converged: bool
+    compared_nodes: int
+    max_voltage_error_pu: float
+    mean_voltage_error_pu: float
+    worst_node: str | None = None
+    original_power_kw: float
+    reduced_power_kw: float
+    power_error_pct: float | None = None
+    original_losses_kw: float
+    reduced_losses_kw: float
+    losses_error_pct: float | None = None
+
+    def get_summary(self) -> dict[str, dict[str, str]]:
+        def _pct(value: float | None) -> str:
+            return "n/a" if value is None else f"{value:.2f}%"
+
+        return {
+            self.name: {
+                "Converged": str(self.converged),
+                "Node Voltages": (
+                    f"{self.compared_nodes} nodes, max error {self.max_voltage_error_pu:.4f} pu "
+                    f"at {self.worst_node}, mean error {self.mean_voltage_error_pu:.4f} pu."
+                ),
+                "Feeder Head Power": (
+                    f"{self.original_power_kw:.1f} kW → {self.reduced_power_kw:.1f} kW "
+                    f"({_pct(self.power_error_pct)})."
+                ),
+                "Losses": (
+                    f"{self.original_losses_kw:.1f} kW → {self.reduced_losses_kw:.1f} kW "
+                    f"({_pct(self.losses_error_pct)})."
+                ),
+            }
+        }
+
+
+def compare_powerflow_results(
+    original: PowerFlowResult, reduced: PowerFlowResult
+) -> PowerFlowValidationReport:
+    """Compares voltages of nodes preserved in the reduced circuit, power and losses."""
+    _, original_idx, reduced_idx = np.intersect1d(
+        original.node_names, reduced.node_names, assume_unique=True, return_indices=True
+    )
+    errors = np.abs(original.vmag_pu[original_idx] - reduced.vmag_pu[reduced_idx])
+    worst_idx = int(np.argmax(errors)) if errors.size else None
+    return PowerFlowValidationReport(
+        converged=original.converged and reduced.converged,
+        compared_nodes=int(errors.size),
+        max_voltage_error_pu=float(errors.max()) if errors.size else 0.0,
+        mean_voltage_error_pu=float(errors.mean()) if errors.size else 0.0,
+        worst_node=None
+        if worst_idx is None
+        else str(original.node_names[original_idx[worst_idx]]),
+        original_power_kw=original.total_power.real,
+        reduced_power_kw=reduced.total_power.real,
+        power_error_pct=_get_pct_error(original.total_power.real, reduced.total_power.real),
+        original_losses_kw=original.losses.real,
+        reduced_losses_kw=reduced.losses.real,
+        losses_error_pct=_get_pct_error(original.losses.real, reduced.losses.real),
+    )
+
+
+def validate_reduction(original: Circuit, reduced: Circuit) -> PowerFlowValidationReport:
+    """Solves original and reduced circuits and compares their power flow results.
+
+    Buses must not be renamed yet, only nodes with the same name are compared.
+    """
+    return compare_powerflow_results(solve_powerflow(original), solve_powerflow(reduced))
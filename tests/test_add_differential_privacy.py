@@ -0,0 +1,51 @@
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+from grid_reducer.add_differential_privacy import (
+    HighPrivacyConfig,
+    LowPrivacyConfig,
+    add_dp_noise_to_coordinates,
+    apply_gaussian_dp_noise,
+    apply_planar_laplace_noise,
+    get_dp_circuit,
+    get_independent_noise_seeds,
+)
+from grid_reducer.altdss.altdss_models import Bus
+from grid_reducer.utils import get_ckt_from_opendss_model
+
+ieee13_file = Path(__file__).parent / "data" / "ieee" / "master.dss"
+
+
+def test_dp_noise_is_reproducible():
+    x, y = np.linspace(0, 1, 100), np.linspace(1, 0, 100)
+    for is_geo in [True, False]:
+        noisy = add_dp_noise_to_coordinates(x, y, HighPrivacyConfig(), is_geo, seed=7)
+        same = add_dp_noise_to_coordinates(x, y, HighPrivacyConfig(), is_geo, seed=7)
+        other = add_dp_noise_to_coordinates(x, y, HighPrivacyConfig(), is_geo, seed=8)
+        assert all(np.array_equal(a, b) for a, b in zip(noisy, same, strict=True))
+        assert not np.array_equal(noisy[0], other[0])
+        assert noisy[0].shape == x.shape and np.all(np.isfinite(noisy))
+
+
+def test_dp_circuit_only_moves_buses_with_coordinates():
+    buses = [Bus(Name="a", X=0.5, Y=0.5), Bus(Name="b")]
+    circuit = get_ckt_from_opendss_model(ieee13_file).model_copy(update={"Bus": buses})
+    dp_circuit = get_dp_circuit(circuit, LowPrivacyConfig(), seed=0)
+    assert dp_circuit.Bus[0].X != 0.5
+    assert dp_circuit.Bus[1] is buses[1]
+
+
+def test_scalar_dp_noise_helpers_are_deprecated():
+    with pytest.deprecated_call():
+        assert np.isfinite(apply_gaussian_dp_noise(1.0, 0.1))
+    with pytest.deprecated_call():
+        assert np.all(np.isfinite(apply_planar_laplace_noise(1.0, 2.0, 50)))
+
+
+def test_independent_noise_seeds():
+    seeds = get_independent_noise_seeds(1, 3)
+    assert len(set(seeds)) == 3
+    assert get_independent_noise_seeds(1, 3) == seeds
+    assert get_independent_noise_seeds(None, 2) == [None, None]
@@ -0,0 +1,41 @@
+from pathlib import Path
+import csv
+
+from grid_reducer.batch import (
+    get_master_files,
+    get_batch_reduction_jobs,
+    reduce_feeders_in_parallel,
+    write_batch_results,
+)
+
+root_folder = Path(__file__).parent / "data"
+master_files = [root_folder / "ieee" / "master.dss", root_folder / "smartds" / "Master.dss"]
+
+
+def test_get_master_files(tmp_path):
+    assert set(master_files) <= set(get_master_files(root_folder))
+    assert get_master_files(str(root_folder / "*" / "master.dss")) == [master_files[0]]
+    manifest_file = tmp_path / "manifest.txt"
+    manifest_file.write_text("\n".join(str(f) for f in master_files) + "\n# comment\n")
+    assert get_master_files(manifest_file) == sorted(master_files)
+
+
+def test_reduce_feeders_in_parallel(tmp_path):
+    jobs = get_batch_reduction_jobs(master_files, tmp_path)
+    results = reduce_feeders_in_parallel(jobs, workers=2, validate=True)
+    assert [result.status for result in results] == ["success", "success"]
+    for result in results:
+        assert result.reduced_ckt_output_file.exists()
+        assert result.original_ckt_output_file.exists()
+        assert result.max_voltage_error_pu is not None
+    results_file = tmp_path / "results.csv"
+    write_batch_results(results, results_file)
+    with open(results_file, "r", encoding="utf-8") as fp:
+        assert len(list(csv.DictReader(fp))) == len(master_files)
+
+
+def test_reduce_feeders_in_parallel_timeout(tmp_path):
+    jobs = get_batch_reduction_jobs(master_files[:1], tmp_path, export_original=False)
+    results = reduce_feeders_in_parallel(jobs, workers=1, timeout=0.01)
+    assert results[0].status == "timeout"
+    assert results[0].reduced_ckt_output_file is None
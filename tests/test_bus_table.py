@@ -0,0 +1,31 @@
+from pathlib import Path
+
+import numpy as np
+
+from grid_reducer.altdss.altdss_models import Bus
+from grid_reducer.bus_table import BusTable
+from grid_reducer.utils import get_ckt_from_opendss_model
+
+ieee13_file = Path(__file__).parent / "data" / "ieee" / "master.dss"
+
+
+def test_bus_table_round_trip():
+    circuit = get_ckt_from_opendss_model(ieee13_file)
+    bus_table = BusTable.from_circuit(circuit)
+    assert bus_table.names == [bus.Name for bus in circuit.Bus]
+    assert all(new is old for new, old in zip(bus_table.to_buses(), circuit.Bus, strict=True))
+    assert bus_table.get_kv_ln_mapper() == {bus.Name: bus.kVLN for bus in circuit.Bus}
+
+
+def test_bus_table_coordinates():
+    buses = [Bus(Name="a", X=1.0, Y=2.0), Bus(Name="b"), Bus(Name="c", X=3.0, Y=4.0)]
+    bus_table = BusTable(buses)
+    assert bus_table.xy_mask.tolist() == [True, False, True]
+
+    bus_table.clear_coordinates(bus_table.get_mask(["a"]))
+    bus_table.set_coordinates(np.array([5.0]), np.array([6.0]), bus_table.get_mask(["b"]))
+    new_buses = bus_table.to_buses()
+    assert (new_buses[0].X, new_buses[0].Y) == (None, None)
+    assert (new_buses[1].X, new_buses[1].Y) == (5.0, 6.0)
+    assert new_buses[2] is buses[2]
+    assert buses[1].X is None
@@ -0,0 +1,60 @@
+from pathlib import Path
+import shutil
+
+from grid_reducer.cache import CircuitCache, get_referenced_files
+from grid_reducer.lazy_circuit import LazyCircuit
+from grid_reducer.reducer import OpenDSSModelReducer
+from grid_reducer.utils import get_ckt_from_opendss_model
+
+smartds_folder = Path(__file__).parent / "data" / "smartds"
+
+
+def test_get_referenced_files():
+    files = get_referenced_files(smartds_folder / "Master.dss")
+    assert files[0] == (smartds_folder / "Master.dss").resolve()
+    assert {f.name for f in files} >= {"Lines.dss", "Loads.dss", "Buscoords.dss"}
+
+
+def test_circuit_cache(tmp_path):
+    model_folder = tmp_path / "smartds"
+    shutil.copytree(smartds_folder, model_folder)
+    master_file = model_folder / "Master.dss"
+    cache = CircuitCache(tmp_path / "cache")
+
+    key = cache.get_key(master_file)
+    assert cache.get(key) is None
+    circuit = cache.get_circuit(master_file)
+    assert cache.get(key) == circuit
+    assert OpenDSSModelReducer(master_file, cache=cache, solve=True).ckt == circuit
+
+    with open(model_folder / "Loads.dss", "a", encoding="utf-8") as fp:
+        fp.write("\n! edited\n")
+    assert cache.get_key(master_file) != key
+
+
+def test_circuit_cache_eviction(tmp_path):
+    cache = CircuitCache(tmp_path / "cache", max_size=0)
+    circuit = cache.get_circuit(smartds_folder / "Master.dss")
+    assert circuit is not None
+    assert not list(cache.cache_folder.glob("*.pkl"))
+
+
+def test_circuit_cache_keys_solve(tmp_path):
+    master_file = smartds_folder / "Master.dss"
+    cache = CircuitCache(tmp_path / "cache")
+    assert cache.get_key(master_file, solve=True) != cache.get_key(master_file, solve=False)
+    for solve in [False, True, False, True]:
+        circuit = cache.get_circuit(master_file, solve=solve)
+        expected_circuit = get_ckt_from_opendss_model(master_file, solve=solve)
+        assert circuit.Bus == expected_circuit.Bus
+    assert len(list(cache.cache_folder.glob("*.pkl"))) == 2
+
+
+def test_circuit_cache_keys_lazy(tmp_path):
+    master_file = smartds_folder / "Master.dss"
+    cache = CircuitCache(tmp_path / "cache")
+    assert isinstance(cache.get_circuit(master_file, solve=False, lazy=True), LazyCircuit)
+    circuit = cache.get_circuit(master_file, solve=False, lazy=False)
+    assert not isinstance(circuit, LazyCircuit)
+    assert isinstance(cache.get_circuit(master_file, solve=False, lazy=True), LazyCircuit)
+    assert cache.get_circuit(master_file, solve=False) == circuit
@@ -0,0 +1,48 @@
+from pathlib import Path
+import gzip
+import io
+
+import pytest
+
+from grid_reducer.dss_writer import dump_circuit_dss, write_to_opendss_files
+from grid_reducer.utils import get_ckt_from_opendss_model, write_to_opendss_file
+
+root_folder = Path(__file__).parent / "data"
+
+
+@pytest.mark.parametrize(
+    "file", [root_folder / "ieee" / "master.dss", root_folder / "smartds" / "Master.dss"]
+)
+def test_streamed_dss_matches_dump_dss(file):
+    circuit = get_ckt_from_opendss_model(file)
+    expected, streamed = io.StringIO(), io.StringIO()
+    circuit.dump_dss(expected)
+    dump_circuit_dss(circuit, streamed)
+    assert streamed.getvalue() == expected.getvalue()
+
+
+def test_write_gzip_dss_file(tmp_path):
+    circuit = get_ckt_from_opendss_model(root_folder / "ieee" / "master.dss")
+    write_to_opendss_file(circuit, tmp_path / "ckt.dss.gz")
+    with gzip.open(tmp_path / "ckt.dss.gz", "rt", encoding="utf-8") as fp:
+        assert fp.read() == circuit.dumps_dss()
+
+
+@pytest.mark.parametrize(
+    "file", [root_folder / "ieee" / "master.dss", root_folder / "smartds" / "Master.dss"]
+)
+def test_write_split_dss_files(file, tmp_path):
+    circuit = get_ckt_from_opendss_model(file)
+    (tmp_path / "Line.dss").write_text("! not written by the reducer\n")
+    written_files = write_to_opendss_files(circuit, tmp_path / "Master.dss")
+    assert {"Master.dss", "Line.dss", "Load.dss", "Buscoords.dss"} <= {
+        f.name for f in written_files
+    }
+    assert all(f.parent == tmp_path / "Master" for f in written_files[1:])
+    assert (tmp_path / "Line.dss").read_text() == "! not written by the reducer\n"
+    write_to_opendss_file(circuit, tmp_path / "single.dss")
+    split_circuit = get_ckt_from_opendss_model(tmp_path / "Master.dss")
+    single_circuit = get_ckt_from_opendss_model(tmp_path / "single.dss")
+    # Pre commands hold a comment with the time the circuit was saved.
+    exclude = {"PreCommands"}
+    assert split_circuit.model_dump(exclude=exclude) == single_circuit.model_dump(exclude=exclude)
@@ -0,0 +1,50 @@
+from pathlib import Path
+
+import networkx as nx
+import numpy as np
+import pytest
+
+from grid_reducer.feeder_tree import FeederTree
+from grid_reducer.network import get_graph_from_circuit
+from grid_reducer.utils import get_ckt_from_opendss_model
+
+root_folder = Path(__file__).parent / "data"
+files = [
+    root_folder / "ieee" / "master.dss",
+    root_folder / "smartds" / "Master.dss",
+    root_folder / "ieee9500" / "Master-bal-initial-config.dss",
+]
+
+
+@pytest.mark.parametrize("file", files)
+def test_feeder_tree_matches_dfs_tree(file):
+    circuit = get_ckt_from_opendss_model(file)
+    tree = FeederTree.from_circuit(circuit)
+    d_graph = get_graph_from_circuit(circuit, directed=True)
+
+    assert [tree.names[bus] for bus in tree.order] == list(d_graph.nodes)
+    for bus in tree.order[1:].tolist():
+        parent = tree.names[tree.parent[bus]]
+        assert d_graph.has_edge(parent, tree.names[bus])
+        edge_data = d_graph.edges[parent, tree.names[bus]]
+        assert tree.get_edge_name(tree.parent_edge[bus]) == edge_data["name"]
+        assert tree.edge_types[tree.parent_edge[bus]] == edge_data["component_type"]
+    for bus in tree.order[:: max(len(tree.order) // 50, 1)].tolist():
+        subtree = {tree.names[node] for node in tree.get_subtree(bus)}
+        assert subtree == nx.descendants(d_graph, tree.names[bus]) | {tree.names[bus]}
+        children = [tree.names[child] for child in tree.get_children(bus)]
+        assert children == list(d_graph.successors(tree.names[bus]))
+
+
+def test_feeder_tree_nearest_ancestors():
+    circuit = get_ckt_from_opendss_model(root_folder / "smartds" / "Master.dss")
+    tree = FeederTree.from_circuit(circuit)
+    mask = tree.reached & (tree.kv >= 1.0)
+    ancestors = tree.get_nearest_ancestors(mask)
+
+    assert np.all(ancestors[mask] == -1)
+    for bus in np.flatnonzero(~mask & tree.reached).tolist():
+        node = tree.parent[bus]
+        while node != -1 and not mask[node]:
+            node = tree.parent[node]
+        assert ancestors[bus] == node
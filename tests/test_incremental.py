@@ -0,0 +1,101 @@
+from pathlib import Path
+
+import pytest
+
+from grid_reducer.aggregate_primary import aggregate_primary_conductors
+from grid_reducer.aggregate_secondary import aggregate_secondary_assets
+from grid_reducer.altdss.altdss_models import Circuit
+from grid_reducer.incremental import IncrementalAggregator, get_changed_components
+from grid_reducer.reducer import OpenDSSModelReducer
+from grid_reducer.utils import get_ckt_from_opendss_model
+
+root_folder = Path(__file__).parent / "data"
+files = [
+    root_folder / "smartds" / "Master.dss",
+    root_folder / "ieee9500" / "Master-bal-initial-config.dss",
+]
+
+
+def _get_container(container, items):
+    return type(container).model_construct(root=type(container.root).model_construct(root=items))
+
+
+def edit_circuit(circuit: Circuit, step: int = 10) -> Circuit:
+    """Scales every `step`-th load and doubles the length of every `step`-th line."""
+    loads = list(circuit.Load.root.root)
+    for idx in range(0, len(loads), step):
+        load = loads[idx].root
+        loads[idx] = type(loads[idx]).model_construct(
+            root=load.model_copy(update={"kW": load.kW * 1.5})
+        )
+    lines = list(circuit.Line.root.root)
+    for idx in range(0, len(lines), step):
+        line = lines[idx].root
+        if getattr(line, "Length", None):
+            lines[idx] = type(lines[idx]).model_construct(
+                root=line.model_copy(update={"Length": line.Length * 2})
+            )
+    return circuit.model_copy(
+        update={
+            "Load": _get_container(circuit.Load, loads),
+            "Line": _get_container(circuit.Line, lines),
+        }
+    )
+
+
+def get_contents(circuit: Circuit) -> dict:
+    """Returns circuit contents with components sorted and their names left out."""
+    contents = circuit.model_dump(mode="json")
+    for field, value in contents.items():
+        if isinstance(value, list) and value and isinstance(value[0], dict):
+            contents[field] = sorted(
+                str(sorted((k, v) for k, v in item.items() if k != "Name")) for item in value
+            )
+    return contents
+
+
+@pytest.mark.parametrize("file", files)
+def test_incremental_aggregation_matches_full_run(file):
+    circuit = get_ckt_from_opendss_model(file)
+    aggregator = IncrementalAggregator()
+    secondary_ckt, _ = aggregator.aggregate_secondary(circuit)
+    aggregator.aggregate_primary(secondary_ckt)
+
+    edited_circuit = edit_circuit(circuit)
+    assert set(get_changed_components(circuit, edited_circuit)) == {"Load", "Line"}
+    secondary_ckt, secondary_summary = aggregator.aggregate_secondary(edited_circuit)
+    primary_ckt, primary_summary = aggregator.aggregate_primary(secondary_ckt)
+
+    expected_secondary_ckt, expected_secondary_summary = aggregate_secondary_assets(edited_circuit)
+    expected_primary_ckt, expected_primary_summary = aggregate_primary_conductors(
+        expected_secondary_ckt
+    )
+    assert secondary_summary.get_summary() == expected_secondary_summary.get_summary()
+    assert primary_summary.get_summary() == expected_primary_summary.get_summary()
+    assert get_contents(secondary_ckt) == get_contents(expected_secondary_ckt)
+    assert get_contents(primary_ckt) == get_contents(expected_primary_ckt)
+
+
+def test_changed_components_of_topology_edit():
+    circuit = get_ckt_from_opendss_model(root_folder / "smartds" / "Master.dss")
+    loads = circuit.Load.root.root
+    assert get_changed_components(circuit, circuit) == {}
+    removed_load_ckt = circuit.model_copy(update={"Load": _get_container(circuit.Load, loads[1:])})
+    assert get_changed_components(circuit, removed_load_ckt) is None
+    moved_load = loads[0].root.model_copy(update={"Bus1": loads[1].root.Bus1})
+    moved_load_ckt = circuit.model_copy(
+        update={
+            "Load": _get_container(
+                circuit.Load, [type(loads[0]).model_construct(root=moved_load), *loads[1:]]
+            )
+        }
+    )
+    assert get_changed_components(circuit, moved_load_ckt) is None
+
+
+def test_reduce_incrementally():
+    reducer = OpenDSSModelReducer(root_folder / "smartds" / "Master.dss")
+    reducer.reduce(transform_coordinate=False, incremental=True)
+    reducer.update_circuit(edit_circuit(reducer.ckt))
+    reduced_ckt = reducer.reduce(transform_coordinate=False, incremental=True)
+    assert len(reduced_ckt.Bus) < len(reducer.ckt.Bus)
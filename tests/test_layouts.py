@@ -0,0 +1,35 @@
+from pathlib import Path
+
+import networkx as nx
+import pytest
+
+from grid_reducer.layouts import LAYOUT_FUNC_REGISTRY, get_layout
+from grid_reducer.network import get_graph_from_circuit
+from grid_reducer.transform_coordinate import transform_bus_coordinates
+from grid_reducer.utils import get_ckt_from_opendss_model, get_circuit_bus_name
+
+ieee13_file = Path(__file__).parent / "data" / "ieee" / "master.dss"
+
+
+@pytest.mark.parametrize("layout", list(LAYOUT_FUNC_REGISTRY))
+def test_layouts(layout):
+    circuit = get_ckt_from_opendss_model(ieee13_file)
+    graph = get_graph_from_circuit(circuit)
+    pos = get_layout(graph, layout, source=get_circuit_bus_name(circuit))
+    assert set(pos) == set(graph.nodes)
+    assert all(-1.5 <= value <= 1.5 for xy in pos.values() for value in xy)
+
+
+def test_radial_tree_layout_disconnected_graph():
+    graph = nx.path_graph(["a", "b", "c"])
+    graph.add_edge("x", "y")
+    graph.add_node("z")
+    pos = get_layout(graph, "radial_tree", source="a")
+    assert set(pos) == set(graph.nodes)
+    assert len({tuple(xy) for xy in pos.values()}) == len(pos)
+
+
+def test_transform_bus_coordinates_with_layout():
+    circuit = get_ckt_from_opendss_model(ieee13_file)
+    new_circuit = transform_bus_coordinates(circuit, layout="radial_tree")
+    assert all(bus.X is not None and bus.Y is not None for bus in new_circuit.Bus)
@@ -0,0 +1,50 @@
+from pathlib import Path
+import io
+import pickle
+
+import pytest
+
+from grid_reducer.dss_writer import dump_circuit_dss
+from grid_reducer.lazy_circuit import LazyCircuit, get_unvalidated_container
+from grid_reducer.reducer import OpenDSSModelReducer
+from grid_reducer.utils import get_ckt_from_opendss_model
+
+root_folder = Path(__file__).parent / "data"
+files = [root_folder / "ieee" / "master.dss", root_folder / "smartds" / "Master.dss"]
+
+
+def get_dss_lines(circuit) -> list[str]:
+    """Returns dss script of the circuit without comments, such as the save time stamp."""
+    output = io.StringIO()
+    dump_circuit_dss(circuit, output)
+    return [line for line in output.getvalue().splitlines() if not line.startswith("!")]
+
+
+@pytest.mark.parametrize("file", files)
+def test_lazy_circuit_matches_eager_circuit(file):
+    circuit = get_ckt_from_opendss_model(file)
+    lazy_circuit = get_ckt_from_opendss_model(file, lazy=True)
+    assert isinstance(lazy_circuit, LazyCircuit)
+    assert get_unvalidated_container(lazy_circuit, "Load") is not None
+    assert lazy_circuit.Load == circuit.Load
+    assert get_unvalidated_container(lazy_circuit, "Load") is None
+    assert get_unvalidated_container(lazy_circuit, "Line") is not None
+    unpickled_circuit = pickle.loads(pickle.dumps(lazy_circuit))
+    assert get_unvalidated_container(unpickled_circuit, "LineCode") is not None
+    assert get_dss_lines(lazy_circuit) == get_dss_lines(circuit)
+    assert unpickled_circuit.model_dump(exclude={"PreCommands"}) == circuit.model_dump(
+        exclude={"PreCommands"}
+    )
+
+
+def test_reduce_lazy_circuit():
+    reducer = OpenDSSModelReducer(root_folder / "smartds" / "Master.dss")
+    lazy_reducer = OpenDSSModelReducer(root_folder / "smartds" / "Master.dss", lazy=True)
+    reduced_ckt = reducer.reduce(transform_coordinate=False)
+    lazy_reduced_ckt = lazy_reducer.reduce(transform_coordinate=False)
+
+    # Monitors and line codes are only passed through, line codes renamed as loaded.
+    assert get_unvalidated_container(lazy_reducer.ckt, "Monitor") is not None
+    assert get_unvalidated_container(lazy_reduced_ckt, "LineCode") is not None
+    assert get_unvalidated_container(lazy_reducer.ckt, "LineCode") is not None
+    assert get_dss_lines(lazy_reduced_ckt) == get_dss_lines(reduced_ckt)
@@ -0,0 +1,56 @@
+from pathlib import Path
+import json
+
+import pytest
+
+from grid_reducer.add_differential_privacy import LowPrivacyConfig
+from grid_reducer.profiling import PipelineProfile, profile_stage
+from grid_reducer.reducer import OpenDSSModelReducer
+
+smartds_file = Path(__file__).parent / "data" / "smartds" / "Master.dss"
+
+
+def test_nested_stages():
+    profile = PipelineProfile()
+    with profile_stage("ignored"):
+        pass
+    with profile.stage("outer"):
+        with profile_stage("inner"):
+            pass
+    assert [(stage.name, stage.depth) for stage in profile.stages] == [
+        ("outer", 0),
+        ("inner", 1),
+    ]
+
+
+def test_reducer_profile(tmp_path):
+    reducer = OpenDSSModelReducer(smartds_file)
+    reduced_ckt, profile = reducer.reduce_with_profile(noise_config=LowPrivacyConfig)
+    reducer.export(reduced_ckt, tmp_path / "reduced_ckt.dss")
+    stage_names = {stage.name for stage in profile.stages}
+    assert {
+        "load",
+        "graph_build",
+        "secondary_aggregation",
+        "primary_aggregation",
+        "layout",
+        "rename",
+        "export",
+    } <= stage_names
+    secondary_stage = next(s for s in profile.stages if s.name == "secondary_aggregation")
+    assert secondary_stage.elements_out < secondary_stage.elements_in
+    merge_stage = next(s for s in profile.stages if s.name == "line_merge")
+    assert merge_stage.depth == 1
+    assert 0 < merge_stage.elements_out < merge_stage.elements_in
+
+    profile.export(tmp_path / "profile.json")
+    profile.export(tmp_path / "trace.json", "chrome")
+    exported_profile = PipelineProfile.model_validate_json((tmp_path / "profile.json").read_text())
+    assert exported_profile.stages == profile.stages
+    trace = json.loads((tmp_path / "trace.json").read_text())
+    assert len(trace["traceEvents"]) == len(profile.stages)
+
+
+def test_export_rejects_unknown_format(tmp_path):
+    with pytest.raises(ValueError, match="json"):
+        PipelineProfile().export(tmp_path / "profile.txt", "text")
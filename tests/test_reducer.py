@@ -1,15 +1,27 @@
 from pathlib import Path
 import re
+import shutil
 import warnings
 
 import networkx as nx
+import opendssdirect as odd
 import pytest
 
-from grid_reducer.utils import get_ckt_from_opendss_model, write_to_opendss_file
+from grid_reducer.utils import (
+    get_ckt_from_opendss_model,
+    write_to_opendss_file,
+    get_bus_connected_assets,
+    get_bus_connected_assets_mapper,
+)
+from grid_reducer.altdss.altdss_models import Load, PVSystem, Capacitor
 from grid_reducer.network import get_graph_from_circuit
 from grid_reducer.aggregate_secondary import aggregate_secondary_assets
-from grid_reducer.opendss import OpenDSS
+from grid_reducer.opendss import DSSCommandWriter, OpenDSS
+from grid_reducer.dss_writer import dump_circuit_dss
 from grid_reducer.reducer import OpenDSSModelReducer
+from grid_reducer.add_differential_privacy import HighPrivacyConfig
+from grid_reducer.rename_components import UniqueNameAllocator, rename_assets
+from grid_reducer.similarity.line import LineSimilarity
 
 root_folder = Path(__file__).parent / "data"
 additional_data_folder = Path(__file__).parent / "../extra_data"
@@ -29,19 +41,45 @@ def test_networkx_graph_creation(file):
 
 
 @pytest.mark.parametrize("file", files)
-def test_secondary_aggregation(file, tmp_path):
+def test_bus_connected_assets_mapper(file):
+    circuit = get_ckt_from_opendss_model(file)
+    asset_mapper = get_bus_connected_assets_mapper(circuit, [Load, PVSystem, Capacitor])
+    for asset_type, bus_asset_mapper in asset_mapper.items():
+        container = getattr(circuit, asset_type.__name__)
+        if container is None:
+            assert not bus_asset_mapper
+            continue
+        for bus in circuit.Bus:
+            assert bus_asset_mapper.get(bus.Name, []) == get_bus_connected_assets(
+                container, bus.Name
+            )
+
+
+def test_load_without_solve(tmp_path):
+    shutil.copytree(root_folder / "ieee", tmp_path / "ieee")
+    master_file = tmp_path / "ieee" / "master.dss"
+    lines = master_file.read_text().splitlines()
+    master_file.write_text(
+        "\n".join(line for line in lines if line.strip().lower() not in {"calcv", "solve"})
+    )
+    solved_circuit = get_ckt_from_opendss_model(master_file, solve=True)
+    circuit = get_ckt_from_opendss_model(master_file, solve=False)
+    assert all(bus.kVLN is not None for bus in circuit.Bus)
+    assert [bus.Name for bus in circuit.Bus] == [bus.Name for bus in solved_circuit.Bus]
+    assert circuit.Line == solved_circuit.Line
+
+
+@pytest.mark.parametrize("file", files)
+def test_secondary_aggregation(file):
     circuit = get_ckt_from_opendss_model(file)
     new_circuit, _ = aggregate_secondary_assets(circuit)
-    original_circuit_file = tmp_path / "original_ckt.dss"
-    reduced_circuit_file = tmp_path / "reduced_ckt.dss"
-    write_to_opendss_file(circuit, original_circuit_file)
-    write_to_opendss_file(new_circuit, reduced_circuit_file)
-    compare_powerflow_results(original_circuit_file, reduced_circuit_file)
+    compare_powerflow_results(circuit, new_circuit)
 
 
-def compare_powerflow_results(original_circuit_file, reduced_circuit_file):
-    original_ckt_power = OpenDSS(original_circuit_file).get_circuit_power()
-    reduced_ckt_power = OpenDSS(reduced_circuit_file).get_circuit_power()
+def compare_powerflow_results(original_circuit, reduced_circuit):
+    """Compares feeder head power, circuits can be dss files or circuit objects."""
+    original_ckt_power = OpenDSS(original_circuit).get_circuit_power()
+    reduced_ckt_power = OpenDSS(reduced_circuit).get_circuit_power()
     pct_diff = (
         abs((original_ckt_power.real - reduced_ckt_power.real) / original_ckt_power.real) * 100
     )
@@ -62,3 +100,77 @@ def test_primary_aggregation(file, tmp_path):
     reducer.export_original_ckt(original_circuit_file)
     reducer.export(reduced_ckt, reduced_circuit_file)
     compare_powerflow_results(original_circuit_file, reduced_circuit_file)
+
+
+@pytest.mark.parametrize("file", [root_folder / "ieee" / "master.dss"])
+@pytest.mark.parametrize("reduce_secondary", [True, False])
+def test_reduce_does_not_modify_original_circuit(file, reduce_secondary):
+    reducer = OpenDSSModelReducer(master_dss_file=file)
+    original_dump = reducer.ckt.model_dump()
+    reducer.reduce(
+        reduce_secondary=reduce_secondary,
+        aggregate_primary=reduce_secondary,
+        noise_config=HighPrivacyConfig,
+    )
+    assert reducer.ckt.model_dump() == original_dump
+
+
+def test_unique_name_allocator():
+    allocator = UniqueNameAllocator()
+    names = [allocator.get_unique_name("load", ["1"]) for _ in range(3)]
+    names.append(allocator.get_unique_name("load", ["1_1"]))
+    names.append(allocator.get_unique_name("load", ["1_1"]))
+    assert names == ["load_1", "load_1_1", "load_1_2", "load_1_1_1", "load_1_1_2"]
+
+
+@pytest.mark.parametrize("file", [root_folder / "smartds" / "Master.dss"])
+def test_renamed_assets_are_unique(file):
+    renamed_ckt = rename_assets(get_ckt_from_opendss_model(file))
+    for field in ["Line", "Load", "Transformer"]:
+        names = [item.root.Name for item in getattr(renamed_ckt, field).root.root]
+        assert len(names) == len(set(names))
+
+
+def test_rename_copies_only_renamed_containers(tmp_path):
+    master_file = tmp_path / "Master.dss"
+    master_file.write_text(
+        f'Redirect "{root_folder / "ieee" / "master.dss"}"\n'
+        "New Spectrum.harmonics NumHarm=2 harmonic=[1 3] %mag=[100 10] angle=[0 0]\n"
+    )
+    circuit = get_ckt_from_opendss_model(master_file)
+    original_dump = circuit.model_dump()
+    renamed_ckt = rename_assets(circuit)
+    assert circuit.Spectrum is not None
+    assert renamed_ckt.Spectrum is circuit.Spectrum
+    assert renamed_ckt.Load is not circuit.Load
+    assert renamed_ckt.Load.root.root[0].root.Name != circuit.Load.root.root[0].root.Name
+    assert circuit.model_dump() == original_dump
+
+
+@pytest.mark.parametrize("file", [root_folder / "ieee" / "master.dss"])
+def test_line_similarity_signature(file):
+    line = get_ckt_from_opendss_model(file).Line.root.root[0].root
+    similar_line = line.model_copy(update={"Name": "similar", "Length": line.Length * 2})
+    different_line = line.model_copy(update={"NormAmps": (line.NormAmps or 0) + 1})
+    checker = LineSimilarity()
+    assert checker.check_if_similar(line, similar_line)
+    assert not checker.check_if_similar(line, different_line)
+    assert hash(checker.get_signature(line)) == hash(checker.get_signature(similar_line))
+
+
+@pytest.mark.parametrize("file", files)
+def test_load_circuit_without_file(file, tmp_path):
+    circuit = get_ckt_from_opendss_model(file)
+    write_to_opendss_file(circuit, tmp_path / "ckt.dss")
+    file_power = OpenDSS(tmp_path / "ckt.dss").get_circuit_power()
+    assert OpenDSS(circuit).get_circuit_power() == pytest.approx(file_power)
+
+
+def test_dss_command_writer_sends_whole_lines():
+    circuit = get_ckt_from_opendss_model(root_folder / "ieee" / "master.dss")
+    expected_power = OpenDSS(circuit).get_circuit_power()
+    output = DSSCommandWriter(batch_size=100)
+    dump_circuit_dss(circuit, output)
+    output.flush()
+    odd.Solution.Solve()
+    assert complex(*odd.Circuit.TotalPower()) == pytest.approx(expected_power)
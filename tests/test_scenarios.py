@@ -0,0 +1,108 @@
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+from grid_reducer.add_differential_privacy import (
+    HighPrivacyConfig,
+    LowPrivacyConfig,
+    add_dp_noise_to_coordinates,
+)
+from grid_reducer.reducer import OpenDSSModelReducer
+from grid_reducer.scenarios import ReductionScenario, get_publication_scenarios
+
+smartds_file = Path(__file__).parent / "data" / "smartds" / "Master.dss"
+
+
+def read_dss_lines(file: Path) -> list[str]:
+    return [line for line in file.read_text().splitlines() if not line.startswith("!")]
+
+
+def test_scenarios_match_reduce(tmp_path):
+    scenarios = [
+        ReductionScenario(output_file=tmp_path / "plain" / "reduced_ckt.dss"),
+        ReductionScenario(
+            output_file=tmp_path / "high" / "reduced_ckt.dss",
+            noise_config=HighPrivacyConfig,
+            noise_seed=7,
+        ),
+        ReductionScenario(
+            output_file=tmp_path / "original_layout" / "reduced_ckt.dss",
+            transform_coordinate=False,
+            noise_config=LowPrivacyConfig,
+            noise_seed=7,
+        ),
+    ]
+    reducer = OpenDSSModelReducer(smartds_file)
+    results = reducer.reduce_scenarios(scenarios, workers=2)
+    assert [result.status for result in results] == ["success"] * len(scenarios)
+    assert [result.output_file for result in results] == [s.output_file for s in scenarios]
+    stage_names = [stage.name for stage in reducer.profile.stages]
+    assert stage_names.count("secondary_aggregation") == 1
+    assert stage_names.count("primary_aggregation") == 1
+
+    for scenario in scenarios:
+        reduced_ckt = OpenDSSModelReducer(smartds_file).reduce(
+            transform_coordinate=scenario.transform_coordinate,
+            noise_config=scenario.noise_config,
+            noise_seed=scenario.noise_seed,
+        )
+        expected_file = tmp_path / "expected.dss"
+        reducer.export(reduced_ckt, expected_file)
+        assert read_dss_lines(scenario.output_file) == read_dss_lines(expected_file)
+
+
+def test_publication_scenarios(tmp_path):
+    scenarios = get_publication_scenarios(
+        tmp_path, {"high": HighPrivacyConfig, "none": None}, [True, False]
+    )
+    assert [scenario.output_file.parent.name for scenario in scenarios] == [
+        "noise_high_kamada_kawai",
+        "noise_high",
+        "noise_none_kamada_kawai",
+        "noise_none",
+    ]
+
+
+def test_publication_scenarios_do_not_share_noise(tmp_path):
+    scenarios = get_publication_scenarios(
+        tmp_path, {"low": LowPrivacyConfig, "high": HighPrivacyConfig}, [True], noise_seed=1
+    )
+    low, high = scenarios
+    assert low.noise_seed != high.noise_seed
+    x, y = np.zeros(50), np.zeros(50)
+    for is_geo in [True, False]:
+        dx_low, dy_low = add_dp_noise_to_coordinates(
+            x, y, low.noise_config(), is_geo, low.noise_seed
+        )
+        dx_high, dy_high = add_dp_noise_to_coordinates(
+            x, y, high.noise_config(), is_geo, high.noise_seed
+        )
+        # Shared draws would give displacements along the same rays, scaled by a constant.
+        assert not np.allclose(dx_low * dy_high, dy_low * dx_high)
+    same_seed = get_publication_scenarios(
+        tmp_path, {"low": LowPrivacyConfig, "high": HighPrivacyConfig}, [True], noise_seed=1
+    )
+    assert [s.noise_seed for s in same_seed] == [low.noise_seed, high.noise_seed]
+
+
+def test_scenarios_need_own_output_files(tmp_path):
+    scenarios = [ReductionScenario(output_file=tmp_path / "reduced_ckt.dss")] * 2
+    with pytest.raises(ValueError):
+        OpenDSSModelReducer(smartds_file).reduce_scenarios(scenarios)
+
+
+def test_failed_layout_only_fails_its_scenarios(tmp_path):
+    scenarios = [
+        ReductionScenario(output_file=tmp_path / "unknown" / "reduced_ckt.dss", layout="unknown"),
+        ReductionScenario(output_file=tmp_path / "plain" / "reduced_ckt.dss"),
+        ReductionScenario(
+            output_file=tmp_path / "original_layout" / "reduced_ckt.dss",
+            transform_coordinate=False,
+        ),
+    ]
+    results = OpenDSSModelReducer(smartds_file).reduce_scenarios(scenarios, workers=8)
+    assert [result.status for result in results] == ["failed", "success", "success"]
+    assert results[0].error
+    assert not scenarios[0].output_file.exists()
+    assert scenarios[1].output_file.exists() and scenarios[2].output_file.exists()
@@ -0,0 +1,47 @@
+from pathlib import Path
+
+import pytest
+
+from grid_reducer.lazy_circuit import get_unvalidated_container
+from grid_reducer.reducer import OpenDSSModelReducer
+from grid_reducer.snapshot import CircuitSnapshot, read_circuit_snapshot, write_circuit_snapshot
+from grid_reducer.utils import get_ckt_from_opendss_model
+
+root_folder = Path(__file__).parent / "data"
+files = [
+    root_folder / "ieee" / "master.dss",
+    root_folder / "smartds" / "Master.dss",
+    root_folder / "ieee9500" / "Master-bal-initial-config.dss",
+]
+
+
+@pytest.mark.parametrize("file", files)
+def test_snapshot_round_trip(file, tmp_path):
+    circuit = get_ckt_from_opendss_model(file)
+    write_circuit_snapshot(circuit, tmp_path / "ckt.snapshot")
+    snapshot_circuit = read_circuit_snapshot(tmp_path / "ckt.snapshot")
+    assert snapshot_circuit == circuit
+    assert snapshot_circuit.dumps_dss() == circuit.dumps_dss()
+
+
+def test_partial_snapshot_read(tmp_path):
+    reducer = OpenDSSModelReducer(root_folder / "smartds" / "Master.dss")
+    reduced_ckt = reducer.reduce(transform_coordinate=False)
+    write_circuit_snapshot(reduced_ckt, tmp_path / "reduced.snapshot")
+
+    snapshot = CircuitSnapshot(tmp_path / "reduced.snapshot")
+    assert {"Name", "Bus", "Line", "Load"} <= set(snapshot.fields)
+    circuit = read_circuit_snapshot(tmp_path / "reduced.snapshot", fields=["Bus", "Line"])
+    assert circuit.Bus == reduced_ckt.Bus
+    assert circuit.Line == reduced_ckt.Line
+    assert circuit.Name == reduced_ckt.Name
+    assert circuit.Load is None
+
+    lazy_circuit = read_circuit_snapshot(tmp_path / "reduced.snapshot", lazy=True)
+    assert get_unvalidated_container(lazy_circuit, "Load") is not None
+    assert lazy_circuit.Load == reduced_ckt.Load
+
+
+def test_snapshot_rejects_other_files():
+    with pytest.raises(ValueError):
+        CircuitSnapshot(root_folder / "ieee" / "master.dss")
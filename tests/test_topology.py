@@ -0,0 +1,60 @@
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+from grid_reducer.bus_table import BusTable
+from grid_reducer.feeder_tree import FeederTree
+from grid_reducer.topology import TopologySummary, get_topology_from_opendss
+from grid_reducer.utils import get_ckt_from_opendss_model
+
+root_folder = Path(__file__).parent / "data"
+files = [
+    root_folder / "ieee" / "master.dss",
+    root_folder / "smartds" / "Master.dss",
+    root_folder / "ieee9500" / "Master-bal-initial-config.dss",
+]
+
+
+def assert_same_tree(tree: FeederTree, expected_tree: FeederTree):
+    assert tree.names == expected_tree.names
+    assert tree.edge_types == expected_tree.edge_types
+    assert np.array_equal(tree.order, expected_tree.order)
+    assert np.array_equal(tree.parent, expected_tree.parent)
+    assert np.array_equal(tree.parent_edge, expected_tree.parent_edge)
+    assert [tree.get_edge_name(edge) for edge in range(len(tree.edge_buses))] == [
+        expected_tree.get_edge_name(edge) for edge in range(len(expected_tree.edge_buses))
+    ]
+
+
+@pytest.mark.parametrize("file", files)
+def test_topology_matches_circuit(file):
+    topology = get_topology_from_opendss(file)
+    circuit = get_ckt_from_opendss_model(file, solve=False)
+    bus_table = BusTable.from_circuit(circuit)
+
+    assert topology.names == bus_table.names
+    for column, expected_column in [
+        (topology.kv_ln, bus_table.kv_ln),
+        (topology.x, bus_table.x),
+        (topology.y, bus_table.y),
+    ]:
+        assert np.allclose(column, expected_column, equal_nan=True)
+    assert_same_tree(topology.get_feeder_tree(), FeederTree.from_circuit(circuit))
+
+
+def test_topology_leaves_out_open_lines(tmp_path):
+    master_file = tmp_path / "Master.dss"
+    master_file.write_text(
+        f'Redirect "{root_folder / "ieee" / "master.dss"}"\n'
+        "Open Line.632670 1\n"
+        "New SwtControl.sw1 SwitchedObj=Line.671692 SwitchedTerm=1 Normal=open\n"
+    )
+    topology = get_topology_from_opendss(master_file)
+    tree = topology.get_feeder_tree()
+    assert_same_tree(tree, FeederTree.from_circuit(get_ckt_from_opendss_model(master_file)))
+
+    summary = TopologySummary.from_tree(tree)
+    assert summary.buses == len(topology.names)
+    assert summary.connected_buses < summary.buses
+    assert summary.primary_buses + summary.secondary_buses == summary.connected_buses
@@ -0,0 +1,24 @@
+from pathlib import Path
+import json
+import math
+
+from grid_reducer.altdss.altdss_models import Circuit
+from grid_reducer.utils import get_dict_from_opendss, get_json_from_opendss, loads_json
+
+root_folder = Path(__file__).parent / "data"
+
+
+def test_loads_json_matches_json_module():
+    contents = get_json_from_opendss(root_folder / "smartds" / "Master.dss", solve=False)
+    assert loads_json(contents) == json.loads(contents)
+    assert loads_json(contents.encode()) == json.loads(contents)
+    assert math.isnan(loads_json('{"X": NaN}')["X"])
+
+
+def test_validate_json_matches_validate_dict():
+    master_file = root_folder / "ieee9500" / "Master-bal-initial-config.dss"
+    circuit = Circuit.model_validate_json(get_json_from_opendss(master_file, solve=False))
+    expected_circuit = Circuit.model_validate(get_dict_from_opendss(master_file, solve=False))
+    assert circuit.model_dump(exclude={"PreCommands"}) == expected_circuit.model_dump(
+        exclude={"PreCommands"}
+    )
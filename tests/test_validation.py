@@ -0,0 +1,44 @@
+from pathlib import Path
+
+import pytest
+
+from grid_reducer.reducer import OpenDSSModelReducer
+from grid_reducer.utils import get_ckt_from_opendss_model
+from grid_reducer.validation import solve_powerflow, validate_reduction
+
+root_folder = Path(__file__).parent / "data"
+
+
+def test_validate_same_circuit():
+    circuit = get_ckt_from_opendss_model(root_folder / "ieee" / "master.dss")
+    report = validate_reduction(circuit, circuit)
+    assert report.converged
+    assert report.compared_nodes > 0
+    assert report.max_voltage_error_pu == pytest.approx(0, abs=1e-9)
+    assert report.power_error_pct == pytest.approx(0, abs=1e-9)
+
+
+@pytest.mark.parametrize(
+    "file", [root_folder / "ieee" / "master.dss", root_folder / "smartds" / "Master.dss"]
+)
+def test_reduce_with_validation(file):
+    reducer = OpenDSSModelReducer(file)
+    reducer.reduce(transform_coordinate=False, validate=True)
+    report = reducer.validation_report
+    assert report.converged
+    assert report.max_voltage_error_pu < 0.05
+    assert report.power_error_pct < 10
+    assert "validation" in [stage.name for stage in reducer.profile.stages]
+
+
+def test_solve_powerflow_keeps_nodes_with_one_volt_base(tmp_path):
+    # Voltages of a bus with a 1 V base are the same in volts and per unit.
+    master_file = tmp_path / "Master.dss"
+    master_file.write_text(
+        f'Redirect "{root_folder / "ieee" / "master.dss"}"\n'
+        "New Transformer.tiny Phases=1 Windings=2 Buses=[680.1 tiny.1] kVs=[2.4018 0.001] kVA=1\n"
+        "Set VoltageBases=[115 4.16 0.48 0.00173205081]\n"
+        "CalcVoltageBases\n"
+    )
+    result = solve_powerflow(get_ckt_from_opendss_model(master_file))
+    assert "tiny.1" in result.node_names.tolist()